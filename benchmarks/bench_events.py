@@ -0,0 +1,87 @@
+"""
+Benchmarks of the overhead of dispatching service calls through the event
+system, compared to calling the service method directly. The ``dispatcher``
+parameter compares pyeventsystem's dispatcher, which finds each handler's
+successor on every hop, with the compiled handler chains providers use.
+"""
+from pyeventsystem.events import SimpleEventDispatcher
+from pyeventsystem.middleware import SimpleMiddlewareManager
+
+from cloudbridge.base.middleware import CachingMiddleware
+from cloudbridge.base.middleware import CompiledEventDispatcher
+from cloudbridge.base.middleware import MetricsMiddleware
+from cloudbridge.base.middleware import TracingMiddleware
+
+from .common import SyntheticProvider
+from .common import SyntheticService
+
+CALLS = 1000
+
+
+DISPATCHERS = {
+    'simple': SimpleEventDispatcher,
+    'compiled': CompiledEventDispatcher,
+}
+
+
+def create_provider(dispatcher):
+    provider = SyntheticProvider()
+    # pylint:disable=protected-access
+    provider._middleware = SimpleMiddlewareManager(DISPATCHERS[dispatcher]())
+    provider.add_required_middleware()
+    return provider
+
+
+class Dispatch(object):
+    params = [['none', 'metrics', 'metrics+tracing', 'caching'],
+              ['simple', 'compiled']]
+    param_names = ['middleware', 'dispatcher']
+    MIDDLEWARE = {
+        'none': [],
+        'metrics': [MetricsMiddleware],
+        'metrics+tracing': [MetricsMiddleware, TracingMiddleware],
+        'caching': [CachingMiddleware],
+    }
+
+    def setup(self, middleware, dispatcher):
+        self.provider = create_provider(dispatcher)
+        for middleware_class in self.MIDDLEWARE[middleware]:
+            self.provider.middleware.add(middleware_class())
+        self.service = self.provider.new_service(100)
+        self.obj_id = self.service.objects[42].id
+
+    def time_direct_call(self, middleware, dispatcher):
+        # The undecorated method, as a baseline
+        get = SyntheticService.get.__wrapped__
+        for _ in range(CALLS):
+            get(self.service, self.obj_id)
+
+    def time_dispatched_get(self, middleware, dispatcher):
+        for _ in range(CALLS):
+            self.service.get(self.obj_id)
+
+    def time_dispatched_list(self, middleware, dispatcher):
+        for _ in range(CALLS):
+            self.service.list(limit=10)
+
+
+class DispatchChainLength(object):
+    """
+    Dispatch cost as the number of handlers subscribed to an event grows,
+    e.g. with middleware observing all events.
+    """
+    params = [[0, 5, 20], ['simple', 'compiled']]
+    param_names = ['observers', 'dispatcher']
+
+    def setup(self, observers, dispatcher):
+        self.provider = create_provider(dispatcher)
+        for priority in range(observers):
+            self.provider.middleware.events.observe(
+                "provider.synthetic.*", 100 + priority,
+                lambda event_args, *args, **kwargs: None)
+        self.service = self.provider.new_service(100)
+        self.obj_id = self.service.objects[42].id
+
+    def time_dispatched_get(self, observers, dispatcher):
+        for _ in range(CALLS):
+            self.service.get(self.obj_id)
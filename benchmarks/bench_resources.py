@@ -0,0 +1,109 @@
+"""
+Benchmarks of the base layer hot paths over synthetic in-memory resources:
+client-side paging, client-side filtering, paged iteration and
+serialization.
+"""
+from cloudbridge.base import helpers as cb_helpers
+from cloudbridge.base.resources import ClientPagedResultList
+
+from .common import SyntheticProvider
+
+SIZES = [1000, 10000, 100000]
+
+
+class ClientPaging(object):
+    params = SIZES
+    param_names = ['objects']
+
+    def setup(self, size):
+        self.provider = SyntheticProvider()
+        self.service = self.provider.new_service(size)
+        self.objects = self.service.objects
+        self.middle_marker = self.objects[size // 2].id
+        self.last_marker = self.objects[-2].id
+
+    def time_construct(self, size):
+        ClientPagedResultList(self.provider, self.objects)
+
+    def time_seek_middle_marker(self, size):
+        ClientPagedResultList(self.provider, self.objects,
+                              marker=self.middle_marker)
+
+    def time_seek_last_marker(self, size):
+        ClientPagedResultList(self.provider, self.objects,
+                              marker=self.last_marker)
+
+    def time_page_through_all(self, size):
+        # Each page seeks to its marker from the start of the list
+        marker = None
+        for _ in range(20):
+            page = ClientPagedResultList(self.provider, self.objects,
+                                         limit=size // 20, marker=marker)
+            marker = page.marker
+
+
+class Filtering(object):
+    params = [[10000, 100000], ['literal', 'glob', 'two-filters']]
+    param_names = ['objects', 'query']
+    QUERIES = {
+        'literal': {'name': 'synthetic-4242'},
+        'glob': {'label': 'label-4*'},
+        'two-filters': {'label': 'label-4*', 'name': 'synthetic-*2'},
+    }
+
+    def setup(self, size, query):
+        self.provider = SyntheticProvider()
+        self.service = self.provider.new_service(size)
+        self.objects = self.service.objects
+        self.query = self.QUERIES[query]
+
+    def time_generic_find(self, size, query):
+        cb_helpers.generic_find(['name', 'label'], dict(self.query),
+                                self.objects)
+
+    def time_filter_by(self, size, query):
+        # Only the first predicate of the query
+        name, value = sorted(self.query.items())[0]
+        cb_helpers.filter_by(name, {name: value}, self.objects)
+
+    def time_service_find(self, size, query):
+        self.service.find(**self.query)
+
+    def time_find_query_match(self, size, query):
+        list(cb_helpers.FindQuery(['name', 'label'],
+                                  dict(self.query)).match(self.objects))
+
+
+class PagedIteration(object):
+    params = [[1000, 10000, 100000], ['client', 'server']]
+    param_names = ['objects', 'paging']
+
+    def setup(self, size, paging):
+        self.provider = SyntheticProvider()
+        self.service = self.provider.new_service(
+            size, server_paging=paging == 'server')
+
+    def time_iter(self, size, paging):
+        for _ in self.service.iter():
+            pass
+
+    def time_iter_prefetch(self, size, paging):
+        for _ in self.service.iter(prefetch=2):
+            pass
+
+
+class Serialization(object):
+    params = [1000, 10000]
+    param_names = ['objects']
+
+    def setup(self, size):
+        self.provider = SyntheticProvider()
+        self.objects = self.provider.new_service(size).objects
+
+    def time_to_dict(self, size):
+        for obj in self.objects:
+            obj.to_dict()
+
+    def time_iter_json_lines(self, size):
+        for _ in cb_helpers.iter_json_lines(self.objects):
+            pass
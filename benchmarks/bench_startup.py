@@ -0,0 +1,76 @@
+"""
+Startup benchmarks: import time and resident memory of ``import cloudbridge``
+and of loading each provider through the factory.
+
+Each measurement runs in a fresh interpreter, so that modules imported by
+earlier measurements do not skew the results. These are ``track_``
+benchmarks for asv, and can also be run directly with
+``python -m benchmarks.bench_startup``.
+"""
+import json
+import subprocess
+import sys
+
+from cloudbridge.factory import PROVIDER_REGISTRY
+
+MEASURE_SCRIPT = """
+import json
+import resource
+import timeit
+start = timeit.default_timer()
+{statement}
+elapsed = timeit.default_timer() - start
+print(json.dumps({{'time': elapsed,
+                  'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+IMPORT_CLOUDBRIDGE = "import cloudbridge"
+LOAD_PROVIDER = ("from cloudbridge.factory import CloudProviderFactory\n"
+                 "CloudProviderFactory().get_provider_class({0!r})")
+
+
+def measure(statement):
+    """
+    Runs a statement in a new interpreter and returns its wall clock time
+    in seconds and the interpreter's peak RSS (kilobytes on Linux).
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", MEASURE_SCRIPT.format(statement=statement)])
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+class ImportCloudBridge(object):
+    timeout = 120
+
+    def track_import_time(self):
+        return measure(IMPORT_CLOUDBRIDGE)['time']
+    track_import_time.unit = "seconds"
+
+    def track_import_rss(self):
+        return measure(IMPORT_CLOUDBRIDGE)['rss']
+    track_import_rss.unit = "KB"
+
+
+class LoadProvider(object):
+    params = sorted(PROVIDER_REGISTRY)
+    param_names = ['provider']
+    timeout = 120
+
+    def track_load_time(self, provider):
+        return measure(LOAD_PROVIDER.format(provider))['time']
+    track_load_time.unit = "seconds"
+
+    def track_load_rss(self, provider):
+        return measure(LOAD_PROVIDER.format(provider))['rss']
+    track_load_rss.unit = "KB"
+
+
+if __name__ == "__main__":
+    statements = [("import cloudbridge", IMPORT_CLOUDBRIDGE)]
+    statements.extend((provider, LOAD_PROVIDER.format(provider))
+                      for provider in sorted(PROVIDER_REGISTRY))
+    print("{0:<20} {1:>10} {2:>12}".format("", "time (s)", "max RSS (KB)"))
+    for name, statement in statements:
+        result = measure(statement)
+        print("{0:<20} {1:>10.3f} {2:>12}".format(
+            name, result['time'], result['rss']))
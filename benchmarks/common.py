@@ -0,0 +1,117 @@
+"""
+Synthetic in-memory resources and services for benchmarking the base layer
+without a cloud, and helpers for the moto-backed mock provider.
+"""
+from cloudbridge.base import BaseCloudProvider
+from cloudbridge.base import helpers as cb_helpers
+from cloudbridge.base.middleware import dispatch
+from cloudbridge.base.resources import BaseCloudResource
+from cloudbridge.base.resources import BasePageableObjectMixin
+from cloudbridge.base.resources import ClientPagedResultList
+from cloudbridge.base.resources import ServerPagedResultList
+from cloudbridge.base.services import BaseCloudService
+from cloudbridge.factory import CloudProviderFactory
+from cloudbridge.factory import ProviderList
+
+
+class SyntheticResource(BaseCloudResource):
+    """
+    A resource whose properties are plain attributes, so that benchmarks
+    measure the base layer rather than property lookups.
+    """
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'state', 'size', 'tags')
+
+    def __init__(self, provider, index):
+        super(SyntheticResource, self).__init__(provider)
+        self._id = "res-{0:06d}".format(index)
+        self._name = "synthetic-{0}".format(index)
+        self.label = "label-{0}".format(index % 100)
+        self.state = "available" if index % 3 else "in-use"
+        self.size = index % 1000
+        self.tags = {'index': str(index), 'group': str(index % 10)}
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def name(self):
+        return self._name
+
+
+class SyntheticService(BasePageableObjectMixin, BaseCloudService):
+    """
+    A service over an in-memory list of resources, whose methods are
+    dispatched through the provider's middleware like those of a real
+    service.
+    """
+
+    def __init__(self, provider, objects, server_paging=False):
+        super(SyntheticService, self).__init__(provider)
+        self._service_event_pattern += ".synthetic"
+        self.objects = objects
+        self.index = {obj.id: obj for obj in objects}
+        self.server_paging = server_paging
+
+    @dispatch(event="provider.synthetic.get",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get(self, obj_id):
+        return self.index.get(obj_id)
+
+    @dispatch(event="provider.synthetic.list",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def list(self, limit=None, marker=None):
+        if not self.server_paging:
+            return ClientPagedResultList(self.provider, self.objects,
+                                         limit=limit, marker=marker)
+        limit = limit or self.provider.config.default_result_limit
+        start = int(marker) if marker else 0
+        end = start + limit
+        is_truncated = end < len(self.objects)
+        return ServerPagedResultList(
+            is_truncated, str(end) if is_truncated else None, False,
+            data=self.objects[start:end])
+
+    @dispatch(event="provider.synthetic.find",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def find(self, **kwargs):
+        return ClientPagedResultList(
+            self.provider,
+            cb_helpers.generic_find(['name', 'label'], kwargs, self.objects))
+
+
+class SyntheticProvider(BaseCloudProvider):
+    """
+    A provider for benchmarking the base layer and middleware dispatch. It
+    has none of the standard services, only those created with
+    :meth:`new_service`, so ``has_service()`` is false for all of them.
+    """
+    PROVIDER_ID = 'synthetic'
+    # Satisfy the abstract service properties without implementing them
+    compute = None
+    networking = None
+    security = None
+    storage = None
+    dns = None
+
+    def __init__(self, config=None):
+        super(SyntheticProvider, self).__init__(config or {})
+        self._region_name = 'synthetic'
+        self._zone_name = 'synthetic-a'
+
+    def new_service(self, size, server_paging=False):
+        objects = [SyntheticResource(self, i) for i in range(size)]
+        return SyntheticService(self, objects, server_paging=server_paging)
+
+
+def create_mock_provider():
+    """
+    Returns a moto-backed AWS provider. Moto keeps its state in memory, so
+    resources must be created in the process that benchmarks them, i.e. in
+    ``setup()`` rather than ``setup_cache()``.
+    """
+    return CloudProviderFactory().create_provider(
+        ProviderList.MOCK, {'aws_access_key': 'benchmark',
+                            'aws_secret_key': 'benchmark',
+                            'aws_region_name': 'us-east-1'})
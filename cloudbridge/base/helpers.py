@@ -1,9 +1,20 @@
+import email.utils
 import fnmatch
 import functools
+import json
+import logging
 import os
+import queue
+import random
 import re
 import sys
+import threading
+import time
 import traceback
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import wait
 from contextlib import contextmanager
 
 from cryptography.hazmat.backends import default_backend
@@ -18,6 +29,8 @@ import cloudbridge
 
 from ..interfaces.exceptions import InvalidParamException
 
+log = logging.getLogger(__name__)
+
 
 def generate_key_pair():
     """
@@ -78,6 +91,170 @@ def generic_find(filter_names, kwargs, objs):
     return matches
 
 
+def has_wildcards(value):
+    """
+    Returns ``True`` if the given find() value is a glob pattern rather
+    than a literal.
+    """
+    return (isinstance(value, six.string_types) and
+            any(c in value for c in '*?['))
+
+
+def glob_prefix(pattern):
+    """
+    Returns the literal part of a glob pattern up to its first wildcard.
+    For a literal value, the value itself is returned.
+    """
+    match = re.search(r'[*?\[]', pattern)
+    return pattern[:match.start()] if match else pattern
+
+
+def glob_to_regex(pattern):
+    """
+    Converts a glob pattern, which may only contain the ``*`` and ``?``
+    wildcards, into an anchored regular expression that can be understood
+    by server-side regex filters.
+    """
+    regex = ''.join('.*' if c == '*' else '.' if c == '?' else re.escape(c)
+                    for c in pattern)
+    return '^' + regex + '$'
+
+
+class FindQuery(object):
+    """
+    Splits the keyword arguments of a ``find()`` call into predicates that
+    can be evaluated by the provider (pushed down into the native list
+    call) and predicates that must still be matched on the client.
+
+    Providers claim the predicates their API can evaluate with
+    :meth:`push_down` or :meth:`push_down_prefix`, build the native query
+    from the returned values, and pass the results through :meth:`match`
+    to apply whatever could not be pushed down. Client-side matching uses
+    glob semantics, anchored at both ends, so that results are the same
+    whether or not a predicate was pushed down.
+
+    Usage:
+        query = FindQuery(['label'], kwargs)
+        label = query.push_down('label')
+        objs = list_objects(filters={'tag:Name': label} if label else {})
+        return query.match(objs)
+    """
+
+    def __init__(self, filter_names, kwargs):
+        self.filter_names = filter_names
+        self.predicates = {}
+        for name in filter_names:
+            value = kwargs.pop(name, None)
+            if value:
+                self.predicates[name] = value
+        # All kwargs should have been popped at this time.
+        if len(kwargs) > 0:
+            raise InvalidParamException(
+                "Unrecognised parameters for search: %s. Supported "
+                "attributes: %s" % (kwargs, ", ".join(filter_names)))
+        self.pushed_down = {}
+        self.client_side = dict(self.predicates)
+
+    def push_down(self, name, wildcards=False):
+        """
+        Claims a predicate for server-side evaluation.
+
+        :type name: ``str``
+        :param name: The name of the predicate.
+
+        :type wildcards: ``bool``
+        :param wildcards: Whether the native filter understands the ``*`` and
+                          ``?`` wildcards. If not, only literal values are
+                          pushed down.
+
+        :rtype: ``object``
+        :return: The value to filter by natively, or ``None`` if the
+                 predicate was not given or cannot be pushed down, in which
+                 case it is matched on the client.
+        """
+        value = self.predicates.get(name)
+        if value is None:
+            return None
+        if has_wildcards(value) and (not wildcards or '[' in value):
+            return None
+        self.pushed_down[name] = value
+        self.client_side.pop(name, None)
+        return value
+
+    def push_down_prefix(self, name):
+        """
+        Claims the literal prefix of a string predicate for a native prefix
+        listing (e.g. S3 or Swift object prefixes). The predicate itself is
+        still matched on the client.
+
+        :rtype: ``str``
+        :return: The prefix to list by, or ``None`` if the predicate was not
+                 given or has no literal prefix.
+        """
+        value = self.predicates.get(name)
+        if not isinstance(value, six.string_types):
+            return None
+        prefix = glob_prefix(value)
+        if not prefix:
+            return None
+        self.pushed_down[name] = prefix + '*'
+        return prefix
+
+    def match(self, objs):
+        """
+        Applies the predicates that were not pushed down to a list of
+        objects. If every predicate was pushed down, ``objs`` is returned
+        as is.
+        """
+        log.debug("find(%s): pushed down %s, matching %s on client",
+                  self.predicates, self.pushed_down, self.client_side)
+        if not self.client_side:
+            return objs
+        matches = []
+        for obj in objs:
+            for name, value in self.client_side.items():
+                prop = getattr(obj, name)
+                if isinstance(value, six.string_types):
+                    if not (prop and fnmatch.fnmatchcase(prop, value)):
+                        break
+                elif prop != value:
+                    break
+            else:
+                matches.append(obj)
+        return matches
+
+
+def iter_json_lines(resources, fields=None, resolve=False):
+    """
+    Serializes resources as JSON lines, one resource at a time. Since any
+    iterable is accepted, a service can be passed in directly to stream all
+    of its resources while pages are fetched.
+
+    Usage:
+        with open('instances.jsonl', 'w') as f:
+            f.writelines(iter_json_lines(provider.compute.instances))
+
+    :type resources: ``iterable`` of :class:`.CloudResource`
+    :param resources: The resources to serialize.
+
+    :type fields: ``list`` of ``str``
+    :param fields: The properties to include. See
+                   :meth:`.CloudResource.to_dict`.
+
+    :type resolve: ``bool``
+    :param resolve: Whether to include properties that require a call to
+                    the provider.
+
+    :rtype: ``iterator`` of ``str``
+    :return: An iterator of JSON strings, each terminated by a newline.
+    """
+    for resource in resources:
+        # Values such as timestamps are not always strings, so fall back to
+        # their string representation.
+        yield json.dumps(resource.to_dict(fields=fields, resolve=resolve),
+                         default=str) + "\n"
+
+
 @contextmanager
 def cleanup_action(cleanup_func):
     """
@@ -113,6 +290,556 @@ def cleanup_action(cleanup_func):
         traceback.print_exc()
 
 
+def prefetch(iterable, depth):
+    """
+    Iterates through an iterable on a background thread, keeping up to
+    ``depth`` items fetched ahead of the consumer.
+
+    This is useful for overlapping network round trips with processing,
+    for example, fetching the next page of results while the current page
+    is being processed. Memory use is bounded, since the background thread
+    blocks once ``depth`` items are waiting to be consumed. Any exception
+    raised by the iterable, including a ``BaseException`` such as
+    ``SystemExit``, is re-raised in the consumer. Closing the
+    returned generator stops the background thread.
+
+    :type iterable: ``iterable``
+    :param iterable: The iterable to consume in the background
+
+    :type depth: ``int``
+    :param depth: Maximum number of items to fetch ahead of the consumer.
+                  Must be at least 1.
+    """
+    assert depth >= 1
+    done = object()
+    items = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        error = None
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            # Including e.g. SystemExit, so that the consumer is never left
+            # waiting for an end that does not come
+            error = e
+        finally:
+            put((done, error))
+
+    producer = threading.Thread(target=produce, name="cb-prefetch")
+    producer.daemon = True
+    producer.start()
+    try:
+        while True:
+            item, exc = items.get()
+            if item is done:
+                if exc:
+                    raise exc
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+class ClientCache(object):
+    """
+    Holds the SDK sessions and clients that a provider creates lazily.
+
+    By default, one set of clients is shared by all threads. In thread-safe
+    mode, each thread creates and reuses its own clients instead, since SDK
+    sessions and clients (e.g. boto3 sessions and resources) cannot safely
+    be shared between threads.
+
+    Usage:
+        clients = ClientCache(thread_safe=True)
+        ec2 = clients.get('ec2', lambda: session.resource('ec2'))
+    """
+
+    def __init__(self, thread_safe=False):
+        self._thread_safe = bool(thread_safe)
+        self._shared = {}
+        self._local = threading.local()
+
+    @property
+    def thread_safe(self):
+        return self._thread_safe
+
+    def enable_thread_safety(self):
+        """
+        Switches to thread-safe mode. The calling thread keeps the clients
+        created so far, while other threads create their own.
+        """
+        if not self._thread_safe:
+            self._local.clients = self._shared
+            self._shared = {}
+            self._thread_safe = True
+
+    @property
+    def _clients(self):
+        if not self._thread_safe:
+            return self._shared
+        clients = getattr(self._local, 'clients', None)
+        if clients is None:
+            clients = self._local.clients = {}
+        return clients
+
+    def get(self, name, create):
+        """
+        Returns the named client of the current thread, calling ``create()``
+        to create it if it does not exist yet.
+        """
+        clients = self._clients
+        client = clients.get(name)
+        if client is None:
+            client = clients[name] = create()
+        return client
+
+    def peek(self, name):
+        """
+        Returns the named client of the current thread, or ``None`` if it
+        has not been created.
+        """
+        return self._clients.get(name)
+
+    def discard(self, name):
+        """
+        Discards the named client of the current thread, so that it is
+        created again on next use.
+        """
+        self._clients.pop(name, None)
+
+
+class ParallelExecutor(object):
+    """
+    Runs calls concurrently on a bounded pool of worker threads, which is
+    created on first use. This is useful for fanning out operations such as
+    deleting many resources at once.
+
+    Calls should only be run in parallel against a provider in thread-safe
+    mode, so that each worker thread uses its own SDK clients. Calls
+    submitted from one of the executor's own worker threads are run inline,
+    since waiting on them could otherwise deadlock once all workers are busy.
+
+    Usage:
+        executor = ParallelExecutor(max_workers=10)
+        for vol in executor.map(lambda v: v.delete(), volumes):
+            pass
+    """
+
+    def __init__(self, max_workers):
+        assert max_workers >= 1
+        self.max_workers = max_workers
+        self._pool = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def _executor(self):
+        with self._lock:
+            if not self._pool:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="cb-parallel")
+            return self._pool
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedules ``fn(*args, **kwargs)`` to run on a worker thread.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :return: A future representing the pending call.
+        """
+        if getattr(self._local, 'in_worker', False):
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._executor.submit(self._run_in_worker, fn, args, kwargs)
+
+    def _run_in_worker(self, fn, args, kwargs):
+        self._local.in_worker = True
+        return fn(*args, **kwargs)
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        """
+        Calls ``fn`` on each item of the iterables in parallel, in the same
+        way as the builtin ``map()``. All calls are scheduled immediately,
+        and at most ``max_workers`` of them run at the same time.
+
+        :type timeout: ``float``
+        :param timeout: The maximum number of seconds to wait for all
+                        results. Waits without a limit if not given.
+
+        :type chunksize: ``int``
+        :param chunksize: Accepted for compatibility with
+                          :meth:`concurrent.futures.Executor.map`. Like
+                          there, it has no effect on threads.
+
+        :rtype: ``iterator``
+        :return: The results of the calls, in the order of the iterables.
+                 If a call raised an exception, it is re-raised when its
+                 result is retrieved.
+        """
+        assert chunksize >= 1
+        end_time = time.time() + timeout if timeout is not None else None
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+
+        def results():
+            try:
+                for future in futures:
+                    yield future.result(
+                        None if end_time is None else end_time - time.time())
+            finally:
+                for future in futures:
+                    future.cancel()
+        return results()
+
+    def map_limited(self, fn, iterable, concurrency):
+        """
+        Calls ``fn`` on each item of the iterable in parallel, with at most
+        ``concurrency`` calls in flight at a time, e.g. to bound the memory
+        held by calls that each buffer some data. An item is only taken from
+        the iterable once a slot is free, so at most ``concurrency`` items
+        are held at any time, and no further calls are scheduled once a call
+        has raised an exception.
+
+        :type concurrency: ``int``
+        :param concurrency: The maximum number of calls in flight. Calls also
+                            never exceed the executor's ``max_workers``.
+
+        :rtype: ``list``
+        :return: The results of the calls, in the order of the iterable. If
+                 any call raised an exception, it is re-raised once all
+                 calls in flight have completed.
+        """
+        assert concurrency >= 1
+        slots = threading.BoundedSemaphore(concurrency)
+        failed = threading.Event()
+
+        def run(item):
+            try:
+                return fn(item)
+            except Exception:
+                failed.set()
+                raise
+            finally:
+                slots.release()
+
+        futures = []
+        iterator = iter(iterable)
+        while True:
+            # Take a slot before pulling the next item, so that at most
+            # ``concurrency`` items are ever held, including one that is
+            # waiting to be scheduled.
+            slots.acquire()
+            if failed.is_set():
+                slots.release()
+                break
+            try:
+                item = next(iterator)
+            except StopIteration:
+                slots.release()
+                break
+            futures.append(self.submit(run, item))
+        wait(futures)
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def as_completed(futures, timeout=None):
+        """
+        Yields the given futures as they complete.
+
+        :type timeout: ``float``
+        :param timeout: The maximum number of seconds to wait for all futures
+                        to complete.
+        """
+        return as_completed(futures, timeout=timeout)
+
+    def shutdown(self, wait=True):
+        """
+        Stops the worker threads once pending calls have completed. The
+        executor can still be used afterwards, in which case new worker
+        threads are started.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=wait)
+
+
+def backoff_delay(attempt, base_delay, max_delay, min_delay=0):
+    """
+    Returns a random delay to wait before retrying a call, which grows
+    exponentially with the attempt number (starting at 0). The delay
+    is drawn from the whole range below the exponential bound ("full
+    jitter"), so that callers that failed together do not retry together.
+    A ``min_delay`` raises the bottom of that range, for callers that must
+    wait at least some time for a change to take effect.
+    """
+    bound = max(min_delay, min(max_delay, base_delay * 2 ** attempt))
+    return random.uniform(min_delay, bound)
+
+
+def retry_call(func, retry_if, max_attempts=5, base_delay=1, max_delay=10,
+               deadline=None, min_delay=0):
+    """
+    Calls ``func()``, retrying with a jittered exponential backoff as long as
+    it raises exceptions for which ``retry_if(exception)`` is true.
+
+    :type max_attempts: ``int``
+    :param max_attempts: The maximum number of calls to make.
+
+    :type deadline: ``float``
+    :param deadline: The maximum number of seconds to spend on all calls.
+                     No further calls are made once the next call would
+                     start after the deadline.
+
+    :type min_delay: ``float``
+    :param min_delay: The minimum number of seconds between calls, e.g.
+                      to give an eventually consistent cloud time to
+                      catch up.
+
+    :return: The result of the first successful call. Once no more calls
+             may be made, the last exception is re-raised.
+    """
+    end_time = time.time() + deadline if deadline is not None else None
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            attempt += 1
+            if attempt >= max_attempts or not retry_if(e):
+                raise
+            delay = backoff_delay(attempt - 1, base_delay, max_delay,
+                                  min_delay)
+            if end_time is not None and time.time() + delay > end_time:
+                raise
+            log.debug("Retrying %s in %.2f seconds after error: %s",
+                      getattr(func, '__name__', func), delay, e)
+            time.sleep(delay)
+
+
+def retry(retry_if, max_attempts=5, base_delay=1, max_delay=10,
+          deadline=None, min_delay=0):
+    """
+    A decorator that retries the decorated function with
+    :func:`retry_call`.
+
+    Usage:
+        @retry(lambda e: isinstance(e, ClientError), max_attempts=3)
+        def set_tag(resource):
+            ...
+    """
+    def deco(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call = functools.partial(func, *args, **kwargs)
+            call.__name__ = func.__name__
+            return retry_call(call, retry_if, max_attempts=max_attempts,
+                              base_delay=base_delay, max_delay=max_delay,
+                              deadline=deadline, min_delay=min_delay)
+        return wrapper
+    return deco
+
+
+def parse_retry_after(value):
+    """
+    Parses the value of a ``Retry-After`` header, given either in seconds or
+    as an HTTP date.
+
+    :rtype: ``float``
+    :return: The number of seconds to wait, or ``None`` if the value is
+             missing or cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    retry_date = email.utils.parsedate_tz(value)
+    if retry_date is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(retry_date) - time.time())
+
+
+class _TokenBucket(object):
+    """
+    The token bucket and request rate statistics of a single API family.
+    Its state is guarded by the owning limiter's lock.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = 1.0
+        self.refill_time = time.time()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.window_start = self.refill_time
+        self.window_count = 0
+        self.last_window_rate = 0.0
+
+    def refill(self, now):
+        if self.rate is not None:
+            self.tokens = min(max(1.0, self.rate), self.tokens +
+                              (now - self.refill_time) * self.rate)
+        self.refill_time = now
+
+    def count_request(self, now):
+        elapsed = now - self.window_start
+        if elapsed >= 1.0:
+            self.last_window_rate = self.window_count / elapsed
+            self.window_start = now
+            self.window_count = 0
+        self.window_count += 1
+
+    @property
+    def measured_rate(self):
+        return max(self.last_window_rate, self.window_count)
+
+
+class AdaptiveRateLimiter(object):
+    """
+    Paces requests to a cloud API with a token bucket per API family (e.g.
+    EC2 describe calls), shared by all threads using a provider.
+
+    The rate of each family is adjusted with additive increase,
+    multiplicative decrease (AIMD): the rate is cut whenever the cloud
+    reports throttling, and grows back slowly while requests succeed. A
+    ``Retry-After`` delay sent with a throttling error holds back all
+    requests of the family until it has passed.
+
+    Unless a maximum rate is given, requests are not held back at all until
+    a family is first throttled.
+
+    Usage:
+        limiter = AdaptiveRateLimiter()
+        limiter.acquire('ec2.describe')
+        try:
+            response = client.describe_instances()
+        except ThrottlingError as e:
+            limiter.record_throttle('ec2.describe', retry_after=5)
+            raise
+        limiter.record_success('ec2.describe')
+    """
+
+    def __init__(self, max_rate=None, min_rate=0.5, increase=1.0,
+                 decrease=0.5):
+        """
+        :type max_rate: ``float``
+        :param max_rate: The maximum number of requests per second of each
+                         family. Unlimited if not given.
+
+        :type min_rate: ``float``
+        :param min_rate: The rate below which throttling no longer reduces
+                         the rate of a family.
+
+        :type increase: ``float``
+        :param increase: The number of requests per second by which the rate
+                         grows each second while requests succeed.
+
+        :type decrease: ``float``
+        :param decrease: The factor by which the rate is multiplied when
+                         requests are throttled.
+        """
+        assert max_rate is None or max_rate > 0
+        assert 0 < decrease < 1
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, family):
+        bucket = self._buckets.get(family)
+        if bucket is None:
+            bucket = self._buckets[family] = _TokenBucket(self.max_rate)
+        return bucket
+
+    def rate(self, family):
+        """
+        Returns the current number of requests per second allowed for the
+        family, or ``None`` if its requests are not being held back.
+        """
+        with self._lock:
+            return self._bucket(family).rate
+
+    def acquire(self, family):
+        """
+        Waits until a request of the given family may be sent.
+        """
+        while True:
+            with self._lock:
+                bucket = self._bucket(family)
+                now = time.time()
+                bucket.refill(now)
+                if now < bucket.blocked_until:
+                    wait = bucket.blocked_until - now
+                elif bucket.rate is None or bucket.tokens >= 1:
+                    if bucket.rate is not None:
+                        bucket.tokens -= 1
+                    bucket.count_request(now)
+                    return
+                else:
+                    wait = (1 - bucket.tokens) / bucket.rate
+            log.debug("Rate limiting %s requests, waiting %.2f seconds",
+                      family, wait)
+            time.sleep(wait)
+
+    def record_success(self, family):
+        """
+        Records a request of the given family that was not throttled.
+        """
+        with self._lock:
+            bucket = self._bucket(family)
+            if bucket.rate is not None:
+                bucket.rate += self.increase / max(bucket.rate, 1.0)
+                if self.max_rate:
+                    bucket.rate = min(bucket.rate, self.max_rate)
+
+    def record_throttle(self, family, retry_after=None):
+        """
+        Records a request of the given family that the cloud throttled.
+
+        :type retry_after: ``float``
+        :param retry_after: The number of seconds the cloud asked to wait
+                            before sending more requests, if any.
+        """
+        with self._lock:
+            bucket = self._bucket(family)
+            now = time.time()
+            if retry_after:
+                bucket.blocked_until = max(bucket.blocked_until,
+                                           now + retry_after)
+            # Requests that were in flight together are throttled together,
+            # so cut the rate at most once per second
+            if now - bucket.last_decrease < 1.0:
+                return
+            current = (bucket.rate if bucket.rate is not None
+                       else bucket.measured_rate)
+            bucket.refill(now)
+            bucket.rate = max(self.min_rate, current * self.decrease)
+            bucket.tokens = min(bucket.tokens, 1.0)
+            bucket.last_decrease = now
+            log.debug("%s requests were throttled, reducing rate to %.2f "
+                      "requests per second", family, bucket.rate)
+
+
 def get_env(varname, default_value=None):
     """
     Return the value of the environment variable or default_value.
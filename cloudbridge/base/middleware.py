@@ -1,18 +1,221 @@
+import bisect
+import cProfile
+import fnmatch
+import functools
+import json
 import logging
+import os
+import pstats
+import random
+import re
 import sys
+import threading
+import time
+import timeit
+from collections import OrderedDict
+from collections import deque
+from contextlib import contextmanager
 
+from pyeventsystem.events import ImplementingEventHandler
+from pyeventsystem.events import InterceptingEventHandler
+from pyeventsystem.events import ObservingEventHandler
+from pyeventsystem.events import PlaceHoldingEventHandler
+from pyeventsystem.events import SimpleEventDispatcher
+from pyeventsystem.middleware import BaseMiddleware
 from pyeventsystem.middleware import dispatch as pyevent_dispatch
 from pyeventsystem.middleware import intercept
 from pyeventsystem.middleware import observe
 
 import six
 
+from ..base.helpers import backoff_delay
+from ..interfaces.exceptions import CircuitOpenException
 from ..interfaces.exceptions import CloudBridgeBaseException
+from ..interfaces.resources import CloudResource
 
 log = logging.getLogger(__name__)
 
 
-dispatch = pyevent_dispatch
+class _InterceptingLink(object):
+
+    def __init__(self, handler, next_link):
+        self.handler = handler
+        self.callback = handler.callback
+        self.priority = handler.priority
+        self.next = next_link
+
+    def invoke(self, event_args, *args, **kwargs):
+        event_args['next_handler'] = self.next
+        result = self.callback(event_args, *args, **kwargs)
+        event_args.pop('next_handler', None)
+        return result
+
+
+class _ObservingLink(_InterceptingLink):
+
+    def invoke(self, event_args, *args, **kwargs):
+        event_args.pop('next_handler', None)
+        self.callback(event_args, *args, **kwargs)
+        if self.next:
+            return self.next.invoke(event_args, *args, **kwargs)
+        return None
+
+
+class _ImplementingLink(_InterceptingLink):
+
+    def invoke(self, event_args, *args, **kwargs):
+        result = self.callback(*args, **kwargs)
+        if self.next:
+            event_args['next_handler'] = self.next
+            event_args['result'] = result
+            self.next.invoke(event_args, *args, **kwargs)
+            event_args.pop('result', None)
+            event_args.pop('next_handler', None)
+        return result
+
+
+class _HandlerLink(_InterceptingLink):
+    # A handler of a type we know nothing about, which finds its successor
+    # through the dispatcher as usual
+
+    def invoke(self, event_args, *args, **kwargs):
+        return self.handler.invoke(event_args, *args, **kwargs)
+
+
+class HandlerChain(object):
+    """
+    The handlers subscribed to a single event, linked in priority order so
+    that each handler's successor is known without searching the handler
+    list on every hop. The links have the same semantics as the pyeventsystem
+    handlers they replace, and are passed to interceptors as their
+    ``next_handler``.
+    """
+    LINK_TYPES = {
+        InterceptingEventHandler: _InterceptingLink,
+        ObservingEventHandler: _ObservingLink,
+        ImplementingEventHandler: _ImplementingLink,
+    }
+
+    def __init__(self, event, handlers):
+        self.event = event
+        self.head = None
+        for handler in reversed(handlers):
+            link_type = self.LINK_TYPES.get(type(handler), _HandlerLink)
+            self.head = link_type(handler, self.head)
+        # The bound methods implementing the event, as (object id, function)
+        # pairs. The handlers hold a reference to each object, so the ids
+        # cannot be reused while the chain is current.
+        self.implementers = frozenset(
+            (id(h.callback.__self__), h.callback.__func__) for h in handlers
+            if isinstance(h, ImplementingEventHandler) and
+            hasattr(h.callback, '__self__'))
+        self.direct_callback = self._find_direct_callback(handlers)
+        self.wraps_exceptions = bool(handlers) and _is_exception_wrapper(
+            handlers[0])
+
+    @staticmethod
+    def _find_direct_callback(handlers):
+        # The chain can be bypassed if the only handler other than the
+        # exception wrapper, which every provider has, is the implementation
+        others = [h for h in handlers if not _is_exception_wrapper(h)]
+        if (len(others) == 1 and
+                type(others[0]) is ImplementingEventHandler and
+                handlers[-1] is others[0]):
+            return others[0].callback
+        return None
+
+    def is_direct(self, obj, func):
+        """
+        Whether a call to ``func`` bound to ``obj`` can bypass the chain,
+        because that method is the only handler for the event.
+        """
+        callback = self.direct_callback
+        return (callback is not None and callback.__self__ is obj and
+                callback.__func__ is func)
+
+    def invoke(self, sender, *args, **kwargs):
+        if not self.head:
+            log.warning("Event '%s' has no subscribed handlers.", self.event)
+            return None
+        event_args = {'event': self.event, 'sender': sender}
+        return self.head.invoke(event_args, *args, **kwargs)
+
+
+class CompiledEventDispatcher(SimpleEventDispatcher):
+    """
+    An event dispatcher that compiles the handlers for each event it
+    dispatches into a :class:`HandlerChain`, and caches the chain until
+    middleware is added or removed.
+    """
+
+    def __init__(self):
+        super(CompiledEventDispatcher, self).__init__()
+        self._chains = {}
+        self._version = 0
+
+    def _invalidate_cache(self, event_pattern):
+        super(CompiledEventDispatcher, self)._invalidate_cache(event_pattern)
+        self._version += 1
+        self._chains = {}
+
+    def get_handler_chain(self, event):
+        chain = self._chains.get(event)
+        if chain is None:
+            version = self._version
+            chain = HandlerChain(event, self.get_handlers_for_event(event))
+            # Don't cache a chain that a concurrent subscription has made
+            # stale while it was being compiled
+            if version == self._version:
+                self._chains[event] = chain
+        return chain
+
+    def dispatch(self, sender, event, *args, **kwargs):
+        return self.get_handler_chain(event).invoke(sender, *args, **kwargs)
+
+
+def _is_exception_wrapper(handler):
+    return getattr(handler.callback, '__func__', None) is \
+        ExceptionWrappingMiddleware.wrap_exception
+
+
+def dispatch(event, priority, dispatcher_attr='events'):
+    """
+    Combines implementing an event and dispatching it into a single
+    decorator, like :func:`pyeventsystem.middleware.dispatch`.
+
+    With a :class:`CompiledEventDispatcher`, calls are dispatched through
+    the cached handler chain for the event, and call the method directly
+    when it is the only handler for the event other than the exception
+    wrapper. Other dispatchers are handled by pyeventsystem.
+    """
+    def deco(f):
+        fallback = pyevent_dispatch(event, priority, dispatcher_attr)(f)
+
+        @functools.wraps(f)
+        def wrapper(self, *args, **kwargs):
+            dispatcher = getattr(self, dispatcher_attr, None) \
+                if '.' not in dispatcher_attr else None
+            if not isinstance(dispatcher, CompiledEventDispatcher):
+                return fallback(self, *args, **kwargs)
+            chain = dispatcher.get_handler_chain(event)
+            if chain.is_direct(self, f):
+                if not chain.wraps_exceptions:
+                    return f(self, *args, **kwargs)
+                try:
+                    return f(self, *args, **kwargs)
+                except Exception as e:
+                    ExceptionWrappingMiddleware.reraise(e)
+            elif (id(self), f) in chain.implementers:
+                return chain.invoke(self, *args, **kwargs)
+            else:
+                # Not registered with the dispatcher, or overridden
+                return f(self, *args, **kwargs)
+        # Mark function as having an event_handler so that middleware auto
+        # discovery registers the (unbound) original function
+        wrapper.__event_handler = PlaceHoldingEventHandler(
+            event, priority, f, ImplementingEventHandler)
+        return wrapper
+    return deco
 
 
 class EventDebugLoggingMiddleware(object):
@@ -44,14 +247,873 @@ class ExceptionWrappingMiddleware(object):
         try:
             return next_handler.invoke(event_args, *args, **kwargs)
         except Exception as e:
-            if isinstance(e, CloudBridgeBaseException):
-                raise
+            self.reraise(e)
+
+    @staticmethod
+    def reraise(e):
+        """
+        Re-raises the exception being handled, wrapped in a
+        ``CloudBridgeBaseException`` unless it already is one.
+        """
+        if isinstance(e, CloudBridgeBaseException):
+            raise
+        else:
+            ex_type, ex_value, traceback = sys.exc_info()
+            cb_ex = CloudBridgeBaseException(
+                "CloudBridgeBaseException: {0} from exception type: {1}"
+                .format(ex_value, ex_type))
+            if sys.version_info >= (3, 0):
+                six.raise_from(cb_ex, e)
             else:
-                ex_type, ex_value, traceback = sys.exc_info()
-                cb_ex = CloudBridgeBaseException(
-                    "CloudBridgeBaseException: {0} from exception type: {1}"
-                    .format(ex_value, ex_type))
-                if sys.version_info >= (3, 0):
-                    six.raise_from(cb_ex, e)
+                six.reraise(CloudBridgeBaseException, cb_ex, traceback)
+
+
+class CachingMiddleware(object):
+    """
+    Caches the results of ``list``, ``get``, ``get_many`` and ``find`` events
+    in a bounded LRU cache, with a configurable time-to-live per service.
+
+    Any other event on a service (e.g. ``create`` or ``delete``) is passed
+    through and evicts all cached entries for that service, so that reads
+    following a write through CloudBridge are never stale. Changes made
+    outside of CloudBridge are only picked up once the entry expires.
+
+    Note that cached results are shared between callers, so a resource
+    returned from the cache may have been refreshed by another caller.
+
+    Example:
+
+    .. code-block:: python
+
+        provider.middleware.add(CachingMiddleware(
+            ttls={'provider.compute.vm_types.*': 3600,
+                  'provider.compute.regions.*': 3600,
+                  'provider.compute.instances.*': 10}))
+    """
+    READ_OPERATIONS = ('list', 'get', 'get_many', 'find')
+    DEFAULT_TTL = 60
+    DEFAULT_MAX_ENTRIES = 1024
+
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        :type ttls: ``dict``
+        :param ttls: A mapping of event patterns (e.g.
+                     ``provider.compute.vm_types.*``) to a TTL in seconds.
+                     The first matching pattern is used. A TTL of 0 disables
+                     caching for matching events.
+
+        :type default_ttl: ``int``
+        :param default_ttl: TTL in seconds for events not matching any of
+                            the ``ttls`` patterns.
+
+        :type max_entries: ``int``
+        :param max_entries: Maximum number of cached results. The least
+                            recently used entry is evicted first.
+        """
+        self.ttls = [(re.compile(fnmatch.translate(pattern)), ttl)
+                     for pattern, ttl in (ttls or {}).items()]
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_ttl(self, event):
+        for regex, ttl in self.ttls:
+            if regex.match(event):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def _freeze(value):
+        # CloudBridge resources are not hashable, so key them by id
+        if isinstance(value, CloudResource):
+            return (type(value).__name__, value.id)
+        elif isinstance(value, (list, tuple)):
+            return tuple(CachingMiddleware._freeze(v) for v in value)
+        elif isinstance(value, dict):
+            return tuple(sorted((k, CachingMiddleware._freeze(v))
+                                for k, v in value.items()))
+        return value
+
+    def _make_key(self, event_args, args, kwargs):
+        key = (event_args.get("event"), event_args.get("sender"),
+               self._freeze(args), self._freeze(kwargs))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def invalidate(self, event_pattern="*"):
+        """
+        Evict all cached entries whose event name matches the given pattern.
+
+        :type event_pattern: ``str``
+        :param event_pattern: A glob pattern such as
+                              ``provider.compute.instances.*``
+        """
+        regex = re.compile(fnmatch.translate(event_pattern))
+        with self._lock:
+            for key in [k for k in self._cache if regex.match(k[0])]:
+                del self._cache[key]
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return False, None
+            expiry, result = entry
+            if expiry < time.time():
+                del self._cache[key]
+                return False, None
+            self._cache.move_to_end(key)
+            return True, result
+
+    def _store(self, key, result, ttl):
+        with self._lock:
+            self._cache[key] = (time.time() + ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    @intercept(event_pattern="provider.*", priority=1100)
+    def cache_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        event = event_args.get("event")
+        service_pattern, operation = event.rsplit(".", 1)
+        if operation not in self.READ_OPERATIONS:
+            try:
+                return next_handler.invoke(event_args, *args, **kwargs)
+            finally:
+                self.invalidate(service_pattern + ".*")
+
+        ttl = self._get_ttl(event)
+        key = self._make_key(event_args, args, kwargs) if ttl > 0 else None
+        if key is None:
+            return next_handler.invoke(event_args, *args, **kwargs)
+        found, result = self._lookup(key)
+        if found:
+            log.debug("Returning cached result for event: %s", event)
+            return result
+        result = next_handler.invoke(event_args, *args, **kwargs)
+        if result is not None:
+            self._store(key, result, ttl)
+        return result
+
+
+class MetricsMiddleware(object):
+    """
+    Records call counts, error counts and latency histograms per event
+    (e.g. ``provider.storage.buckets.list``). Metrics can be retrieved as a
+    dict with :meth:`snapshot` or rendered in the Prometheus text exposition
+    format with :meth:`to_prometheus`.
+
+    Timing is done by a single intercepting handler placed just after the
+    debug logging observer, rather than a pair of pre/post observers.
+    Observers are not notified when a handler raises, nor when another
+    middleware (e.g. :class:`CachingMiddleware`) returns a result without
+    invoking the rest of the chain, so a post observer would miss both
+    failed and cached calls.
+
+    Example:
+
+    .. code-block:: python
+
+        metrics = MetricsMiddleware()
+        provider.middleware.add(metrics)
+        provider.storage.buckets.list()
+        print(metrics.to_prometheus())
+    """
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                       5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="cloudbridge"):
+        """
+        :type buckets: ``tuple`` of ``float``
+        :param buckets: Upper bounds, in seconds, of the latency histogram
+                        buckets. An implicit ``+Inf`` bucket is always added.
+
+        :type prefix: ``str``
+        :param prefix: Prefix for the Prometheus metric names.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _record(self, event, duration, failed):
+        index = bisect.bisect_left(self.buckets, duration)
+        with self._lock:
+            metric = self._metrics.get(event)
+            if metric is None:
+                # [count, errors, sum, per-bucket counts (last is +Inf)]
+                metric = [0, 0, 0.0, [0] * (len(self.buckets) + 1)]
+                self._metrics[event] = metric
+            metric[0] += 1
+            if failed:
+                metric[1] += 1
+            metric[2] += duration
+            metric[3][index] += 1
+
+    @intercept(event_pattern="*", priority=110)
+    def measure_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        failed = True
+        start = timeit.default_timer()
+        try:
+            result = next_handler.invoke(event_args, *args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._record(event_args.get("event"),
+                         timeit.default_timer() - start, failed)
+
+    def reset(self):
+        """
+        Discard all recorded metrics.
+        """
+        with self._lock:
+            self._metrics = {}
+
+    def snapshot(self):
+        """
+        Returns a point-in-time copy of the recorded metrics.
+
+        :rtype: ``dict``
+        :return: A dict keyed by event name, where each value is a dict with
+                 ``count``, ``errors``, ``sum`` (total seconds) and
+                 ``buckets``, a list of cumulative ``(upper_bound, count)``
+                 tuples ending with ``float('inf')``.
+        """
+        with self._lock:
+            metrics = {event: (count, errors, total, list(counts))
+                       for event, (count, errors, total, counts)
+                       in self._metrics.items()}
+        bounds = self.buckets + (float('inf'),)
+        result = {}
+        for event, (count, errors, total, counts) in metrics.items():
+            cumulative = 0
+            buckets = []
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                buckets.append((bound, cumulative))
+            result[event] = {'count': count, 'errors': errors, 'sum': total,
+                             'buckets': buckets}
+        return result
+
+    def to_prometheus(self):
+        """
+        Renders the recorded metrics in the Prometheus text exposition
+        format.
+
+        :rtype: ``str``
+        :return: The metrics, ready to be served from a ``/metrics``
+                 endpoint.
+        """
+        snapshot = self.snapshot()
+        events = sorted(snapshot)
+        calls = "{0}_events_total".format(self.prefix)
+        errors = "{0}_event_errors_total".format(self.prefix)
+        duration = "{0}_event_duration_seconds".format(self.prefix)
+        lines = ["# HELP {0} Number of dispatched events.".format(calls),
+                 "# TYPE {0} counter".format(calls)]
+        lines.extend('{0}{{event="{1}"}} {2}'.format(
+            calls, event, snapshot[event]['count']) for event in events)
+        lines.extend(["# HELP {0} Number of events that raised an "
+                      "exception.".format(errors),
+                      "# TYPE {0} counter".format(errors)])
+        lines.extend('{0}{{event="{1}"}} {2}'.format(
+            errors, event, snapshot[event]['errors']) for event in events)
+        lines.extend(["# HELP {0} Event latency in seconds.".format(duration),
+                      "# TYPE {0} histogram".format(duration)])
+        for event in events:
+            metric = snapshot[event]
+            for bound, count in metric['buckets']:
+                lines.append('{0}_bucket{{event="{1}",le="{2}"}} {3}'.format(
+                    duration, event,
+                    "+Inf" if bound == float('inf') else repr(bound), count))
+            lines.append('{0}_sum{{event="{1}"}} {2!r}'.format(
+                duration, event, metric['sum']))
+            lines.append('{0}_count{{event="{1}"}} {2}'.format(
+                duration, event, metric['count']))
+        return "\n".join(lines) + "\n"
+
+
+class CircuitBreaker(object):
+    """
+    Tracks consecutive failures of calls to a single endpoint.
+
+    The breaker is closed as long as calls succeed. Once
+    ``failure_threshold`` calls in a row have failed, it opens and calls
+    are refused, until ``reset_timeout`` seconds have passed. It is then
+    half-open: a single trial call is let through, which closes the breaker
+    if it succeeds, and opens it again if it fails.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Returns whether a call may be made. Every allowed call must be
+        followed by a call to :meth:`record_success` or
+        :meth:`record_failure`.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (self.state == self.OPEN and
+                    time.time() - self.opened_at >= self.reset_timeout):
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if (self.state == self.HALF_OPEN or
+                    self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+
+class RetryMiddleware(BaseMiddleware):
+    """
+    Retries service calls that fail with retryable errors, using a jittered
+    exponential backoff, and fails calls fast while a service is failing
+    repeatedly.
+
+    Errors are classified by the provider (see
+    ``CloudProvider._classify_error``) as:
+
+    - ``throttled``: the cloud rejected the request because of the request
+      rate. Such calls are always retried, since the request was not
+      carried out.
+    - ``transient``: the request may succeed if retried, e.g. after a
+      connection error or a server error. Such calls are only retried for
+      idempotent operations (``list``, ``get``, ``get_many`` and ``find``
+      by default), since the failed request may have been carried out.
+    - fatal: any other error, which is raised straight away.
+
+    A circuit breaker is kept per service (e.g.
+    ``provider.compute.instances``). After ``failure_threshold`` transient
+    failures in a row, calls to the service raise a
+    :class:`.CircuitOpenException` without contacting the cloud, until
+    ``reset_timeout`` seconds have passed.
+
+    When a service call dispatches calls to other services, failures are
+    retried by the innermost call only, so that retries do not multiply.
+
+    Example:
+
+    .. code-block:: python
+
+        provider.middleware.add(RetryMiddleware(max_attempts=5, deadline=60))
+    """
+    THROTTLED = "throttled"
+    TRANSIENT = "transient"
+    IDEMPOTENT_OPERATIONS = ('list', 'get', 'get_many', 'find')
+    DEFAULT_PRIORITY = 1080
+
+    def __init__(self, max_attempts=5, base_delay=0.5, max_delay=20,
+                 deadline=60, failure_threshold=5, reset_timeout=30,
+                 idempotent_operations=IDEMPOTENT_OPERATIONS,
+                 event_pattern="provider.*", priority=DEFAULT_PRIORITY):
+        """
+        :type max_attempts: ``int``
+        :param max_attempts: The maximum number of attempts per call.
+
+        :type base_delay: ``float``
+        :param base_delay: The upper bound in seconds of the first backoff
+                           delay, which doubles with every retry.
+
+        :type max_delay: ``float``
+        :param max_delay: The maximum backoff delay in seconds.
+
+        :type deadline: ``float``
+        :param deadline: The maximum number of seconds to spend on a call,
+                         including retries. No retry is made once it would
+                         start after the deadline.
+
+        :type failure_threshold: ``int``
+        :param failure_threshold: The number of transient failures in a row
+                                  after which a service's circuit opens.
+
+        :type reset_timeout: ``float``
+        :param reset_timeout: The number of seconds after which an open
+                              circuit lets a trial call through.
+
+        :type idempotent_operations: ``tuple``
+        :param idempotent_operations: The operations that are retried after
+                                      transient errors.
+
+        :type event_pattern: ``str``
+        :param event_pattern: The events to intercept.
+
+        :type priority: ``int``
+        :param priority: The priority of the intercepting handler. The
+                         default places it inside the exception wrapping
+                         middleware, and outside the caching middleware.
+        """
+        super(RetryMiddleware, self).__init__()
+        assert max_attempts >= 1
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.idempotent_operations = idempotent_operations
+        self.event_pattern = event_pattern
+        self.priority = priority
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def install(self, event_manager):
+        super(RetryMiddleware, self).install(event_manager)
+        self.add_handlers([InterceptingEventHandler(
+            self.event_pattern, self.priority, self.retry_event)])
+
+    def get_breaker(self, endpoint):
+        """
+        Returns the circuit breaker of a service, e.g.
+        ``provider.compute.instances``.
+
+        :rtype: :class:`.CircuitBreaker`
+        """
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    @staticmethod
+    def _classify(provider, error):
+        # Look through exceptions wrapped by the exception wrapping
+        # middleware of nested calls
+        while error is not None and provider is not None:
+            # pylint:disable=protected-access
+            error_class = provider._classify_error(error)
+            if error_class:
+                return error_class
+            error = getattr(error, '__cause__', None)
+        return None
+
+    @staticmethod
+    def _is_retried(error):
+        while error is not None:
+            if getattr(error, 'cb_retried', False):
+                return True
+            error = getattr(error, '__cause__', None)
+        return False
+
+    def retry_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        event = event_args.get("event")
+        endpoint, operation = event.rsplit(".", 1)
+        provider = getattr(event_args.get("sender"), "provider", None)
+        breaker = self.get_breaker(endpoint)
+        end_time = time.time() + self.deadline
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenException(
+                    "Not calling {0}, as its circuit breaker opened after "
+                    "{1} failures in a row".format(event, breaker.failures))
+            try:
+                result = next_handler.invoke(event_args, *args, **kwargs)
+            except Exception as e:
+                error_class = self._classify(provider, e)
+                if error_class == self.TRANSIENT:
+                    breaker.record_failure()
                 else:
-                    six.reraise(CloudBridgeBaseException, cb_ex, traceback)
+                    breaker.record_success()
+                attempt += 1
+                retryable = (
+                    error_class == self.THROTTLED or
+                    (error_class == self.TRANSIENT and
+                     operation in self.idempotent_operations))
+                delay = backoff_delay(attempt - 1, self.base_delay,
+                                      self.max_delay)
+                if (not retryable or self._is_retried(e) or
+                        attempt >= self.max_attempts or
+                        time.time() + delay > end_time):
+                    if retryable:
+                        # Stop calls that dispatched this one from
+                        # retrying it again
+                        e.cb_retried = True
+                    raise
+                log.debug("Retrying %s in %.2f seconds after %s error: %s",
+                          event, delay, error_class, e)
+                time.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+
+class TraceSpan(object):
+    """
+    A timed span within a trace. Spans started while another span is open
+    on the same thread become its children.
+    """
+    __slots__ = ('name', 'category', 'start', 'end', 'thread_id', 'args',
+                 'children')
+
+    def __init__(self, name, category, start, args=None):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = None
+        self.thread_id = threading.current_thread().ident
+        self.args = args or {}
+        self.children = []
+
+    @property
+    def duration(self):
+        return self.end - self.start if self.end is not None else None
+
+    def __repr__(self):
+        return "<TraceSpan: {0} ({1}) {2} children>".format(
+            self.name, self.category, len(self.children))
+
+
+class TracingMiddleware(object):
+    """
+    Builds a tree of spans for each top-level CloudBridge event. Events
+    dispatched while handling another event (e.g. the subnet and firewall
+    lookups made by ``instances.create()``) are recorded as child spans.
+
+    Calling :meth:`instrument` with a provider additionally records a leaf
+    span for each request made through the provider's SDK, where the
+    provider supports it.
+
+    Finished traces can be exported in the Chrome trace event format and
+    opened in ``chrome://tracing``, Perfetto or speedscope.
+
+    Example:
+
+    .. code-block:: python
+
+        tracer = TracingMiddleware()
+        provider.middleware.add(tracer)
+        tracer.instrument(provider)
+        provider.compute.instances.create(...)
+        tracer.export_chrome_trace("launch.json")
+    """
+    SDK_CATEGORY = "sdk"
+
+    def __init__(self, max_traces=100):
+        """
+        :type max_traces: ``int``
+        :param max_traces: Maximum number of finished top-level traces to
+                           keep. Older traces are discarded first.
+        """
+        self.traces = deque(maxlen=max_traces)
+        self._local = threading.local()
+
+    def _get_stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def instrument(self, provider):
+        """
+        Record a leaf span for each SDK request made by the given provider.
+
+        :type provider: :class:`.CloudProvider`
+        :param provider: The provider whose SDK calls should be traced.
+        """
+        # pylint:disable=protected-access
+        provider._trace_sdk_calls(self)
+
+    def start_span(self, name, category="cloudbridge", **args):
+        """
+        Open a new span as a child of the current span on this thread.
+
+        :rtype: :class:`.TraceSpan`
+        :return: The new span, which must be passed to :meth:`end_span`.
+        """
+        span = TraceSpan(name, category, timeit.default_timer(), args)
+        stack = self._get_stack()
+        if stack:
+            stack[-1].children.append(span)
+        stack.append(span)
+        return span
+
+    def end_span(self, span, error=None):
+        """
+        Close a span opened with :meth:`start_span`. Once the outermost span
+        on a thread is closed, its trace is added to ``traces``. A child
+        span closed after its parent stays attached to the parent.
+        """
+        span.end = timeit.default_timer()
+        if error is not None:
+            span.args['error'] = repr(error)
+        stack = self._get_stack()
+        if span not in stack:
+            # Its parent was closed first, and already holds the span
+            log.debug("Span %s was closed after its parent", span.name)
+            return
+        index = stack.index(span)
+        # Also stop tracking any child spans that are still open
+        del stack[index:]
+        if index == 0:
+            self.traces.append(span)
+
+    @contextmanager
+    def span(self, name, category="cloudbridge", **args):
+        """
+        Context manager wrapping :meth:`start_span` and :meth:`end_span`.
+        """
+        span = self.start_span(name, category, **args)
+        try:
+            yield span
+        except Exception as e:
+            self.end_span(span, error=e)
+            raise
+        self.end_span(span)
+
+    def record_span(self, name, duration, category=SDK_CATEGORY, **args):
+        """
+        Record a span that has just finished, for SDKs which only report
+        a request once it is complete.
+
+        :type duration: ``float``
+        :param duration: The duration of the span in seconds.
+        """
+        end = timeit.default_timer()
+        span = TraceSpan(name, category, end - duration, args)
+        span.end = end
+        stack = self._get_stack()
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            self.traces.append(span)
+        return span
+
+    @intercept(event_pattern="*", priority=120)
+    def trace_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        with self.span(event_args.get("event")):
+            return next_handler.invoke(event_args, *args, **kwargs)
+
+    def to_chrome_trace(self):
+        """
+        Returns all finished traces in the Chrome trace event format.
+
+        :rtype: ``dict``
+        :return: A JSON serializable dict with a ``traceEvents`` list of
+                 complete (``"ph": "X"``) events.
+        """
+        pid = os.getpid()
+        events = []
+        pending = list(self.traces)
+        while pending:
+            span = pending.pop()
+            if span.end is None:
+                continue
+            events.append({'name': span.name,
+                           'cat': span.category,
+                           'ph': 'X',
+                           'ts': span.start * 1e6,
+                           'dur': span.duration * 1e6,
+                           'pid': pid,
+                           'tid': span.thread_id,
+                           'args': span.args})
+            pending.extend(span.children)
+        events.sort(key=lambda e: e['ts'])
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        """
+        Write all finished traces to a file in the Chrome trace event format.
+
+        :type path: ``str``
+        :param path: The file to write to.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+
+class ProfilingMiddleware(BaseMiddleware):
+    """
+    Profiles a sample of the calls to matching events with :mod:`cProfile`,
+    and aggregates the statistics per event, so that the CPU time of a
+    specific operation can be examined without profiling the whole process.
+
+    Events dispatched while a profiled event is being handled (e.g. the
+    subnet lookups made by ``instances.create()``) are included in its
+    profile, and not profiled separately. Calls made while another profiler
+    is active in the same thread are not profiled.
+
+    Example:
+
+    .. code-block:: python
+
+        profiler = provider.middleware.add(ProfilingMiddleware(
+            event_pattern="provider.compute.instances.*", sample_rate=0.1))
+        provider.compute.instances.list()
+        profiler.get_stats("provider.compute.instances.list").sort_stats(
+            "cumulative").print_stats(20)
+        profiler.dump_stats("/tmp/profiles")
+    """
+    DEFAULT_PRIORITY = 130
+
+    def __init__(self, event_pattern="provider.*", sample_rate=1.0,
+                 callback=None, priority=DEFAULT_PRIORITY):
+        """
+        :type event_pattern: ``str``
+        :param event_pattern: A glob pattern of the events to profile, e.g.
+                              ``provider.compute.*.list``.
+
+        :type sample_rate: ``float``
+        :param sample_rate: The fraction of matching calls to profile,
+                            between 0 and 1.
+
+        :type callback: ``callable``
+        :param callback: If given, called with the event name and the
+                         :class:`cProfile.Profile` of each profiled call.
+
+        :type priority: ``int``
+        :param priority: The priority of the intercepting handler. The
+                         default places it outside all other middleware
+                         except debug logging, metrics and tracing, so that
+                         their cost is included.
+        """
+        super(ProfilingMiddleware, self).__init__()
+        assert 0 <= sample_rate <= 1
+        self.event_pattern = event_pattern
+        self.sample_rate = sample_rate
+        self.callback = callback
+        self.priority = priority
+        self._stats = {}
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def install(self, event_manager):
+        super(ProfilingMiddleware, self).install(event_manager)
+        self.add_handlers([InterceptingEventHandler(
+            self.event_pattern, self.priority, self.profile_event)])
+
+    def _add_profile(self, event, profile):
+        with self._lock:
+            stats = self._stats.get(event)
+            if stats is None:
+                self._stats[event] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+            self._calls[event] = self._calls.get(event, 0) + 1
+        if self.callback:
+            self.callback(event, profile)
+
+    def profile_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        if (getattr(self._local, "active", False) or
+                random.random() >= self.sample_rate):
+            return next_handler.invoke(event_args, *args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active in this thread
+            return next_handler.invoke(event_args, *args, **kwargs)
+        self._local.active = True
+        try:
+            return next_handler.invoke(event_args, *args, **kwargs)
+        finally:
+            profile.disable()
+            self._local.active = False
+            self._add_profile(event_args.get("event"), profile)
+
+    def get_profiled_calls(self):
+        """
+        Returns the number of profiled calls per event.
+
+        :rtype: ``dict``
+        :return: A dict of event names to call counts.
+        """
+        with self._lock:
+            return dict(self._calls)
+
+    def get_stats(self, event):
+        """
+        Returns the aggregated statistics of the profiled calls to an event.
+
+        :type event: ``str``
+        :param event: The event name, e.g.
+                      ``provider.compute.instances.list``.
+
+        :rtype: :class:`pstats.Stats`
+        :return: The statistics, or ``None`` if no call to the event has
+                 been profiled.
+        """
+        with self._lock:
+            stats = self._stats.get(event)
+            if stats is None:
+                return None
+            copy = pstats.Stats()
+            copy.add(stats)
+            return copy
+
+    def dump_stats(self, directory):
+        """
+        Write the aggregated statistics of each event to a
+        ``<event>.pstats`` file, which can be loaded with :mod:`pstats` or
+        visualization tools such as snakeviz.
+
+        :type directory: ``str``
+        :param directory: The directory to write to.
+
+        :rtype: ``list`` of ``str``
+        :return: The paths of the written files.
+        """
+        with self._lock:
+            events = list(self._stats.items())
+        paths = []
+        for event, stats in events:
+            path = os.path.join(directory, event + ".pstats")
+            with self._lock:
+                stats.dump_stats(path)
+            paths.append(path)
+        return paths
+
+    def reset(self):
+        """
+        Discard all collected statistics.
+        """
+        with self._lock:
+            self._stats = {}
+            self._calls = {}
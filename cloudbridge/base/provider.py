@@ -1,8 +1,13 @@
 """Base implementation of a provider interface."""
 import ast
+import copy
 import functools
 import logging
 import os
+import socket
+import threading
+import time
+from itertools import groupby
 from os.path import expanduser
 try:
     from configparser import ConfigParser
@@ -13,8 +18,14 @@ from pyeventsystem.middleware import SimpleMiddlewareManager
 
 import six
 
+from ..base.helpers import AdaptiveRateLimiter
+from ..base.helpers import ClientCache
+from ..base.helpers import ParallelExecutor
+from ..base.middleware import CompiledEventDispatcher
 from ..base.middleware import ExceptionWrappingMiddleware
+from ..base.watch import InventoryWatcher
 from ..interfaces import CloudProvider
+from ..interfaces.exceptions import MultipleWaitStateException
 from ..interfaces.exceptions import ProviderConnectionException
 from ..interfaces.resources import Configuration
 
@@ -23,6 +34,7 @@ log = logging.getLogger(__name__)
 DEFAULT_RESULT_LIMIT = 50
 DEFAULT_WAIT_TIMEOUT = 600
 DEFAULT_WAIT_INTERVAL = 5
+DEFAULT_PARALLEL_WORKERS = 10
 
 # By default, use two locations for CloudBridge configuration
 CloudBridgeConfigPath = '/etc/cloudbridge.ini'
@@ -82,16 +94,71 @@ class BaseConfiguration(Configuration):
         """
         return self.get('cb_debug', os.environ.get('CB_DEBUG', False))
 
+    @property
+    def thread_safe(self):
+        """
+        A flag indicating whether the provider may be used from multiple
+        threads at once. In thread-safe mode, each thread creates its own
+        SDK sessions and clients on first use.
+
+        The flag can be set through the cb_thread_safe value in the config
+        dictionary, or the CB_THREAD_SAFE environment variable. Using the
+        provider's parallel executor also turns on thread-safe mode.
+
+        :rtype: ``bool``
+        :return: Whether thread-safe mode is on.
+        """
+        return self.get('cb_thread_safe',
+                        os.environ.get('CB_THREAD_SAFE', False))
+
+    @property
+    def parallel_workers(self):
+        """
+        Gets the maximum number of worker threads of the provider's parallel
+        executor.
+        """
+        return self.get('cb_parallel_workers', DEFAULT_PARALLEL_WORKERS)
+
+    @property
+    def rate_limit(self):
+        """
+        Gets the maximum number of requests per second that the provider
+        sends to each API family. Requests are paced adaptively whenever the
+        cloud throttles them, so this is ``None`` (no fixed limit) unless set
+        through the cb_rate_limit value in the config dictionary, or the
+        CB_RATE_LIMIT environment variable.
+
+        :rtype: ``float``
+        :return: The maximum request rate, or ``None``.
+        """
+        rate_limit = self.get('cb_rate_limit',
+                              os.environ.get('CB_RATE_LIMIT'))
+        return float(rate_limit) if rate_limit else None
+
 
 class BaseCloudProvider(CloudProvider):
+    # Zone-specific attributes that a clone must not share with its parent.
+    # They are reset to None and recomputed lazily by the clone.
+    CLONE_RESET_ATTRIBUTES = ()
+
     def __init__(self, config):
         self._config = BaseConfiguration(config)
         self._config_parser = ConfigParser()
         self._config_parser.read(CloudBridgeConfigLocations)
-        self._middleware = SimpleMiddlewareManager()
+        self._middleware = SimpleMiddlewareManager(
+            CompiledEventDispatcher())
         self.add_required_middleware()
         self._region_name = None
         self._zone_name = None
+        # SDK sessions and clients, created lazily by each provider
+        self._sdk_clients = ClientCache(self.config.thread_safe)
+        self._parallel = None
+        self._parallel_lock = threading.Lock()
+        # Shared by all threads and clones, which use the same SDK clients
+        self._rate_limiter = AdaptiveRateLimiter(
+            max_rate=self.config.rate_limit)
+        # The cassette recording or replaying SDK requests, if any
+        self._sdk_cassette = None
 
     @property
     def region_name(self):
@@ -125,6 +192,20 @@ class BaseCloudProvider(CloudProvider):
     def middleware(self):
         return self._middleware
 
+    @property
+    def parallel(self):
+        with self._parallel_lock:
+            if not self._parallel:
+                log.debug("Enabling thread-safe mode for parallel execution")
+                self._sdk_clients.enable_thread_safety()
+                self._parallel = ParallelExecutor(
+                    self.config.parallel_workers)
+            return self._parallel
+
+    @property
+    def rate_limiter(self):
+        return self._rate_limiter
+
     def add_required_middleware(self):
         """
         Adds common middleware that is essential for cloudbridge to function.
@@ -147,14 +228,139 @@ class BaseCloudProvider(CloudProvider):
             raise ProviderConnectionException(
                 "Authentication with cloud provider failed: %s" % (e,))
 
+    def _initialize_services(self):
+        """
+        Creates the services of this provider. Providers should construct
+        their services here rather than in ``__init__``, so that a clone can
+        get its own services, bound to the clone, without re-running the
+        rest of the provider's initialization.
+        """
+        pass
+
     def clone(self, zone=None):
-        cloned_config = self.config.copy()
-        cloned_provider = self.__class__(cloned_config)
+        """
+        Clones this provider without re-initializing it. The clone shares
+        the parent's parsed config files, credentials, sessions and SDK
+        connections, and gets its own config dict, middleware manager and
+        services. Attributes listed in ``CLONE_RESET_ATTRIBUTES`` are reset
+        so that zone-specific state is rebuilt for the clone.
+        """
+        # pylint:disable=protected-access
+        cloned_provider = copy.copy(self)
+        cloned_provider._config = BaseConfiguration(self.config.copy())
+        cloned_provider._middleware = SimpleMiddlewareManager(
+            CompiledEventDispatcher())
+        cloned_provider.add_required_middleware()
+        for attr in self.CLONE_RESET_ATTRIBUTES:
+            setattr(cloned_provider, attr, None)
         if zone:
-            # pylint:disable=protected-access
             cloned_provider._zone_name = zone.name
+        cloned_provider._initialize_services()
         return cloned_provider
 
+    def wait_for_all(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        if timeout is None:
+            timeout = self.config.default_wait_timeout
+        if interval is None:
+            interval = self.config.default_wait_interval
+
+        assert timeout >= 0
+        assert interval >= 0
+        assert timeout >= interval
+
+        end_time = time.time() + timeout
+        failures = []
+        pending = list(resources)
+
+        while True:
+            still_pending = []
+            for resource in pending:
+                state = resource.state
+                if state in target_states:
+                    continue
+                elif state in (terminal_states or []):
+                    failures.append((resource, state))
+                else:
+                    still_pending.append(resource)
+            pending = still_pending
+            if not pending:
+                break
+            if time.time() > end_time:
+                failures.extend((resource, resource.state)
+                                for resource in pending)
+                break
+            log.debug("%s object(s) have not reached target state(s): %s."
+                      " Waiting another %s seconds...", len(pending),
+                      target_states, int(end_time - time.time()))
+            time.sleep(interval)
+            for _, group in groupby(
+                    sorted(pending, key=lambda r: type(r).__name__),
+                    key=lambda r: type(r).__name__):
+                self._refresh_all(list(group))
+
+        if failures:
+            raise MultipleWaitStateException(
+                "{0} of {1} object(s) did not reach a desired state: {2}. "
+                "Failed objects and their states: {3}".format(
+                    len(failures), len(resources), target_states,
+                    ", ".join("{0}: {1}".format(res, state)
+                              for res, state in failures)),
+                failures)
+        log.debug("All %s object(s) successfully reached target state(s): %s",
+                  len(resources), target_states)
+        return True
+
+    def watch(self, resource_types, interval=None, initial_events=False):
+        return InventoryWatcher(
+            self, resource_types,
+            interval=interval or InventoryWatcher.DEFAULT_INTERVAL,
+            initial_events=initial_events).start()
+
+    def _refresh_all(self, resources):
+        """
+        Refreshes a list of resources of the same type. This implementation
+        refreshes each resource individually. Providers should override this
+        to refresh resources with a single bulk query where the cloud
+        supports it, and delegate any remaining resources to this method.
+        """
+        for resource in resources:
+            resource.refresh()
+
+    def _classify_error(self, error):
+        """
+        Classifies an exception raised by a service call, for deciding
+        whether the :class:`.RetryMiddleware` should retry the call.
+        Providers should extend this to recognise their SDK's errors.
+
+        :rtype: ``str``
+        :return: ``'throttled'`` if the cloud rejected the request because
+                 of the request rate, ``'transient'`` if the request may
+                 succeed when retried (e.g. after a connection error or a
+                 server error), or ``None`` if retrying is pointless.
+        """
+        if isinstance(error, (ConnectionError, socket.timeout)):
+            return 'transient'
+        return None
+
+    def _trace_sdk_calls(self, tracer):
+        """
+        Records a leaf span in the given :class:`.TracingMiddleware` for each
+        request made through the provider's SDK. Providers should override
+        this using whatever request hooks their SDK offers.
+        """
+        log.debug("SDK call tracing is not supported by %s", self.name)
+
+    def _use_cassette(self, cassette):
+        """
+        Records the requests made through the provider's SDK to the given
+        :class:`.Cassette`, or replays them from it, depending on the
+        cassette's mode. Providers should override this by hooking the
+        HTTP layer of their SDK.
+        """
+        raise NotImplementedError(
+            "Recording SDK requests is not supported by %s" % self.name)
+
     def _deepgetattr(self, obj, attr):
         """Recurses through an attribute chain to get the ultimate value."""
         return functools.reduce(getattr, attr.split('.'), obj)
@@ -0,0 +1,289 @@
+"""
+Records the HTTP requests a provider's SDK makes to a cassette file, and
+replays them later without network access.
+"""
+import base64
+import hashlib
+import io
+import json
+import logging
+import threading
+import time
+import timeit
+from collections import defaultdict
+from collections import deque
+from urllib.parse import urlsplit
+
+from ..interfaces.exceptions import ProviderConnectionException
+
+log = logging.getLogger(__name__)
+
+
+def _body_digest(body):
+    """
+    Returns a digest of a request body, or ``None`` if the body is streamed
+    from a file or generator and cannot be read without consuming it.
+    """
+    if body is None:
+        body = b''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if not isinstance(body, (bytes, bytearray)):
+        return None
+    return hashlib.sha1(body).hexdigest()
+
+
+def _endpoint(url):
+    parts = urlsplit(url)
+    return "{0}://{1}{2}".format(parts.scheme, parts.netloc, parts.path)
+
+
+class RecordedResponse(io.BytesIO):
+    """
+    A replayed HTTP response. It is a readable file object holding the
+    response body, and also offers the ``stream()`` method and the status
+    and header attributes of a ``urllib3`` response, so that it can be used
+    as the raw response of ``requests`` and ``botocore``.
+    """
+
+    def __init__(self, status, reason, headers, content):
+        super(RecordedResponse, self).__init__(content)
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        while True:
+            chunk = self.read(amt)
+            if not chunk:
+                break
+            yield chunk
+
+    def release_conn(self):
+        pass
+
+
+class Cassette(object):
+    """
+    Records the HTTP requests made through a provider's SDK together with
+    their responses and latencies, and replays them later without network
+    access or credentials. Replaying a cassette makes the cost of the
+    CloudBridge code paths of any provider measurable offline, e.g. in
+    benchmarks.
+
+    A cassette is recorded once against a real cloud account:
+
+    .. code-block:: python
+
+        with Cassette("list-instances.json", mode=Cassette.RECORD) as c:
+            c.instrument(provider)
+            provider.compute.instances.list()
+
+    and is then replayed by repeating the same calls, optionally with the
+    recorded latencies scaled (or left out, with a scale of 0):
+
+    .. code-block:: python
+
+        cassette = Cassette("list-instances.json", latency_scale=0.5)
+        cassette.instrument(provider)
+        provider.compute.instances.list()
+
+    A request is replayed with the first unused interaction that has the
+    same method, URL and body. Since some requests carry random values,
+    such as client tokens or multipart boundaries, a request that matches
+    no interaction exactly is replayed with the first unused interaction
+    that has the same method and URL path. A request that matches no
+    interaction raises a :class:`.ProviderConnectionException`.
+
+    Request headers are not recorded, so cassettes do not contain request
+    signatures or tokens. Response bodies are recorded as they are, and
+    may contain secrets such as key pair material.
+    """
+    RECORD = "record"
+    REPLAY = "replay"
+    VERSION = 1
+
+    def __init__(self, path, mode=REPLAY, latency_scale=1.0):
+        """
+        :type path: ``str``
+        :param path: The cassette file, which is read when replaying and
+                     written by :meth:`save` when recording.
+
+        :type mode: ``str``
+        :param mode: ``Cassette.RECORD`` or ``Cassette.REPLAY``.
+
+        :type latency_scale: ``float``
+        :param latency_scale: Factor applied to the recorded latency of each
+                              replayed request. Replayed requests are not
+                              delayed if 0.
+        """
+        assert mode in (self.RECORD, self.REPLAY)
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.interactions = []
+        self._lock = threading.Lock()
+        self._used = set()
+        self._by_request = defaultdict(deque)
+        self._by_endpoint = defaultdict(deque)
+        if mode == self.REPLAY:
+            self.load()
+
+    @property
+    def recording(self):
+        return self.mode == self.RECORD
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.recording:
+            self.save()
+
+    def instrument(self, provider):
+        """
+        Record or replay the SDK requests made by the given provider,
+        depending on the cassette's mode. Requests made through SDK clients
+        that the provider has already created may not be intercepted, so
+        the provider should be instrumented before it is used.
+
+        :type provider: :class:`.CloudProvider`
+        :param provider: The provider whose SDK requests are intercepted.
+        """
+        # pylint:disable=protected-access
+        provider._use_cassette(self)
+
+    def load(self):
+        with open(self.path) as f:
+            data = json.load(f)
+        with self._lock:
+            self.interactions = data['interactions']
+            self._used.clear()
+            self._by_request.clear()
+            self._by_endpoint.clear()
+            for index, interaction in enumerate(self.interactions):
+                request = interaction['request']
+                self._by_request[(request['method'], request['url'],
+                                  request['body_digest'])].append(index)
+                self._by_endpoint[(request['method'],
+                                   _endpoint(request['url']))].append(index)
+
+    def save(self):
+        with self._lock:
+            data = {'version': self.VERSION,
+                    'interactions': list(self.interactions)}
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        log.debug("Saved %s interaction(s) to cassette %s",
+                  len(data['interactions']), self.path)
+
+    def record(self, method, url, body, status, reason, headers, content,
+               latency):
+        """
+        Adds an interaction to the cassette. SDK hooks call this after
+        each request has been sent.
+
+        :type latency: ``float``
+        :param latency: The number of seconds between sending the request
+                        and receiving the whole response.
+        """
+        content = content or b''
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        try:
+            body_text, encoding = content.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            body_text = base64.b64encode(content).decode('ascii')
+            encoding = 'base64'
+        # SDKs hand over the decoded body, so headers describing the
+        # transfer encoding no longer apply to it
+        headers = {str(k): str(v) for k, v in headers.items()
+                   if k.lower() not in ('content-encoding',
+                                        'transfer-encoding',
+                                        'content-length')}
+        headers['content-length'] = str(len(content))
+        interaction = {
+            'request': {'method': method.upper(), 'url': url,
+                        'body_digest': _body_digest(body)},
+            'response': {'status': int(status), 'reason': reason,
+                         'headers': headers,
+                         'body': body_text, 'encoding': encoding},
+            'latency': latency}
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def _take(self, queue):
+        # Called with the lock held
+        while queue and queue[0] in self._used:
+            queue.popleft()
+        if not queue:
+            return None
+        index = queue.popleft()
+        self._used.add(index)
+        return self.interactions[index]
+
+    def play(self, method, url, body):
+        """
+        Returns the recorded response to a request, after the request's
+        scaled latency has passed. SDK hooks call this instead of sending
+        each request.
+
+        :rtype: :class:`.RecordedResponse`
+        :return: The raw response, which holds the recorded body.
+        """
+        method = method.upper()
+        with self._lock:
+            interaction = (
+                self._take(self._by_request[(method, url,
+                                             _body_digest(body))]) or
+                self._take(self._by_endpoint[(method, _endpoint(url))]))
+        if not interaction:
+            raise ProviderConnectionException(
+                "Cassette {0} has no recorded response left for {1} "
+                "{2}".format(self.path, method, url))
+        response = interaction['response']
+        if self.latency_scale:
+            time.sleep(interaction['latency'] * self.latency_scale)
+        content = response['body'].encode('utf-8')
+        if response['encoding'] == 'base64':
+            content = base64.b64decode(content)
+        return RecordedResponse(response['status'], response['reason'],
+                                dict(response['headers']), content)
+
+
+class CassetteAdapter(object):
+    """
+    A transport adapter for ``requests`` sessions, which records or replays
+    the requests sent through the adapter it wraps. It is used by the
+    providers whose SDKs are built on ``requests``.
+    """
+
+    def __init__(self, cassette, adapter):
+        self.cassette = cassette
+        self.adapter = adapter
+
+    @classmethod
+    def mount(cls, cassette, session):
+        """
+        Wraps each adapter of a ``requests`` session. Sessions that are
+        already wrapped are left alone.
+        """
+        for prefix, adapter in list(session.adapters.items()):
+            if not isinstance(adapter, cls):
+                session.mount(prefix, cls(cassette, adapter))
+
+    def send(self, request, **kwargs):
+        if not self.cassette.recording:
+            raw = self.cassette.play(request.method, request.url,
+                                     request.body)
+            return self.adapter.build_response(request, raw)
+        start = timeit.default_timer()
+        response = self.adapter.send(request, **kwargs)
+        self.cassette.record(request.method, request.url, request.body,
+                             response.status_code, response.reason,
+                             response.headers, response.content,
+                             timeit.default_timer() - start)
+        return response
+
+    def close(self):
+        self.adapter.close()
@@ -1,12 +1,15 @@
 """
 Base implementation for data objects exposed through a provider or service
 """
-import inspect
+import collections
+import io
 import itertools
+import json
 import logging
 import os
 import re
 import shutil
+import threading
 import time
 import uuid
 
@@ -16,6 +19,8 @@ from cloudbridge.interfaces.exceptions import \
     InvalidConfigurationException
 from cloudbridge.interfaces.exceptions import InvalidLabelException
 from cloudbridge.interfaces.exceptions import InvalidNameException
+from cloudbridge.interfaces.exceptions import InvalidParamException
+from cloudbridge.interfaces.exceptions import ObjectModifiedException
 from cloudbridge.interfaces.exceptions import WaitStateException
 from cloudbridge.interfaces.resources import AttachmentInfo
 from cloudbridge.interfaces.resources import Bucket
@@ -56,6 +61,22 @@ from . import helpers as cb_helpers
 log = logging.getLogger(__name__)
 
 
+def serialize_value(value):
+    """
+    Converts a property value into a JSON serializable value, without making
+    any calls to the provider. Related resources are serialized by their id.
+    """
+    if isinstance(value, CloudResource):
+        return value.id
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [serialize_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: serialize_value(v) for k, v in value.items()}
+    if isinstance(value, AttachmentInfo):
+        return value.to_dict()
+    return value
+
+
 class BaseCloudResource(CloudResource):
     """
     Base implementation of a CloudBridge Resource.
@@ -67,6 +88,14 @@ class BaseCloudResource(CloudResource):
     # -with-dashes-allowed-in-between-but-not-at-the-start-or-e
     CB_NAME_PATTERN = re.compile(r"^[a-z][-a-z0-9]{1,61}[a-z0-9]$")
 
+    # Properties serialized by to_dict(). Resource classes extend these with
+    # the properties of the resource type they implement.
+    SERIALIZED_FIELDS = ('id', 'name')
+    # The subset of SERIALIZED_FIELDS that may require calls to the provider
+    # to compute, and are only serialized if resolve=True. Providers extend
+    # these with any property that is expensive in their implementation.
+    RESOLVED_FIELDS = ()
+
     def __init__(self, provider):
         self.__provider = provider
 
@@ -110,11 +139,22 @@ class BaseCloudResource(CloudResource):
     def _provider(self):
         return self.__provider
 
+    def to_dict(self, fields=None, resolve=False):
+        fields = self.SERIALIZED_FIELDS if fields is None else fields
+        unknown = set(fields).difference(self.SERIALIZED_FIELDS)
+        if unknown:
+            raise InvalidParamException(
+                "Unrecognised fields for %s: %s. Supported fields: %s" % (
+                    self.__class__.__name__, ", ".join(sorted(unknown)),
+                    ", ".join(self.SERIALIZED_FIELDS)))
+        return {field: serialize_value(getattr(self, field))
+                for field in fields
+                if resolve or field not in self.RESOLVED_FIELDS}
+
     def to_json(self):
-        # Get all attributes but filter methods and private/magic ones
-        attr = inspect.getmembers(self, lambda a: not(inspect.isroutine(a)))
-        js = {k: v for(k, v) in attr if not k.startswith('_')}
-        return js
+        # Kept complete for compatibility. to_dict() leaves out the fields
+        # that need calls to the provider.
+        return self.to_dict(resolve=True)
 
     def __repr__(self):
         name_or_label = getattr(self, 'label', self.name)
@@ -201,6 +241,9 @@ class BaseResultList(ResultList):
     def total_results(self):
         return self._total
 
+    def iter_json_lines(self, fields=None, resolve=False):
+        return cb_helpers.iter_json_lines(self, fields=fields, resolve=resolve)
+
 
 class ServerPagedResultList(BaseResultList):
     """
@@ -268,22 +311,63 @@ class BasePageableObjectMixin(PageableObjectMixin):
         for result in self.iter():
             yield result
 
-    def iter(self, **kwargs):
+    def iter(self, prefetch=0, **kwargs):
+        """
+        Iterates through all objects, paging results in as required.
+
+        :type prefetch: ``int``
+        :param prefetch: Number of pages to fetch ahead on a background
+                         thread while the current page is being consumed.
+                         Defaults to 0, which fetches each page only once
+                         the previous page has been consumed.
+        """
+        for page in self.pages(prefetch=prefetch, **kwargs):
+            for result in page:
+                yield result
+
+    def pages(self, prefetch=0, **kwargs):
+        """
+        Returns a generator over pages of results, where each page is a list
+        of objects. When results are paged on the client side, all objects
+        are returned as a single page.
+
+        The next page is only requested once the consumer asks for it, so
+        consumers can apply backpressure by controlling how fast they
+        iterate. With ``prefetch`` set, up to that many pages are fetched
+        ahead on a background thread.
+
+        Example:
+
+        .. code-block:: python
+
+            for page in provider.compute.instances.pages(prefetch=2):
+                process(page)
+
+        :type prefetch: ``int``
+        :param prefetch: Number of pages to fetch ahead of the consumer.
+        """
+        if prefetch > 0:
+            return cb_helpers.prefetch(self._iter_pages(**kwargs), prefetch)
+        else:
+            return self._iter_pages(**kwargs)
+
+    def _iter_pages(self, **kwargs):
         result_list = self.list(**kwargs)
         if result_list.supports_server_paging:
-            for result in result_list:
-                yield result
+            yield result_list
             while result_list.is_truncated:
                 result_list = self.list(marker=result_list.marker, **kwargs)
-                for result in result_list:
-                    yield result
+                yield result_list
         else:
-            for result in result_list.data:
-                yield result
+            yield result_list.data
 
 
 class BaseVMType(BaseCloudResource, VMType):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'family', 'vcpus', 'ram', 'size_root_disk', 'size_ephemeral_disks',
+        'num_ephemeral_disks', 'size_total_disk', 'extra_data')
+
     def __init__(self, provider):
         super(BaseVMType, self).__init__(provider)
 
@@ -300,6 +384,12 @@ class BaseVMType(BaseCloudResource, VMType):
 
 class BaseInstance(BaseCloudResource, BaseObjectLifeCycleMixin, Instance):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'state', 'public_ips', 'private_ips', 'vm_type_id',
+        'vm_type', 'image_id', 'zone_id', 'subnet_id', 'vm_firewall_ids',
+        'vm_firewalls', 'key_pair_id')
+    RESOLVED_FIELDS = ('vm_type', 'vm_firewalls')
+
     def __init__(self, provider):
         super(BaseInstance, self).__init__(provider)
 
@@ -403,6 +493,9 @@ class BaseLaunchConfig(LaunchConfig):
 class BaseMachineImage(
         BaseCloudResource, BaseObjectLifeCycleMixin, MachineImage):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'state', 'description', 'min_disk')
+
     def __init__(self, provider):
         super(BaseMachineImage, self).__init__(provider)
 
@@ -443,9 +536,17 @@ class BaseAttachmentInfo(AttachmentInfo):
     def device(self):
         return self._device
 
+    def to_dict(self):
+        return {'instance_id': self.instance_id, 'device': self.device}
+
 
 class BaseVolume(BaseCloudResource, BaseObjectLifeCycleMixin, Volume):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'state', 'description', 'size', 'create_time', 'zone_id',
+        'source', 'attachments')
+    RESOLVED_FIELDS = ('source',)
+
     def __init__(self, provider):
         super(BaseVolume, self).__init__(provider)
 
@@ -474,6 +575,9 @@ class BaseVolume(BaseCloudResource, BaseObjectLifeCycleMixin, Volume):
 
 class BaseSnapshot(BaseCloudResource, BaseObjectLifeCycleMixin, Snapshot):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'state', 'description', 'size', 'volume_id', 'create_time')
+
     def __init__(self, provider):
         super(BaseSnapshot, self).__init__(provider)
 
@@ -502,6 +606,8 @@ class BaseSnapshot(BaseCloudResource, BaseObjectLifeCycleMixin, Snapshot):
 
 class BaseKeyPair(BaseCloudResource, KeyPair):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + ('material',)
+
     def __init__(self, provider, key_pair):
         super(BaseKeyPair, self).__init__(provider)
         self._key_pair = key_pair
@@ -542,6 +648,10 @@ class BaseKeyPair(BaseCloudResource, KeyPair):
 
 class BaseVMFirewall(BaseCloudResource, VMFirewall):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'description', 'network_id', 'rules')
+    RESOLVED_FIELDS = ('rules',)
+
     def __init__(self, provider, vm_firewall):
         super(BaseVMFirewall, self).__init__(provider)
         self._vm_firewall = vm_firewall
@@ -558,6 +668,15 @@ class BaseVMFirewall(BaseCloudResource, VMFirewall):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def to_json(self):
+        # Rules were always serialized in full rather than by id, so they
+        # are left out of to_dict() to only be listed once
+        js = self.to_dict(resolve=True,
+                          fields=[field for field in self.SERIALIZED_FIELDS
+                                  if field != 'rules'])
+        js['rules'] = [rule.to_json() for rule in self.rules]
+        return js
+
     @property
     def id(self):
         """
@@ -591,6 +710,11 @@ class BaseVMFirewall(BaseCloudResource, VMFirewall):
 
 class BaseVMFirewallRule(BaseCloudResource, VMFirewallRule):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'firewall', 'direction', 'protocol', 'from_port', 'to_port', 'cidr',
+        'src_dest_fw_id', 'src_dest_fw')
+    RESOLVED_FIELDS = ('src_dest_fw',)
+
     def __init__(self, parent_fw, rule):
         # pylint:disable=protected-access
         super(BaseVMFirewallRule, self).__init__(
@@ -637,19 +761,15 @@ class BaseVMFirewallRule(BaseCloudResource, VMFirewallRule):
             self.direction, self.protocol, self.from_port, self.to_port,
             self.cidr, self.src_dest_fw_id))
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not (inspect.isroutine(a)))
-        js = {k: v for (k, v) in attr if not k.startswith('_')}
-        js['src_dest_fw'] = self.src_dest_fw_id
-        js['firewall'] = self.firewall.id
-        return js
-
     def delete(self):
         self._provider.security._vm_firewall_rules.delete(self.firewall, self)
 
 
 class BasePlacementZone(BaseCloudResource, PlacementZone):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'region_name',)
+
     def __init__(self, provider):
         super(BasePlacementZone, self).__init__(provider)
 
@@ -662,6 +782,10 @@ class BasePlacementZone(BaseCloudResource, PlacementZone):
 
 class BaseRegion(BaseCloudResource, Region):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'zones', 'default_zone')
+    RESOLVED_FIELDS = ('zones', 'default_zone')
+
     def __init__(self, provider):
         super(BaseRegion, self).__init__(provider)
 
@@ -671,19 +795,359 @@ class BaseRegion(BaseCloudResource, Region):
                 self._provider == other._provider and
                 self.id == other.id)
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not(inspect.isroutine(a)))
-        js = {k: v for(k, v) in attr if not k.startswith('_')}
-        js['zones'] = [z.id for z in self.zones]
-        return js
-
     @property
     def default_zone(self):
         return next(iter(self.zones))
 
 
+class RangedContentStream(object):
+    """
+    A read-only stream over an object's content, which is fetched in chunks
+    of ``chunk_size`` bytes with ranged requests as it is read, so that the
+    memory used does not depend on the size of the object. Iterating over
+    the stream yields the chunks.
+    """
+
+    def __init__(self, read_range, size, chunk_size):
+        """
+        :type read_range: ``callable``
+        :param read_range: Called with a start and end offset, and returns
+                           the content in between. See
+                           :meth:`BaseBucketObject._read_range`.
+
+        :type size: ``int``
+        :param size: The size of the object.
+
+        :type chunk_size: ``int``
+        :param chunk_size: The number of bytes to fetch per request.
+        """
+        self._read_range = read_range
+        self._size = size
+        self._chunk_size = chunk_size
+        self._offset = 0
+        self._chunk = b''
+        self._position = 0
+
+    def _next_chunk(self):
+        if self._position < len(self._chunk):
+            chunk = self._chunk[self._position:]
+        elif self._offset < self._size:
+            end = min(self._size, self._offset + self._chunk_size)
+            chunk = self._read_range(self._offset, end)
+            self._offset = end
+        else:
+            return b''
+        self._chunk = b''
+        self._position = 0
+        return chunk
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            return b''.join(iter(self._next_chunk, b''))
+        parts = []
+        while size > 0:
+            if self._position >= len(self._chunk):
+                self._chunk = self._next_chunk()
+                if not self._chunk:
+                    break
+            part = self._chunk[self._position:self._position + size]
+            self._position += len(part)
+            size -= len(part)
+            parts.append(part)
+        return b''.join(parts)
+
+    def __iter__(self):
+        return iter(self._next_chunk, b'')
+
+    def close(self):
+        self._chunk = b''
+        self._offset = self._size
+
+
+class BucketObjectReader(io.RawIOBase):
+    """
+    A seekable, read-only file object over an object's content, backed by
+    ranged requests. The content is fetched and cached in blocks, and the
+    least recently used blocks are evicted once the cache is full. Reads
+    that continue from where the previous read ended fetch up to
+    ``readahead`` bytes ahead in a single request, while other reads only
+    fetch the blocks they touch.
+
+    The reader buffers on its own, so it need not be wrapped in an
+    :class:`io.BufferedReader`.
+    """
+
+    def __init__(self, read_range, size, block_size, readahead, cache_size):
+        """
+        :type read_range: ``callable``
+        :param read_range: Called with a start and end offset, and returns
+                           the content in between. See
+                           :meth:`BaseBucketObject._read_range`.
+
+        :type size: ``int``
+        :param size: The size of the object.
+
+        :type block_size: ``int``
+        :param block_size: The size of the cached blocks in bytes.
+
+        :type readahead: ``int``
+        :param readahead: The number of bytes fetched ahead of sequential
+                          reads.
+
+        :type cache_size: ``int``
+        :param cache_size: The maximum number of bytes of cached blocks. The
+                           cache always holds at least the readahead window.
+        """
+        super(BucketObjectReader, self).__init__()
+        assert block_size > 0
+        self._read_range = read_range
+        self._size = size
+        self._block_size = block_size
+        self._readahead_blocks = max(1, -(-readahead // block_size))
+        self._max_blocks = max(cache_size // block_size,
+                               self._readahead_blocks)
+        self._blocks = collections.OrderedDict()
+        self._position = 0
+        # The offset at which a read counts as sequential
+        self._sequential_offset = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        self._check_open()
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._check_open()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError("Invalid whence: {0}".format(whence))
+        if position < 0:
+            raise ValueError("Negative seek position: {0}".format(position))
+        self._position = position
+        return position
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+    def _block_length(self, index):
+        return min(self._block_size, self._size - index * self._block_size)
+
+    def _iter_range(self, start, end, sequential):
+        # Yields the content from start to end as slices of cached blocks,
+        # fetching the missing blocks with a single request. If the request
+        # returns less than asked for, iteration stops at the short block,
+        # and only complete blocks are cached.
+        first = start // self._block_size
+        last = (end - 1) // self._block_size
+        missing = [index for index in range(first, last + 1)
+                   if index not in self._blocks]
+        fetched = {}
+        if missing:
+            fetch_first, fetch_last = missing[0], missing[-1]
+            if sequential:
+                fetch_last = max(fetch_last,
+                                 fetch_first + self._readahead_blocks - 1)
+            fetch_last = min(fetch_last, (self._size - 1) // self._block_size)
+            fetch_start = fetch_first * self._block_size
+            data = self._read_range(
+                fetch_start,
+                min(self._size, (fetch_last + 1) * self._block_size))
+            for index in range(fetch_first, fetch_last + 1):
+                offset = index * self._block_size - fetch_start
+                fetched[index] = data[offset:offset + self._block_size]
+        for index in range(first, last + 1):
+            block = fetched.get(index)
+            if block is None:
+                block = self._blocks[index]
+                self._blocks.move_to_end(index)
+            block_start = index * self._block_size
+            yield memoryview(block)[max(start - block_start, 0):
+                                    end - block_start]
+            if len(block) < self._block_length(index):
+                break
+        for index, block in fetched.items():
+            if len(block) == self._block_length(index):
+                self._blocks[index] = block
+        while len(self._blocks) > self._max_blocks:
+            self._blocks.popitem(last=False)
+
+    def readinto(self, b):
+        self._check_open()
+        with self._lock:
+            start = self._position
+            end = min(self._size, start + len(b))
+            if start >= end:
+                return 0
+            view = memoryview(b).cast('B')
+            written = 0
+            for part in self._iter_range(
+                    start, end, start == self._sequential_offset):
+                view[written:written + len(part)] = part
+                written += len(part)
+            self._position = self._sequential_offset = start + written
+            return written
+
+    def readall(self):
+        self._check_open()
+        with self._lock:
+            parts = []
+            while self._position < self._size:
+                start = self._position
+                data = b''.join(self._iter_range(
+                    start, self._size, start == self._sequential_offset))
+                if not data:
+                    break
+                parts.append(data)
+                self._position = self._sequential_offset = start + len(data)
+            return b''.join(parts)
+
+    def read_range(self, start, end):
+        """
+        Returns the content from byte ``start`` up to, but not including,
+        byte ``end``, without moving the position of the file. Only the
+        blocks in the range are fetched.
+        """
+        self._check_open()
+        end = min(end, self._size)
+        if start >= end:
+            return b''
+        with self._lock:
+            return b''.join(self._iter_range(start, end, False))
+
+    def close(self):
+        self._blocks.clear()
+        super(BucketObjectReader, self).close()
+
+
+class StreamingUploadSource(object):
+    """
+    A read-only stream over the data of a streaming upload, given as
+    ``bytes``, a ``memoryview``, a readable binary file object or an
+    iterable of byte chunks, e.g. a generator. The data is read from the
+    source as the stream is read, and at most a part of it is buffered.
+    Reads from ``bytes`` and memoryviews are slices of the data rather than
+    copies.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, six.text_type):
+            source = source.encode('utf-8')
+        self._view = None
+        self._file = None
+        self._chunks = None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._view = memoryview(source)
+            self._offset = 0
+        elif hasattr(source, 'read'):
+            self._file = source
+        else:
+            self._chunks = iter(source)
+            self._buffer = bytearray()
+
+    @staticmethod
+    def to_bytes(data):
+        """
+        Returns data read from the stream as ``bytes``, for SDKs that do not
+        accept other bytes-like objects.
+        """
+        if isinstance(data, bytes):
+            return data
+        if isinstance(data, memoryview):
+            return data.tobytes()
+        return bytes(data)
+
+    def _read_view(self, size):
+        end = len(self._view) if size < 0 else self._offset + size
+        data = self._view[self._offset:end]
+        self._offset += len(data)
+        return data
+
+    def _read_file(self, size):
+        # File objects such as pipes and sockets may return less than the
+        # requested size before the end of the data
+        data = self._file.read(size)
+        if size < 0 or not data or len(data) == size:
+            return data
+        parts = [data]
+        remaining = size - len(data)
+        while remaining > 0:
+            data = self._file.read(remaining)
+            if not data:
+                break
+            parts.append(data)
+            remaining -= len(data)
+        return b''.join(parts)
+
+    def _read_chunks(self, size):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            if isinstance(chunk, six.text_type):
+                chunk = chunk.encode('utf-8')
+            if not self._buffer and len(chunk) == size:
+                # A chunk of exactly the requested size needs no buffering
+                return chunk
+            self._buffer += chunk
+        if size < 0 or len(self._buffer) <= size:
+            data = self._buffer
+            self._buffer = bytearray()
+            return data
+        data = self._buffer[:size]
+        del self._buffer[:size]
+        return data
+
+    def read_part(self, size=-1):
+        """
+        Returns the next ``size`` bytes of the data, or fewer at the end of
+        the data, as a bytes-like object.
+        """
+        if size is None:
+            size = -1
+        if self._view is not None:
+            return self._read_view(size)
+        if self._file is not None:
+            return self._read_file(size)
+        return self._read_chunks(size)
+
+    def read(self, size=-1):
+        return self.to_bytes(self.read_part(size))
+
+    def iter_parts(self, part_size):
+        """
+        Yields the data in parts of ``part_size`` bytes. Only the last part
+        may be shorter.
+        """
+        while True:
+            part = self.read_part(part_size)
+            if not part:
+                return
+            yield part
+            if len(part) < part_size:
+                return
+
+
 class BaseBucketObject(BaseCloudResource, BucketObject):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'size', 'last_modified')
+
     # Regular expression for valid bucket keys.
     # They, must match the following criteria: http://docs.aws.amazon.com/"
     # AmazonS3/latest/dev/UsingMetadata.html#object-key-guidelines
@@ -692,9 +1156,77 @@ class BaseBucketObject(BaseCloudResource, BucketObject):
     # s/537772/what-is-the-most-correct-regular-expression-for-a-unix-file-path
     CB_NAME_PATTERN = re.compile(r"[^\0]+")
 
+    # The default part size of parallel uploads, and the cloud's limits on
+    # the parts of an object. Providers override the limits as required.
+    DEFAULT_PART_SIZE = 8 * 1024 * 1024
+    MIN_PART_SIZE = 1
+    MAX_PART_SIZE = None
+    MAX_PARTS = 10000
+    # The defaults of the readers returned by open()
+    DEFAULT_READ_BLOCK_SIZE = 1024 * 1024
+    DEFAULT_READAHEAD = 8 * 1024 * 1024
+    DEFAULT_READ_CACHE_SIZE = 32 * 1024 * 1024
+
     def __init__(self, provider):
         super(BaseBucketObject, self).__init__(provider)
 
+    def _get_part_size(self, file_size, part_size=None):
+        """
+        Returns the part size to upload a file with: the requested size,
+        within the cloud's limits on the part size, and raised as far as
+        required for the file to fit in the cloud's maximum number of parts.
+        """
+        part_size = max(part_size or self.DEFAULT_PART_SIZE,
+                        self.MIN_PART_SIZE)
+        if self.MAX_PART_SIZE:
+            part_size = min(part_size, self.MAX_PART_SIZE)
+        return max(part_size, -(-file_size // self.MAX_PARTS))
+
+    def _upload_parts(self, path, part_size, concurrency, upload_part):
+        """
+        Reads a file in parts of ``part_size`` bytes, and calls
+        ``upload_part(index, data)`` with each part on the provider's
+        parallel executor, with at most ``concurrency`` parts in memory.
+
+        :rtype: ``list``
+        :return: The results of ``upload_part``, in the order of the parts.
+        """
+        def upload(index):
+            with open(path, 'rb') as f:
+                f.seek(index * part_size)
+                return upload_part(index, f.read(part_size))
+
+        num_parts = max(1, -(-os.path.getsize(path) // part_size))
+        return self._provider.parallel.map_limited(
+            upload, range(num_parts),
+            concurrency or self._provider.config.parallel_workers)
+
+    def _upload_stream_parts(self, source, part_size, concurrency,
+                             upload_part, upload_whole):
+        """
+        Reads the data of a streaming upload in parts of ``part_size`` bytes.
+        If the data fits in a single part, it is passed to
+        ``upload_whole(data)``. Otherwise, ``upload_part(index, data)`` is
+        called with each part on the provider's parallel executor, with at
+        most ``concurrency`` parts in flight.
+
+        :rtype: ``list``
+        :return: The results of ``upload_part``, in the order of the parts,
+                 or ``None`` if the data was uploaded whole.
+        """
+        parts = StreamingUploadSource(source).iter_parts(part_size)
+        first = next(parts, b'')
+        # A short first part is the whole data, otherwise the next part is
+        # read to tell whether there is more than one
+        second = next(parts, None) if len(first) == part_size else None
+        if second is None:
+            upload_whole(first)
+            return None
+        return self._provider.parallel.map_limited(
+            lambda args: upload_part(*args),
+            enumerate(itertools.chain([first, second], parts)),
+            concurrency or self._provider.config.parallel_workers)
+
     @staticmethod
     def is_valid_resource_name(name):
         return (True if BaseBucketObject.CB_NAME_PATTERN.match(name)
@@ -713,6 +1245,143 @@ class BaseBucketObject(BaseCloudResource, BucketObject):
     def save_content(self, target_stream):
         shutil.copyfileobj(self.iter_content(), target_stream)
 
+    def _read_range(self, start, end, version=None):
+        """
+        Returns the contents of this object from byte ``start`` up to, but
+        not including, byte ``end``. Providers should override this with a
+        ranged request.
+
+        If a ``version`` returned by :meth:`_content_version` is given, the
+        request must be conditional on the object still having that version,
+        and raise an :class:`.ObjectModifiedException` otherwise.
+        """
+        raise NotImplementedError(
+            "Ranged downloads are not supported by %s" % self._provider.name)
+
+    def _content_version(self):
+        """
+        Returns a token identifying the version of this object's content as
+        of when it was fetched, e.g. its ETag or generation, or ``None`` if
+        versions cannot be told apart. Providers should override this.
+        """
+        return None
+
+    def _version_changed(self, error):
+        """
+        Returns the exception to raise when a ranged read fails because the
+        object no longer has the requested version.
+        """
+        return ObjectModifiedException(
+            "%s changed while it was being read: %s" % (self.name, error))
+
+    def _pinned_read_range(self):
+        """
+        Refreshes this object, and returns its current size and version,
+        and a function that reads ranges of that version. The ranges of a
+        download are separate requests, so pinning them to one version
+        makes an overwrite during the download fail rather than mix
+        versions.
+        """
+        self.refresh()
+        version = self._content_version()
+
+        def read_range(start, end):
+            return self._read_range(start, end, version=version)
+        return self.size, version, read_range
+
+    def _stream_content(self, chunk_size=None):
+        """
+        Returns a :class:`RangedContentStream` over this object's content,
+        for providers whose SDKs do not stream downloads.
+        """
+        size, _, read_range = self._pinned_read_range()
+        return RangedContentStream(read_range, size,
+                                   chunk_size or self.DEFAULT_PART_SIZE)
+
+    def open(self, mode='rb', block_size=None, readahead=None,
+             cache_size=None):
+        if mode != 'rb':
+            raise InvalidParamException(
+                "Bucket objects can only be opened for reading with mode "
+                "'rb', not '%s'" % mode)
+        size, _, read_range = self._pinned_read_range()
+        return BucketObjectReader(
+            read_range, size,
+            block_size or self.DEFAULT_READ_BLOCK_SIZE,
+            self.DEFAULT_READAHEAD if readahead is None else readahead,
+            cache_size or self.DEFAULT_READ_CACHE_SIZE)
+
+    @staticmethod
+    def _load_download_state(path, state_path, header):
+        # The state file holds a JSON header describing the download,
+        # followed by the index of each part written to the file so far
+        try:
+            with open(state_path) as f:
+                lines = f.read().split("\n")
+            if (json.loads(lines[0]) != header or
+                    os.path.getsize(path) != header['size']):
+                return None
+            # Skip the last line, which is either empty or was cut short by
+            # an interruption
+            return set(int(line) for line in lines[1:-1])
+        except (IOError, OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_at(fd, data, offset, lock):
+        view = memoryview(data)
+        while view:
+            if hasattr(os, 'pwrite'):
+                written = os.pwrite(fd, view, offset)
+            else:
+                with lock:
+                    os.lseek(fd, offset, os.SEEK_SET)
+                    written = os.write(fd, view)
+            view = view[written:]
+            offset += written
+
+    def download_to_file(self, path, part_size=None, concurrency=None):
+        size, version, read_range = self._pinned_read_range()
+        part_size = part_size or self.DEFAULT_PART_SIZE
+        state_path = path + ".cbdownload"
+        # A download is only resumed if the object still has the version
+        # whose parts were written
+        header = {'name': self.name, 'size': size, 'version': version,
+                  'last_modified': self.last_modified, 'part_size': part_size}
+        done = self._load_download_state(path, state_path, header)
+        if done is None:
+            done = set()
+            with open(path, 'wb') as f:
+                f.truncate(size)
+            with open(state_path, 'w') as f:
+                f.write(json.dumps(header) + "\n")
+        else:
+            log.debug("Resuming download of %s with %d parts done",
+                      self.name, len(done))
+
+        lock = threading.Lock()
+        fd = os.open(path, os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+        state_file = open(state_path, 'a')
+
+        def download(index):
+            start = index * part_size
+            data = read_range(start, min(size, start + part_size))
+            self._write_at(fd, data, start, lock)
+            with lock:
+                state_file.write("%d\n" % index)
+                state_file.flush()
+
+        try:
+            self._provider.parallel.map_limited(
+                download,
+                [index for index in range(-(-size // part_size))
+                 if index not in done],
+                concurrency or self._provider.config.parallel_workers)
+        finally:
+            os.close(fd)
+            state_file.close()
+        os.remove(state_path)
+
     def __eq__(self, other):
         return (isinstance(other, BucketObject) and
                 # pylint:disable=protected-access
@@ -746,6 +1415,10 @@ class BaseBucket(BaseCloudResource, Bucket):
 
 class BaseNetwork(BaseCloudResource, BaseObjectLifeCycleMixin, Network):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'state', 'external', 'cidr_block', 'subnets')
+    RESOLVED_FIELDS = ('subnets',)
+
     CB_DEFAULT_NETWORK_LABEL = os.environ.get('CB_DEFAULT_NETWORK_LABEL',
                                               'cloudbridge-net')
     CB_DEFAULT_IPV4RANGE = os.environ.get('CB_DEFAULT_IPV4RANGE',
@@ -786,6 +1459,10 @@ class BaseNetwork(BaseCloudResource, BaseObjectLifeCycleMixin, Network):
 
 class BaseSubnet(BaseCloudResource, BaseObjectLifeCycleMixin, Subnet):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'state', 'cidr_block', 'network_id', 'zone')
+    RESOLVED_FIELDS = ('zone',)
+
     CB_DEFAULT_SUBNET_LABEL = os.environ.get('CB_DEFAULT_SUBNET_LABEL',
                                              'cloudbridge-subnet')
     CB_DEFAULT_SUBNET_IPV4RANGE = os.environ.get('CB_DEFAULT_SUBNET_IPV4RANGE',
@@ -817,6 +1494,9 @@ class BaseSubnet(BaseCloudResource, BaseObjectLifeCycleMixin, Subnet):
 
 class BaseFloatingIP(BaseCloudResource, BaseObjectLifeCycleMixin, FloatingIP):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'state', 'public_ip', 'private_ip', 'in_use')
+
     def __init__(self, provider):
         super(BaseFloatingIP, self).__init__(provider)
 
@@ -851,6 +1531,10 @@ class BaseFloatingIP(BaseCloudResource, BaseObjectLifeCycleMixin, FloatingIP):
 
 class BaseRouter(BaseCloudResource, Router):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'label', 'state', 'network_id', 'subnets')
+    RESOLVED_FIELDS = ('subnets',)
+
     CB_DEFAULT_ROUTER_LABEL = os.environ.get('CB_DEFAULT_ROUTER_LABEL',
                                              'cloudbridge-router')
 
@@ -870,6 +1554,9 @@ class BaseRouter(BaseCloudResource, Router):
 class BaseInternetGateway(BaseCloudResource, BaseObjectLifeCycleMixin,
                           InternetGateway):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'state', 'network_id')
+
     CB_DEFAULT_INET_GATEWAY_NAME = cb_helpers.get_env(
         'CB_DEFAULT_INET_GATEWAY_NAME', 'cloudbridge-inetgateway')
 
@@ -896,6 +1583,9 @@ class BaseInternetGateway(BaseCloudResource, BaseObjectLifeCycleMixin,
 
 class BaseDnsZone(BaseCloudResource, DnsZone):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'admin_email',)
+
     CB_NAME_PATTERN = re.compile(
         r"^(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9]"
         r"[a-z0-9-]{0,61}[a-z0-9]\.?$")
@@ -933,6 +1623,9 @@ class BaseDnsZone(BaseCloudResource, DnsZone):
 
 class BaseDnsRecord(BaseCloudResource, DnsRecord):
 
+    SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+        'zone_id', 'type', 'data', 'ttl')
+
     CB_NAME_PATTERN = re.compile(
         r"^(?:\*\.)?(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9]"
         r"[a-z0-9-]{0,61}[a-z0-9]\.?$")
@@ -3,6 +3,7 @@ Base implementation for services available through a provider
 """
 import logging
 
+from cloudbridge.interfaces.exceptions import BatchOperationException
 from cloudbridge.interfaces.exceptions import InvalidParamException
 from cloudbridge.interfaces.resources import DnsRecordType
 from cloudbridge.interfaces.resources import Network
@@ -60,6 +61,61 @@ class BaseCloudService(CloudService):
     def events(self):
         return self._provider.middleware.events
 
+    @staticmethod
+    def _batch_result(operation, results, failures):
+        """
+        Returns the results of a bulk operation, or raises a
+        ``BatchOperationException`` if any of its items failed.
+        """
+        if failures:
+            raise BatchOperationException(
+                "%s failed for %d of %d items. First error: %s" % (
+                    operation, len(failures), len(results) + len(failures),
+                    failures[0][1]),
+                results, failures)
+        return results
+
+    def _run_many(self, operation, func, items):
+        """
+        Calls ``func`` on each item concurrently through the provider's
+        parallel executor, for providers without a batch API. All items are
+        attempted even if some of them fail.
+
+        :rtype: ``list``
+        :return: The results of the calls in the order of ``items``. If any
+                 call failed, a ``BatchOperationException`` is raised.
+        """
+        items = list(items)
+        futures = [self.provider.parallel.submit(func, item)
+                   for item in items]
+        results = []
+        failures = []
+        for item, future in zip(items, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                log.debug("%s failed for %s: %s", operation, item, e)
+                failures.append((item, e))
+        return self._batch_result(operation, results, failures)
+
+    def _get_many(self, ids):
+        """
+        Looks up each id concurrently with ``get``, for providers without a
+        bulk lookup API.
+        """
+        ids = list(dict.fromkeys(ids))
+        return dict(zip(ids, self._run_many("Lookup", self.get, ids)))
+
+    def _get_many_by_listing(self, ids):
+        """
+        Looks up ids in a single listing of all objects, for services whose
+        ``get`` searches the listing anyway.
+        """
+        ids = list(dict.fromkeys(ids))
+        wanted = set(ids)
+        found = {obj.id: obj for obj in self if obj.id in wanted}
+        return {obj_id: found.get(obj_id) for obj_id in ids}
+
 
 class BaseSecurityService(SecurityService, BaseCloudService):
 
@@ -74,6 +130,11 @@ class BaseKeyPairService(
         super(BaseKeyPairService, self).__init__(provider)
         self._service_event_pattern += ".security.key_pairs"
 
+    @dispatch(event="provider.security.key_pairs.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
 
 class BaseVMFirewallService(
         BasePageableObjectMixin, VMFirewallService, BaseCloudService):
@@ -82,21 +143,18 @@ class BaseVMFirewallService(
         super(BaseVMFirewallService, self).__init__(provider)
         self._service_event_pattern += ".security.vm_firewalls"
 
+    @dispatch(event="provider.security.vm_firewalls.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
     @dispatch(event="provider.security.vm_firewalls.find",
               priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, ", ".join(filters)))
-
-        return ClientPagedResultList(self.provider,
-                                     matches if matches else [])
+        # Providers that can filter natively should override this and push
+        # the predicates down through the FindQuery
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        return ClientPagedResultList(self.provider, list(query.match(self)))
 
 
 class BaseVMFirewallRuleService(BasePageableObjectMixin,
@@ -143,6 +201,26 @@ class BaseVolumeService(
         super(BaseVolumeService, self).__init__(provider)
         self._service_event_pattern += ".storage.volumes"
 
+    @dispatch(event="provider.storage.volumes.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
+    @dispatch(event="provider.storage.volumes.create_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def create_many(self, count, label, size, snapshot=None,
+                    description=None):
+        return self._run_many(
+            "Volume creation",
+            lambda _: self.create(label, size, snapshot=snapshot,
+                                  description=description),
+            range(count))
+
+    @dispatch(event="provider.storage.volumes.delete_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def delete_many(self, volumes):
+        self._run_many("Volume deletion", self.delete, volumes)
+
 
 class BaseSnapshotService(
         BasePageableObjectMixin, SnapshotService, BaseCloudService):
@@ -151,6 +229,25 @@ class BaseSnapshotService(
         super(BaseSnapshotService, self).__init__(provider)
         self._service_event_pattern += ".storage.snapshots"
 
+    @dispatch(event="provider.storage.snapshots.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
+    @dispatch(event="provider.storage.snapshots.create_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def create_many(self, label, volumes, description=None):
+        return self._run_many(
+            "Snapshot creation",
+            lambda volume: self.create(label, volume,
+                                       description=description),
+            volumes)
+
+    @dispatch(event="provider.storage.snapshots.delete_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def delete_many(self, snapshots):
+        self._run_many("Snapshot deletion", self.delete, snapshots)
+
 
 class BaseBucketService(
         BasePageableObjectMixin, BucketService, BaseCloudService):
@@ -159,6 +256,11 @@ class BaseBucketService(
         super(BaseBucketService, self).__init__(provider)
         self._service_event_pattern += ".storage.buckets"
 
+    @dispatch(event="provider.storage.buckets.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
     # Generic find will be used for providers where we have not implemented
     # provider-specific querying for find method
     @dispatch(event="provider.storage.buckets.find",
@@ -199,6 +301,11 @@ class BaseImageService(
         super(BaseImageService, self).__init__(provider)
         self._service_event_pattern += ".compute.images"
 
+    @dispatch(event="provider.compute.images.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
 
 class BaseInstanceService(
         BasePageableObjectMixin, InstanceService, BaseCloudService):
@@ -207,6 +314,30 @@ class BaseInstanceService(
         super(BaseInstanceService, self).__init__(provider)
         self._service_event_pattern += ".compute.instances"
 
+    @dispatch(event="provider.compute.instances.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
+    # Providers without a batch API create and delete instances concurrently
+    @dispatch(event="provider.compute.instances.create_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def create_many(self, count, label, image, vm_type, subnet, key_pair=None,
+                    vm_firewalls=None, user_data=None, launch_config=None,
+                    **kwargs):
+        return self._run_many(
+            "Instance creation",
+            lambda _: self.create(
+                label, image, vm_type, subnet, key_pair=key_pair,
+                vm_firewalls=vm_firewalls, user_data=user_data,
+                launch_config=launch_config, **kwargs),
+            range(count))
+
+    @dispatch(event="provider.compute.instances.delete_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def delete_many(self, instances):
+        self._run_many("Instance deletion", self.delete, instances)
+
 
 class BaseVMTypeService(
         BasePageableObjectMixin, VMTypeService, BaseCloudService):
@@ -215,6 +346,11 @@ class BaseVMTypeService(
         super(BaseVMTypeService, self).__init__(provider)
         self._service_event_pattern += ".compute.vm_types"
 
+    @dispatch(event="provider.compute.vm_types.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
     @dispatch(event="provider.compute.vm_types.get",
               priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
     def get(self, vm_type_id):
@@ -237,6 +373,11 @@ class BaseRegionService(
         super(BaseRegionService, self).__init__(provider)
         self._service_event_pattern += ".compute.regions"
 
+    @dispatch(event="provider.compute.regions.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many_by_listing(ids)
+
     @dispatch(event="provider.compute.regions.find",
               priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
@@ -259,6 +400,11 @@ class BaseNetworkService(
         super(BaseNetworkService, self).__init__(provider)
         self._service_event_pattern += ".networking.networks"
 
+    @dispatch(event="provider.networking.networks.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
     @property
     def subnets(self):
         return [subnet for subnet in self.provider.subnets
@@ -279,18 +425,10 @@ class BaseNetworkService(
     @dispatch(event="provider.networking.networks.find",
               priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise TypeError("Unrecognised parameters for search: %s."
-                            " Supported attributes: %s" % (kwargs,
-                                                           ", ".join(filters)))
-
-        return ClientPagedResultList(self.provider,
-                                     matches if matches else [])
+        # Providers that can filter natively should override this and push
+        # the predicates down through the FindQuery
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        return ClientPagedResultList(self.provider, list(query.match(self)))
 
 
 class BaseSubnetService(
@@ -300,6 +438,11 @@ class BaseSubnetService(
         super(BaseSubnetService, self).__init__(provider)
         self._service_event_pattern += ".networking.subnets"
 
+    @dispatch(event="provider.networking.subnets.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
     @dispatch(event="provider.networking.subnets.find",
               priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
     def find(self, network=None, **kwargs):
@@ -331,6 +474,11 @@ class BaseRouterService(
         super(BaseRouterService, self).__init__(provider)
         self._service_event_pattern += ".networking.routers"
 
+    @dispatch(event="provider.networking.routers.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
     def get_or_create_default(self, network):
         net_id = network.id if isinstance(network, Network) else network
         routers = self.provider.networking.routers.find(
@@ -354,6 +502,18 @@ class BaseFloatingIPService(FloatingIPService, BaseCloudService):
     def __init__(self, provider):
         super(BaseFloatingIPService, self).__init__(provider)
 
+    @dispatch(event="provider.networking.floating_ips.create_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def create_many(self, gateway, count):
+        return self._run_many("Floating IP allocation",
+                              lambda _: self.create(gateway), range(count))
+
+    @dispatch(event="provider.networking.floating_ips.delete_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def delete_many(self, gateway, fips):
+        self._run_many("Floating IP deletion",
+                       lambda fip: self.delete(gateway, fip), fips)
+
     @dispatch(event="provider.networking.floating_ips.find",
               priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
     def find(self, gateway, **kwargs):
@@ -375,6 +535,11 @@ class BaseDnsZoneService(BasePageableObjectMixin, DnsZoneService,
     def __init__(self, provider):
         super(BaseDnsZoneService, self).__init__(provider)
 
+    @dispatch(event="provider.dns.host_zones.get_many",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many(ids)
+
     def _get_fully_qualified_dns(self, name):
         # Add a trailing dot to fully qualify
         return name + '.' if not name.endswith('.') else name
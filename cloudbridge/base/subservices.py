@@ -127,10 +127,18 @@ class BaseFloatingIPSubService(FloatingIPSubService, BasePageableObjectMixin):
     def create(self):
         return self._provider.networking._floating_ips.create(self.gateway)
 
+    def create_many(self, count):
+        return self._provider.networking._floating_ips.create_many(
+            self.gateway, count)
+
     def delete(self, fip):
         return self._provider.networking._floating_ips.delete(self.gateway,
                                                               fip)
 
+    def delete_many(self, fips):
+        return self._provider.networking._floating_ips.delete_many(
+            self.gateway, fips)
+
 
 class BaseSubnetSubService(SubnetSubService, BasePageableObjectMixin):
 
@@ -0,0 +1,225 @@
+"""
+Polls resource listings and publishes the differences between successive
+listings as events on the provider's middleware bus.
+"""
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class InventoryWatcher(object):
+    """
+    Keeps the last listing of each watched resource type, and on every poll
+    dispatches a ``provider.watch.<type>.created``, ``.changed`` or
+    ``.deleted`` event for each resource that appeared, changed or
+    disappeared since the previous poll.
+
+    Resources are matched by ID. A resource is considered changed when its
+    fingerprint, i.e. the values of the type's :attr:`FINGERPRINT_FIELDS`
+    (e.g. state, label and IPs of an instance), differs from the previous
+    listing. Listings go through the provider's middleware, so with a
+    :class:`.CachingMiddleware`, changes are only seen once cached listings
+    expire.
+
+    Event handlers are called with the resource. The handlers of
+    ``changed`` events also get a ``changes`` keyword argument, a dict of
+    each changed field to its ``(old, new)`` values. The handlers of
+    ``deleted`` events get the resource as it was last listed.
+
+    Example:
+
+    .. code-block:: python
+
+        def on_instance_change(event_args, instance, changes):
+            print(instance.id, changes)
+
+        provider.middleware.events.observe(
+            "provider.watch.instances.changed", 3000, on_instance_change)
+        watcher = provider.watch(['instances', 'volumes'], interval=30)
+        ...
+        watcher.stop()
+    """
+    DEFAULT_INTERVAL = 60
+    # Resource type names and the services that list them. Other types may
+    # be watched by passing the service path, e.g. 'networking.networks'.
+    RESOURCE_TYPES = {
+        'instances': 'compute.instances',
+        'images': 'compute.images',
+        'volumes': 'storage.volumes',
+        'snapshots': 'storage.snapshots',
+        'buckets': 'storage.buckets',
+        'networks': 'networking.networks',
+        'subnets': 'networking.subnets',
+        'routers': 'networking.routers',
+        'vm_firewalls': 'security.vm_firewalls',
+        'key_pairs': 'security.key_pairs',
+        'dns_zones': 'dns.host_zones',
+    }
+    # The mutable fields of each resource type whose changes are reported.
+    # Dotted fields are looked up through nested objects.
+    FINGERPRINT_FIELDS = {
+        'instances': ('state', 'label', 'public_ips', 'private_ips',
+                      'vm_type_id', 'vm_firewall_ids'),
+        'images': ('state', 'label'),
+        'volumes': ('state', 'label', 'size', 'attachments.instance_id'),
+        'snapshots': ('state', 'label'),
+        'buckets': (),
+        'networks': ('state', 'label'),
+        'subnets': ('state', 'label'),
+        'routers': ('state', 'label', 'network_id'),
+        'vm_firewalls': ('label', 'description'),
+        'key_pairs': (),
+        'dns_zones': (),
+    }
+    DEFAULT_FINGERPRINT_FIELDS = ('state', 'label')
+    EVENT_PREFIX = "provider.watch"
+
+    def __init__(self, provider, resource_types, interval=DEFAULT_INTERVAL,
+                 initial_events=False):
+        """
+        :type provider: :class:`.CloudProvider`
+        :param provider: The provider whose resources to watch.
+
+        :type resource_types: ``list`` of ``str``
+        :param resource_types: The resource types to watch, as keys of
+                               :attr:`RESOURCE_TYPES` or service paths.
+
+        :type interval: ``float``
+        :param interval: The number of seconds between polls.
+
+        :type initial_events: ``bool``
+        :param initial_events: Whether the first poll dispatches a
+                               ``created`` event for every existing
+                               resource. By default, it only records the
+                               initial listing.
+        """
+        assert interval > 0
+        self.provider = provider
+        self.resource_types = list(resource_types)
+        self.interval = interval
+        self.initial_events = initial_events
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _get_field(resource, field):
+        value = resource
+        for name in field.split('.'):
+            if value is None:
+                return None
+            value = getattr(value, name, None)
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+
+    def fingerprint(self, resource_type, resource):
+        """
+        Returns the values of the fields whose changes are reported for a
+        resource.
+
+        :rtype: ``dict``
+        :return: A dict of field names to values.
+        """
+        fields = self.FINGERPRINT_FIELDS.get(
+            resource_type, self.DEFAULT_FINGERPRINT_FIELDS)
+        return {field: self._get_field(resource, field) for field in fields}
+
+    def _list(self, resource_type):
+        # pylint:disable=protected-access
+        service = self.provider._deepgetattr(
+            self.provider,
+            self.RESOURCE_TYPES.get(resource_type, resource_type))
+        return list(service)
+
+    def _dispatch(self, resource_type, change, *args, **kwargs):
+        event = "{0}.{1}.{2}".format(self.EVENT_PREFIX, resource_type, change)
+        try:
+            self.provider.middleware.events.dispatch(
+                self, event, *args, **kwargs)
+        except Exception:
+            # Don't let a failing handler stop others from being notified
+            log.exception("Error while handling event: %s", event)
+
+    def snapshot(self, resource_type):
+        """
+        Returns the resources of a type as of the last poll.
+
+        :rtype: ``list`` of :class:`.CloudResource`
+        :return: The resources, or ``None`` if the type has not been polled.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(resource_type)
+        if snapshot is None:
+            return None
+        return [resource for resource, _ in snapshot.values()]
+
+    def poll(self):
+        """
+        Lists each watched resource type once, and dispatches events for the
+        differences from the previous listing. A type whose listing fails is
+        skipped until the next poll, without reporting any deletions.
+        """
+        for resource_type in self.resource_types:
+            try:
+                resources = self._list(resource_type)
+            except Exception:
+                log.exception("Could not list %s for watching", resource_type)
+                continue
+            current = {}
+            for resource in resources:
+                current[resource.id] = (
+                    resource, self.fingerprint(resource_type, resource))
+            with self._lock:
+                previous = self._snapshots.get(resource_type)
+                self._snapshots[resource_type] = current
+            if previous is None and not self.initial_events:
+                continue
+            previous = previous or {}
+            for obj_id, (resource, fingerprint) in current.items():
+                if obj_id not in previous:
+                    self._dispatch(resource_type, "created", resource)
+                    continue
+                old_fingerprint = previous[obj_id][1]
+                changes = {field: (old_fingerprint.get(field), value)
+                           for field, value in fingerprint.items()
+                           if old_fingerprint.get(field) != value}
+                if changes:
+                    self._dispatch(resource_type, "changed", resource,
+                                   changes=changes)
+            for obj_id, (resource, _) in previous.items():
+                if obj_id not in current:
+                    self._dispatch(resource_type, "deleted", resource)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.poll()
+            self._stopped.wait(self.interval)
+
+    def start(self):
+        """
+        Starts polling on a background thread. Event handlers are called on
+        that thread.
+        """
+        assert self._thread is None, "The watcher has already been started"
+        self._thread = threading.Thread(
+            target=self._run, name="cloudbridge-watch")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """
+        Stops polling, and waits for a poll in progress to finish.
+        """
+        self._stopped.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -1,7 +1,12 @@
+import hashlib
 import importlib
 import inspect
+import json
 import logging
 import pkgutil
+import threading
+import time
+from collections import OrderedDict
 from collections import defaultdict
 
 from cloudbridge import providers
@@ -20,14 +25,149 @@ class ProviderList(object):
     MOCK = 'mock'
 
 
+# The modules implementing each of the providers shipped with cloudbridge.
+# Only the module of a requested provider is imported, so that creating
+# e.g. an AWS provider does not import the Azure, GCP and OpenStack SDKs.
+PROVIDER_REGISTRY = {
+    ProviderList.AWS: 'cloudbridge.providers.aws',
+    ProviderList.AZURE: 'cloudbridge.providers.azure',
+    ProviderList.GCP: 'cloudbridge.providers.gcp',
+    ProviderList.OPENSTACK: 'cloudbridge.providers.openstack',
+    ProviderList.MOCK: 'cloudbridge.providers.mock',
+}
+
+
+class ProviderPool(object):
+
+    """
+    A thread-safe pool of provider instances, keyed by a stable hash of the
+    provider name and configuration. Providers are evicted in least
+    recently used order once the pool is full, and when they have not been
+    used for longer than the idle timeout.
+
+    Pooled providers are shared by every caller that requests the same
+    configuration, so callers should not modify them (e.g. by adding
+    middleware). Only the configuration passed in is hashed, so providers
+    reading credentials from the environment or config files must be
+    invalidated when those credentials change.
+    """
+
+    def __init__(self, max_size=32, idle_timeout=None):
+        """
+        :type max_size: ``int``
+        :param max_size: The maximum number of providers to keep.
+
+        :type idle_timeout: ``float``
+        :param idle_timeout: Number of seconds after which an unused provider
+                             is evicted. If ``None``, providers are only
+                             evicted when the pool is full.
+        """
+        assert max_size >= 1
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        # Maps each key to a (name, provider, last used time) tuple, in least
+        # recently used order
+        self._providers = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name, config):
+        """
+        Returns a stable key for a provider name and configuration. Values
+        which cannot be serialized to JSON are keyed by their ``repr()``.
+        """
+        serialized = json.dumps([name, dict(config or {})], sort_keys=True,
+                                default=repr)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def _expire(self, now):
+        if self.idle_timeout is None:
+            return
+        for key, (_, _, last_used) in list(self._providers.items()):
+            if now - last_used <= self.idle_timeout:
+                # Later entries were used more recently
+                break
+            log.debug("Evicting idle provider: %s", key)
+            del self._providers[key]
+
+    def get(self, name, config, create):
+        """
+        Returns the pooled provider for the given name and config, calling
+        ``create()`` to create one if it is not pooled yet.
+        """
+        key = self.key(name, config)
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            entry = self._providers.pop(key, None)
+            if entry:
+                log.debug("Reusing pooled '%s' provider", name)
+                self._providers[key] = (name, entry[1], now)
+                return entry[1]
+        # Create outside the lock, so that a slow provider does not block
+        # others. If another thread won the race, its provider is used.
+        provider = create()
+        with self._lock:
+            entry = self._providers.pop(key, None)
+            if entry:
+                provider = entry[1]
+            self._providers[key] = (name, provider, time.monotonic())
+            while len(self._providers) > self.max_size:
+                evicted, _ = self._providers.popitem(last=False)
+                log.debug("Evicting least recently used provider: %s",
+                          evicted)
+        return provider
+
+    def invalidate(self, name=None, config=None):
+        """
+        Removes providers from the pool, e.g. after credentials have been
+        rotated. If a name and config are given, only that provider is
+        removed. If only a name is given, all providers with that name are
+        removed. Otherwise, the pool is cleared.
+
+        :rtype: ``int``
+        :return: The number of providers removed.
+        """
+        with self._lock:
+            if name is not None and config is not None:
+                keys = [self.key(name, config)]
+            elif name is not None:
+                keys = [key for key, entry in self._providers.items()
+                        if entry[0] == name]
+            else:
+                keys = list(self._providers)
+            removed = 0
+            for key in keys:
+                if self._providers.pop(key, None):
+                    removed += 1
+            return removed
+
+    def __len__(self):
+        with self._lock:
+            return len(self._providers)
+
+
 class CloudProviderFactory(object):
 
     """
     Get info and handle on the available cloud provider implementations.
     """
 
-    def __init__(self):
+    def __init__(self, pool_size=None, pool_idle_timeout=None):
+        """
+        :type pool_size: ``int``
+        :param pool_size: If set, :meth:`create_provider` returns pooled
+                          providers, keeping up to this many instances. By
+                          default, a new provider is created on each call.
+
+        :type pool_idle_timeout: ``float``
+        :param pool_idle_timeout: Number of seconds after which an unused
+                                  pooled provider is evicted.
+        """
         self.provider_list = defaultdict(dict)
+        self._discovered = False
+        self.pool = (ProviderPool(pool_size, pool_idle_timeout)
+                     if pool_size else None)
         log.debug("Providers List: %s", self.provider_list)
 
     def register_provider_class(self, cls):
@@ -64,36 +204,62 @@ class CloudProviderFactory(object):
     def discover_providers(self):
         """
         Discover all available providers within the
-        ``cloudbridge.providers`` package.
+        ``cloudbridge.providers`` package. This imports every provider
+        module, along with its SDKs. Providers which were already
+        registered are not overridden.
         Note that this methods does not guard against a failed import.
         """
         for _, modname, _ in pkgutil.iter_modules(providers.__path__):
             log.debug("Importing provider: %s", modname)
             try:
-                self._import_provider(modname)
+                self._import_provider(
+                    "{0}.{1}".format(providers.__name__, modname))
             except Exception as e:
                 log.debug("Could not import provider: %s", e)
+        self._discovered = True
 
-    def _import_provider(self, module_name):
+    def _import_provider(self, module_name, provider_id=None):
         """
-        Imports and registers providers from the given module name.
+        Imports and registers providers from the given module name, which
+        have not been registered yet. If a provider_id is given, only that
+        provider is registered.
         Raises an ImportError if the import does not succeed.
         """
         log.debug("Importing providers from %s", module_name)
-        module = importlib.import_module(
-            "{0}.{1}".format(providers.__name__,
-                             module_name))
+        module = importlib.import_module(module_name)
         classes = inspect.getmembers(module, inspect.isclass)
         for _, cls in classes:
+            cls_id = getattr(cls, "PROVIDER_ID", None)
+            if provider_id and cls_id != provider_id:
+                continue
+            if self.provider_list.get(cls_id, {}).get('class'):
+                continue
             log.debug("Registering the provider: %s", cls)
             self.register_provider_class(cls)
 
+    def _load_provider(self, name):
+        """
+        Imports and registers a single provider listed in the
+        ``PROVIDER_REGISTRY``, if it has not been registered yet. Only
+        if the provider is unknown are all provider modules discovered.
+        """
+        if self.provider_list.get(name, {}).get('class'):
+            return
+        if name in PROVIDER_REGISTRY:
+            try:
+                self._import_provider(PROVIDER_REGISTRY[name], name)
+            except Exception as e:
+                log.debug("Could not import provider: %s", e)
+        elif not self._discovered:
+            self.discover_providers()
+
     def list_providers(self):
         """
         Get a list of available providers.
 
         It uses a simple automatic discovery system by iterating through all
-        submodules in cloudbridge.providers.
+        submodules in cloudbridge.providers, which imports all provider SDKs.
+        Use :meth:`get_provider_class` to load a single provider.
 
         :rtype: dict
         :return: A dict of available providers and their implementations in the
@@ -103,7 +269,7 @@ class CloudProviderFactory(object):
                                          der}
                  }
         """
-        if not self.provider_list:
+        if not self._discovered:
             self.discover_providers()
         log.debug("List of available providers: %s", self.provider_list)
         return self.provider_list
@@ -124,9 +290,20 @@ class CloudProviderFactory(object):
                        tuples or other iterables of length two). See specific
                        provider implementation for the required fields.
 
+        If the factory was created with a ``pool_size``, a pooled provider
+        with the same name and config is returned if there is one. Use
+        :meth:`invalidate_provider` to remove it from the pool, e.g. after
+        its credentials were rotated.
+
         :return:  a concrete provider instance
         :rtype: ``object`` of :class:`.CloudProvider`
         """
+        if self.pool is not None:
+            return self.pool.get(
+                name, config, lambda: self._create_provider(name, config))
+        return self._create_provider(name, config)
+
+    def _create_provider(self, name, config):
         log.info("Creating '%s' provider", name)
         provider_class = self.get_provider_class(name)
         if provider_class is None:
@@ -138,6 +315,21 @@ class CloudProviderFactory(object):
         log.debug("Created '%s' provider", name)
         return provider_class(config)
 
+    def invalidate_provider(self, name=None, config=None):
+        """
+        Removes pooled providers, so that the next :meth:`create_provider`
+        call creates a new one. If a name and config are given, only that
+        provider is removed. If only a name is given, all providers with
+        that name are removed. Otherwise, the whole pool is cleared.
+        Does nothing if pooling is not enabled.
+
+        :rtype: ``int``
+        :return: The number of providers removed.
+        """
+        if self.pool is None:
+            return 0
+        return self.pool.invalidate(name, config)
+
     def get_provider_class(self, name):
         """
         Return a class for the requested provider.
@@ -147,7 +339,8 @@ class CloudProviderFactory(object):
                  if the provider was not found.
         """
         log.debug("Returning a class for the %s provider", name)
-        impl = self.list_providers().get(name)
+        self._load_provider(name)
+        impl = self.provider_list.get(name)
         if impl:
             log.debug("Returning provider class for %s", name)
             return impl["class"]
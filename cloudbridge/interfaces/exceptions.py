@@ -19,6 +19,44 @@ class WaitStateException(CloudBridgeBaseException):
     pass
 
 
+class MultipleWaitStateException(WaitStateException):
+    """
+    Thrown when waiting on several objects at once and one or more of them
+    does not reach the expected state. The ``failures`` attribute contains a
+    list of ``(object, state)`` tuples for each object that reached a
+    terminal state or timed out.
+    """
+
+    def __init__(self, msg, failures):
+        super(MultipleWaitStateException, self).__init__(msg)
+        self.failures = failures
+
+
+class BatchOperationException(CloudBridgeBaseException):
+    """
+    Thrown when a bulk operation such as ``create_many`` or ``delete_many``
+    fails for one or more items. Every item is still attempted, so the
+    ``results`` attribute contains the results of the items that succeeded
+    (e.g. the created objects), while the ``failures`` attribute contains a
+    list of ``(item, exception)`` tuples for each item that failed.
+    """
+
+    def __init__(self, msg, results, failures):
+        super(BatchOperationException, self).__init__(msg)
+        self.results = results
+        self.failures = failures
+
+
+class ObjectModifiedException(CloudBridgeBaseException):
+    """
+    Thrown when a bucket object's content changes while it is being read
+    with several ranged requests, e.g. by ``download_to_file()`` or a file
+    object returned by ``open()``. Reading on would mix the content of two
+    versions of the object.
+    """
+    pass
+
+
 class InvalidConfigurationException(CloudBridgeBaseException):
     """
     Marker interface for invalid launch configurations.
@@ -47,6 +85,16 @@ class ProviderConnectionException(CloudBridgeBaseException):
     pass
 
 
+class CircuitOpenException(ProviderConnectionException):
+    """
+    Thrown by the ``RetryMiddleware`` when calls to a service fail fast,
+    because the service's circuit breaker has opened after repeated
+    failures. Calls are let through again once the breaker's reset timeout
+    has passed.
+    """
+    pass
+
+
 class InvalidNameException(CloudBridgeBaseException):
     """
     Marker interface for any attempt to set an invalid name on
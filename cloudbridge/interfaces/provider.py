@@ -71,6 +71,60 @@ class CloudProvider(object):
         """
         pass
 
+    @abstractproperty
+    def parallel(self):
+        """
+        Returns an executor that runs calls on a bounded pool of worker
+        threads. Using the executor turns on the provider's thread-safe mode,
+        in which each thread creates its own SDK sessions and clients. The
+        number of worker threads can be set through the
+        ``cb_parallel_workers`` config value.
+
+        Example:
+
+        .. code-block:: python
+
+            volumes = provider.storage.volumes.list()
+            for _ in provider.parallel.map(lambda v: v.delete(), volumes):
+                pass
+
+            futures = [provider.parallel.submit(inst.reboot)
+                       for inst in instances]
+            for future in provider.parallel.as_completed(futures):
+                future.result()
+
+        :rtype: :class:`.ParallelExecutor`
+        :return:  An executor with ``map``, ``submit`` and ``as_completed``
+                  methods, in the style of :mod:`concurrent.futures`.
+        """
+        pass
+
+    @abstractproperty
+    def rate_limiter(self):
+        """
+        Returns the rate limiter that paces the requests this provider sends
+        to its cloud, with a token bucket per API family (e.g. EC2 describe
+        calls). It is shared by all threads and clones of the provider.
+
+        The limiter adapts to the cloud's throttling: when a request is
+        throttled (e.g. an EC2 ``RequestLimitExceeded`` error or an HTTP 429
+        response), the rate of its family is cut, and it then grows back
+        slowly while requests succeed. A ``Retry-After`` delay sent by the
+        cloud is also honoured. A fixed maximum rate can be set through the
+        ``cb_rate_limit`` config value.
+
+        Example:
+
+        .. code-block:: python
+
+            provider.parallel.map(lambda v: v.delete(), volumes)
+            print(provider.rate_limiter.rate('ec2.mutate'))
+
+        :rtype: :class:`.AdaptiveRateLimiter`
+        :return:  The provider's rate limiter.
+        """
+        pass
+
     @abstractmethod
     def clone(self, zone=None):
         """
@@ -78,6 +132,9 @@ class CloudProvider(object):
         used to clone the provider to use a different zone.
         As each cloudbridge provider is restricted to a particular zone,
         this is useful when performing cross-zonal operations.
+        Cloning is cheap: the clone shares credentials, SDK sessions and
+        connections with this provider, and only zone-specific state is
+        rebuilt. Middleware added to this provider is not carried over.
 
         Example:
 
@@ -126,6 +183,105 @@ class CloudProvider(object):
         """
         pass
 
+    @abstractmethod
+    def wait_for_all(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        """
+        Wait for a list of objects to each reach one of the desired target
+        states.
+
+        This is equivalent to calling ``wait_for`` on every object, but
+        objects are refreshed together on each polling round. Where the
+        provider supports it, objects of the same type are refreshed with a
+        single query (e.g. one ``describe_instances`` call on AWS), rather
+        than one query per object.
+
+        Example:
+
+        .. code-block:: python
+
+            instances = [provider.compute.instances.create(...)
+                         for _ in range(100)]
+            provider.wait_for_all(
+                instances, [InstanceState.RUNNING],
+                terminal_states=[InstanceState.ERROR])
+
+        :type resources: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :param resources: The objects to wait on.
+
+        :type target_states: ``list`` of states
+        :param target_states: The list of target states to wait for.
+
+        :type terminal_states: ``list`` of states
+        :param terminal_states: A list of terminal states after which an
+                                object will not transition into a target
+                                state. Such objects are no longer polled.
+
+        :type timeout: ``int``
+        :param timeout: The maximum length of time (in seconds) to wait for
+                        all objects. If no timeout is specified, the global
+                        default_wait_timeout defined in the provider config
+                        will apply.
+
+        :type interval: ``int``
+        :param interval: How frequently to poll the objects' states (in
+                         seconds). If no interval is specified, the global
+                         default_wait_interval defined in the provider config
+                         will apply.
+
+        :rtype: ``True``
+        :return: Returns ``True`` if all objects reached a target state. If
+                 any object reached a terminal state or the timeout expired,
+                 a ``MultipleWaitStateException`` is raised, whose
+                 ``failures`` attribute lists each failed object and its
+                 last known state.
+        """
+        pass
+
+    @abstractmethod
+    def watch(self, resource_types, interval=None, initial_events=False):
+        """
+        Polls the listings of the given resource types on a background
+        thread, and dispatches a ``provider.watch.<type>.created``,
+        ``.changed`` or ``.deleted`` event through the provider's middleware
+        for each resource that appeared, changed or disappeared between
+        polls. Resources are matched by ID, and compared by the mutable
+        fields of their type, such as the state, label and IPs of an
+        instance.
+
+        Example:
+
+        .. code-block:: python
+
+            def on_change(event_args, instance, changes):
+                print("Instance %s changed: %s" % (instance.id, changes))
+
+            provider.middleware.events.observe(
+                "provider.watch.instances.changed", 3000, on_change)
+            watcher = provider.watch(['instances', 'volumes'], interval=30)
+            ...
+            watcher.stop()
+
+        :type resource_types: ``list`` of ``str``
+        :param resource_types: The resource types to watch, such as
+                               ``instances``, ``volumes`` or ``networks``,
+                               or service paths such as
+                               ``networking.networks``.
+
+        :type interval: ``float``
+        :param interval: The number of seconds between polls. Defaults to
+                         60 seconds.
+
+        :type initial_events: ``bool``
+        :param initial_events: Whether the first poll dispatches a
+                               ``created`` event for every existing
+                               resource.
+
+        :rtype: :class:`.InventoryWatcher`
+        :return: The started watcher, whose ``stop()`` method stops polling.
+        """
+        pass
+
     @abstractmethod
     def has_service(self, service_type):
         """
@@ -104,10 +104,48 @@ class CloudResource(object):
         """
         pass
 
+    @abstractmethod
+    def to_dict(self, fields=None, resolve=False):
+        """
+        Returns a dictionary of the resource's serializable properties, with
+        values that can be converted to JSON. Related resources are
+        represented by their ids.
+
+        By default, only properties that are available locally are included,
+        so serializing a resource does not make any calls to the provider.
+        Properties that require a call to the provider (e.g. an instance's
+        ``vm_type``) are only included if ``resolve`` is ``True``.
+
+        Example:
+
+        .. code-block:: python
+
+            inst.to_dict()
+            # {'id': 'i-0e8c...', 'name': 'my-vm', 'state': 'running', ...}
+            inst.to_dict(fields=['id', 'state'])
+            # {'id': 'i-0e8c...', 'state': 'running'}
+
+        :type fields: ``list`` of ``str``
+        :param fields: The properties to include. Defaults to all of the
+                       resource's serializable properties.
+
+        :type resolve: ``bool``
+        :param resolve: Whether to include properties that require a call to
+                        the provider.
+
+        :rtype: ``dict``
+        :return: A dictionary of property names and values.
+        """
+        pass
+
     @abstractmethod
     def to_json(self):
         """
-        Returns a JSON representation of the CloudResource object.
+        Returns a JSON representation of the CloudResource object, with all
+        of its serializable properties. This is the same as calling
+        :meth:`to_dict` with ``resolve=True``, except that a VM firewall's
+        rules are included in full rather than by id. Use :meth:`to_dict`
+        to serialize resources without making calls to the provider.
         """
         pass
 
@@ -477,6 +515,32 @@ class ResultList(list):
     def data(self):
         pass
 
+    @abstractmethod
+    def iter_json_lines(self, fields=None, resolve=False):
+        """
+        Serializes each resource in this list as a line of JSON.
+
+        Example:
+
+        .. code-block:: python
+
+            with open('instances.jsonl', 'w') as f:
+                f.writelines(provider.compute.instances.list()
+                             .iter_json_lines())
+
+        :type fields: ``list`` of ``str``
+        :param fields: The properties to include. See
+                       :meth:`CloudResource.to_dict`.
+
+        :type resolve: ``bool``
+        :param resolve: Whether to include properties that require a call to
+                        the provider.
+
+        :rtype: ``iterator`` of ``str``
+        :return: An iterator of JSON strings, each terminated by a newline.
+        """
+        pass
+
 
 class InstanceState(object):
 
@@ -1467,6 +1531,16 @@ class AttachmentInfo(object):
         """
         pass
 
+    @abstractmethod
+    def to_dict(self):
+        """
+        Returns a dictionary of the attachment's instance id and device.
+
+        :rtype: ``dict``
+        :return: A dictionary with ``instance_id`` and ``device`` keys.
+        """
+        pass
+
 
 class VolumeState(object):
     """
@@ -2166,6 +2240,51 @@ class BucketObject(CloudResource):
         """
         pass
 
+    @abstractmethod
+    def open(self, mode='rb', block_size=None, readahead=None,
+             cache_size=None):
+        """
+        Returns a seekable, read-only file object over this object's
+        content, for readers that only need parts of it, e.g. the footer
+        and row groups of a Parquet file.
+
+        The file object is an :class:`io.RawIOBase` backed by ranged
+        requests. It fetches the content in blocks, which it keeps in a
+        least recently used cache. Sequential reads fetch ``readahead``
+        bytes ahead in a single request, and other reads only fetch the
+        blocks they touch. Besides the usual ``read``, ``readinto`` and
+        ``seek`` methods, it has a ``read_range(start, end)`` method, which
+        reads a range without moving the file position. Reads are pinned to
+        the version the object had when it was opened, and raise an
+        :class:`.ObjectModifiedException` once it has been overwritten.
+
+        .. code-block:: python
+
+            with obj.open('rb') as f:
+                f.seek(-8, io.SEEK_END)
+                footer = f.read(8)
+
+        :type mode: ``str``
+        :param mode: Must be ``'rb'``.
+
+        :type block_size: ``int``
+        :param block_size: The size of the fetched and cached blocks in
+                           bytes. Defaults to 1 MiB.
+
+        :type readahead: ``int``
+        :param readahead: The number of bytes fetched ahead of sequential
+                          reads. Defaults to 8 MiB. ``0`` disables
+                          readahead.
+
+        :type cache_size: ``int``
+        :param cache_size: The maximum number of bytes of cached blocks.
+                           Defaults to 32 MiB.
+
+        :rtype: :class:`io.RawIOBase`
+        :return: A file object over this object's content.
+        """
+        pass
+
     @abstractmethod
     def save_content(self, target_stream):
         """
@@ -2173,6 +2292,35 @@ class BucketObject(CloudResource):
         """
         pass
 
+    @abstractmethod
+    def download_to_file(self, path, part_size=None, concurrency=None):
+        """
+        Download this object to a file, fetching byte ranges of the object
+        in parallel and writing each at its offset in the file.
+
+        The progress of the download is kept in a ``<path>.cbdownload``
+        file until it completes. If the download is interrupted, calling
+        this method again with the same path and part size only fetches the
+        remaining parts, provided the object has not been modified since.
+
+        Every range is requested on condition that the object still has
+        the version it had when the download started. If it is overwritten
+        during the download, an :class:`.ObjectModifiedException` is raised
+        rather than writing a mix of both versions.
+
+        :type path: ``str``
+        :param path: The file to write to.
+
+        :type part_size: ``int``
+        :param part_size: The size of each range in bytes. Defaults to 8 MB.
+
+        :type concurrency: ``int``
+        :param concurrency: The maximum number of ranges fetched at a time.
+                            Defaults to the provider's ``parallel_workers``
+                            setting.
+        """
+        pass
+
     @abstractmethod
     def upload(self, source_stream):
         """
@@ -2184,12 +2332,61 @@ class BucketObject(CloudResource):
         pass
 
     @abstractmethod
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, part_size=None, concurrency=None):
         """
         Store the contents of the file pointed by the "path" variable.
 
+        Files larger than the part size are uploaded in parts, several at a
+        time, using the cloud's multipart upload mechanism (S3 multipart
+        uploads, composed GCS objects, Azure blocks or Swift static large
+        object segments).
+
         :type path: ``str``
-        :param path: Absolute path to the file to be uploaded to S3.
+        :param path: Absolute path to the file to be uploaded.
+
+        :type part_size: ``int``
+        :param part_size: The size of each part in bytes. The size is raised
+                          where needed to meet the cloud's limits on the
+                          size and number of parts.
+
+        :type concurrency: ``int``
+        :param concurrency: The maximum number of parts uploaded at a time.
+                            Defaults to the provider's
+                            ``parallel_workers`` setting.
+        """
+        pass
+
+    @abstractmethod
+    def upload_stream(self, source, size_hint=None, part_size=None,
+                      concurrency=None):
+        """
+        Store the data read from a stream whose size need not be known in
+        advance, e.g. data produced by a generator.
+
+        The data is read a part at a time, and data larger than a part is
+        uploaded in parts, several at a time, like by
+        :meth:`upload_from_file`. At most ``concurrency`` parts are held in
+        memory.
+
+        :type source: ``bytes``, ``memoryview``, file object or iterable
+        :param source: The data, as bytes, a memoryview, a file object
+                       opened in binary mode or an iterable of byte chunks.
+                       Bytes and memoryviews are sliced into parts
+                       without being copied.
+
+        :type size_hint: ``int``
+        :param size_hint: The expected size of the data in bytes, if known.
+                          It is used to raise the part size as needed to
+                          keep large uploads within the cloud's maximum
+                          number of parts.
+
+        :type part_size: ``int``
+        :param part_size: The size of each part in bytes.
+
+        :type concurrency: ``int``
+        :param concurrency: The maximum number of parts uploaded at a time.
+                            Defaults to the provider's
+                            ``parallel_workers`` setting.
         """
         pass
 
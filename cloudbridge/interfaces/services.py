@@ -161,6 +161,33 @@ class InstanceService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several instances given their ids.
+
+        This is equivalent to calling ``get`` for each id, but uses the
+        provider's bulk lookup where one exists (e.g. ``describe_instances``
+        with up to 200 ids per call on AWS, or batch HTTP requests on GCP),
+        and concurrent requests otherwise.
+
+        Example:
+
+        .. code-block:: python
+
+            instances = provider.compute.instances.get_many(instance_ids)
+            missing = [inst_id for inst_id, inst in instances.items()
+                       if inst is None]
+
+        :type ids: ``list`` of ``str``
+        :param ids: The ids of the instances to look up.
+
+        :rtype: ``dict``
+        :return:  A mapping of each id to its :class:`.Instance`, or to
+                  ``None`` if the instance does not exist.
+        """
+        pass
+
     @abstractmethod
     def find(self, **kwargs):
         """
@@ -275,6 +302,64 @@ class InstanceService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, count, label, image, vm_type, subnet, key_pair=None,
+                    vm_firewalls=None, user_data=None, launch_config=None,
+                    **kwargs):
+        """
+        Creates several identical virtual machine instances at once.
+
+        Where the provider has a batch API, it is used to launch all
+        instances in a single request (e.g. ``run_instances`` on AWS or
+        ``instances.bulkInsert`` on GCP). Otherwise, the instances are
+        created concurrently through ``provider.parallel``. A failure to
+        create one instance does not abort the others.
+
+        Example:
+
+        .. code-block:: python
+
+            try:
+                instances = provider.compute.instances.create_many(
+                    10, 'cb-worker', image, vm_type, subnet)
+            except BatchOperationException as e:
+                instances = e.results
+                for _, error in e.failures:
+                    print("Failed to launch an instance: %s" % error)
+
+        :type  count: ``int``
+        :param count: The number of instances to create.
+
+        All other parameters are as for :meth:`create`.
+
+        :rtype: ``list`` of :class:`.Instance`
+        :return:  The newly created instances. If any instance could not be
+                  created, a ``BatchOperationException`` is raised instead,
+                  whose ``results`` attribute lists the created instances,
+                  and whose ``failures`` attribute lists an
+                  ``(index, exception)`` tuple for each instance that
+                  could not be created.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, instances):
+        """
+        Deletes several instances at once, using the provider's batch API
+        where one exists, or concurrent requests otherwise. A failure to
+        delete one instance does not abort the others.
+
+        :type instances: ``list`` of ``str`` or :class:`.Instance`
+        :param instances: The objects or IDs of the instances to delete.
+
+        :rtype: ``None``
+        :return: Returns once all deletions are requested. If any instance
+                 could not be deleted, a ``BatchOperationException`` is
+                 raised, whose ``failures`` attribute lists an
+                 ``(instance, exception)`` tuple for each of them.
+        """
+        pass
+
     def create_launch_config(self):
         """
         Creates a ``LaunchConfig`` object which can be used
@@ -303,6 +388,18 @@ class VolumeService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several volumes given their ids, using a bulk lookup where the
+        provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.Volume`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def find(self, **kwargs):
         """
@@ -350,6 +447,27 @@ class VolumeService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, count, label, size, snapshot=None,
+                    description=None):
+        """
+        Creates several identical volumes at once. A failure to create one
+        volume does not abort the others.
+
+        :type  count: ``int``
+        :param count: The number of volumes to create.
+
+        All other parameters are as for :meth:`create`.
+
+        :rtype: ``list`` of :class:`.Volume`
+        :return: The newly created volumes. If any volume could not be
+                 created, a ``BatchOperationException`` is raised instead,
+                 whose ``results`` attribute lists the created volumes, and
+                 whose ``failures`` attribute lists an ``(index, exception)``
+                 tuple for each volume that could not be created.
+        """
+        pass
+
     def delete(self, volume):
         """
         Delete an existing volume.
@@ -359,6 +477,23 @@ class VolumeService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def delete_many(self, volumes):
+        """
+        Deletes several volumes at once. A failure to delete one volume does
+        not abort the others.
+
+        :type volumes: ``list`` of ``str`` or :class:`.Volume`
+        :param volumes: The objects or IDs of the volumes to delete.
+
+        :rtype: ``None``
+        :return: Returns once all deletions are requested. If any volume
+                 could not be deleted, a ``BatchOperationException`` is
+                 raised, whose ``failures`` attribute lists a
+                 ``(volume, exception)`` tuple for each of them.
+        """
+        pass
+
 
 class SnapshotService(PageableObjectMixin, CloudService):
     """
@@ -376,6 +511,18 @@ class SnapshotService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several snapshots given their ids, using a bulk lookup where
+        the provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.Snapshot`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def find(self, **kwargs):
         """
@@ -419,6 +566,31 @@ class SnapshotService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, label, volumes, description=None):
+        """
+        Creates a snapshot of each of several volumes at once. A failure to
+        snapshot one volume does not abort the others.
+
+        :type  label: ``str``
+        :param label: The label for the snapshots.
+
+        :type  volumes: ``list`` of ``str`` or ``Volume``
+        :param volumes: The volumes to create a snapshot of.
+
+        :type  description: ``str``
+        :param description: An optional description for the snapshots.
+
+        :rtype: ``list`` of :class:`.Snapshot`
+        :return: The newly created snapshots, in the order of ``volumes``.
+                 If any snapshot could not be created, a
+                 ``BatchOperationException`` is raised instead, whose
+                 ``results`` attribute lists the created snapshots, and whose
+                 ``failures`` attribute lists a ``(volume, exception)`` tuple
+                 for each volume that could not be snapshotted.
+        """
+        pass
+
     def delete(self, snapshot):
         """
         Delete an existing snapshot.
@@ -428,6 +600,23 @@ class SnapshotService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def delete_many(self, snapshots):
+        """
+        Deletes several snapshots at once. A failure to delete one snapshot
+        does not abort the others.
+
+        :type snapshots: ``list`` of ``str`` or :class:`.Snapshot`
+        :param snapshots: The objects or IDs of the snapshots to delete.
+
+        :rtype: ``None``
+        :return: Returns once all deletions are requested. If any snapshot
+                 could not be deleted, a ``BatchOperationException`` is
+                 raised, whose ``failures`` attribute lists a
+                 ``(snapshot, exception)`` tuple for each of them.
+        """
+        pass
+
 
 class StorageService(CloudService):
 
@@ -523,6 +712,18 @@ class ImageService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several images given their ids, using a bulk lookup where the
+        provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.MachineImage`, or to
+                 ``None`` if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def find(self, **kwargs):
         """
@@ -635,6 +836,18 @@ class NetworkService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several networks given their ids, using a bulk lookup where the
+        provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.Network`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def list(self, limit=None, marker=None):
         """
@@ -733,6 +946,18 @@ class SubnetService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several subnets given their ids, using a bulk lookup where the
+        provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.Subnet`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     # pylint:disable=arguments-differ
     def list(self, network=None, limit=None, marker=None):
@@ -824,6 +1049,18 @@ class RouterService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several routers given their ids, using a bulk lookup where the
+        provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.Router`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def list(self, limit=None, marker=None):
         """
@@ -925,6 +1162,18 @@ class DnsZoneService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several DNS zones given their ids, using a bulk lookup where
+        the provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.DnsZone`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def list(self, limit=None, marker=None):
         """
@@ -1058,6 +1307,18 @@ class BucketService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several buckets given their ids, using a bulk lookup where the
+        provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.Bucket`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def find(self, **kwargs):
         """
@@ -1319,6 +1580,18 @@ class KeyPairService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several key pairs given their ids, using a bulk lookup where
+        the provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.KeyPair`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def list(self, limit=None, marker=None):
         """
@@ -1402,6 +1675,18 @@ class VMFirewallService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several VM firewalls given their ids, using a bulk lookup where
+        the provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.VMFirewall`, or to
+                 ``None`` if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def list(self, limit=None, marker=None):
         """
@@ -1632,6 +1917,18 @@ class VMTypeService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several VM types given their ids, using a bulk lookup where the
+        provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.VMType`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def list(self, limit=None, marker=None):
         """
@@ -1685,6 +1982,18 @@ class RegionService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        """
+        Returns several regions given their ids, using a bulk lookup where the
+        provider supports one. See :meth:`.InstanceService.get_many`.
+
+        :rtype: ``dict``
+        :return: A mapping of each id to its :class:`.Region`, or to ``None``
+                 if it does not exist.
+        """
+        pass
+
     @abstractmethod
     def list(self, limit=None, marker=None):
         """
@@ -1827,6 +2136,28 @@ class FloatingIPService(CloudService):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, gateway, count):
+        """
+        Allocate several floating IP addresses at once. A failure to
+        allocate one address does not abort the others.
+
+        :type gateway: ``Gateway``
+        :param gateway: The gateway to which the Floating IPs should be
+                        attached
+
+        :type count: ``int``
+        :param count: The number of addresses to allocate.
+
+        :rtype: ``list`` of :class:`.FloatingIP`
+        :return:  The allocated FloatingIP objects. If any address could not
+                  be allocated, a ``BatchOperationException`` is raised
+                  instead, whose ``results`` attribute lists the allocated
+                  addresses, and whose ``failures`` attribute lists an
+                  ``(index, exception)`` tuple for each failed allocation.
+        """
+        pass
+
     @abstractmethod
     def delete(self, gateway, fip):
         """
@@ -1839,3 +2170,23 @@ class FloatingIPService(CloudService):
         :param fip: The FloatingIP to be deleted.
         """
         pass
+
+    @abstractmethod
+    def delete_many(self, gateway, fips):
+        """
+        Delete several FloatingIPs at once. A failure to delete one address
+        does not abort the others.
+
+        :type gateway: ``Gateway``
+        :param gateway: The gateway to which the Floating IPs are attached
+
+        :type fips: ``list`` of ``str`` or :class:`.FloatingIP`
+        :param fips: The FloatingIPs to be deleted.
+
+        :rtype: ``None``
+        :return: Returns once all deletions are requested. If any address
+                 could not be deleted, a ``BatchOperationException`` is
+                 raised, whose ``failures`` attribute lists a
+                 ``(fip, exception)`` tuple for each of them.
+        """
+        pass
@@ -171,6 +171,20 @@ class FloatingIPSubService(PageableObjectMixin):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, count):
+        """
+        Allocate several floating IP addresses at once.
+        See :meth:`.FloatingIPService.create_many`.
+
+        :type count: ``int``
+        :param count: The number of addresses to allocate.
+
+        :rtype: ``list`` of :class:`.FloatingIP`
+        :return:  The allocated FloatingIP objects
+        """
+        pass
+
     @abstractmethod
     def delete(self, fip_id):
         """
@@ -181,6 +195,17 @@ class FloatingIPSubService(PageableObjectMixin):
         """
         pass
 
+    @abstractmethod
+    def delete_many(self, fips):
+        """
+        Delete several FloatingIPs at once.
+        See :meth:`.FloatingIPService.delete_many`.
+
+        :type fips: ``list`` of ``str`` or :class:`.FloatingIP`
+        :param fips: The FloatingIPs or their IDs to be deleted.
+        """
+        pass
+
 
 class VMFirewallRuleSubService(PageableObjectMixin):
     """
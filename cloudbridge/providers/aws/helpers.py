@@ -1,18 +1,40 @@
 """A set of AWS-specific helper methods used by the framework."""
+import io
 import logging
 
 from boto3.resources.params import create_request_parameters
 
 from botocore import xform_name
 from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
 from botocore.utils import merge_dicts
 
+import cloudbridge.base.helpers as cb_helpers
 from cloudbridge.base.resources import ClientPagedResultList
 from cloudbridge.base.resources import ServerPagedResultList
 
 
 log = logging.getLogger(__name__)
 
+# Error codes with which AWS services report that requests were throttled
+THROTTLING_ERROR_CODES = ('Throttling', 'ThrottlingException',
+                          'ThrottledException', 'RequestThrottled',
+                          'RequestThrottledException',
+                          'TooManyRequestsException', 'RequestLimitExceeded',
+                          'EC2ThrottledException', 'SlowDown',
+                          'PriorRequestNotComplete')
+
+
+def is_client_error(e):
+    return isinstance(e, ClientError)
+
+
+# Resources that were just created may take a while to become visible to
+# other calls, e.g. tagging, so these retries keep waiting at least 5
+# seconds between attempts
+retry_until_visible = cb_helpers.retry(is_client_error, min_delay=5,
+                                       base_delay=5)
+
 
 def trim_empty_params(params_dict):
     """
@@ -35,6 +57,46 @@ def trim_empty_params(params_dict):
     return {k: v for k, v in params_dict.items() if v is not None}
 
 
+# Error codes with which AWS services report failures that may not recur
+TRANSIENT_ERROR_CODES = ('InternalError', 'InternalFailure',
+                         'ServiceUnavailable', 'Unavailable',
+                         'RequestTimeout', 'RequestTimeoutException')
+
+
+def rate_limit_family(event_name):
+    """
+    Returns the API family of the request that a boto event is emitted for.
+    EC2 throttles describe calls separately from other calls, so these are
+    in separate families.
+
+    e.g. Given ``before-send.ec2.DescribeInstances``
+    returns ``ec2.describe``
+    """
+    _, service, operation = (event_name.split('.', 2) + ['', ''])[:3]
+    if operation.startswith(('Describe', 'List', 'Get', 'Head')):
+        return service + '.describe'
+    return service + '.mutate'
+
+
+def buffer_streaming_body(parsed_response):
+    """
+    Reads the streaming body of a parsed response (e.g. the ``Body`` of an
+    S3 ``GetObject`` response) into memory, and replaces it with a stream
+    over the same content, so that the caller can still read it.
+
+    :rtype: ``bytes``
+    :return: The content of the body, which is empty if the response has
+             no streaming body.
+    """
+    for key, value in (parsed_response or {}).items():
+        if isinstance(value, StreamingBody):
+            content = value.read()
+            parsed_response[key] = StreamingBody(io.BytesIO(content),
+                                                 len(content))
+            return content
+    return b''
+
+
 def find_tag_value(tags, key):
     """
     Finds the value associated with a given key from a list of AWS tags.
@@ -53,13 +115,61 @@ def find_tag_value(tags, key):
     return None
 
 
+def bulk_reload(client, operation, id_filter, result_path, id_key,
+                boto_objs, chunk_size=200):
+    """
+    Reloads a list of boto resources with one describe call per chunk of
+    ids, instead of one call per resource. The response data is stored on
+    each resource, exactly as ``resource.load()`` would have done.
+
+    :type client: :class:`botocore.client.BaseClient`
+    :param client: The boto client to use (e.g. ``ec2_conn.meta.client``)
+
+    :type operation: ``str``
+    :param operation: The paginated describe operation to invoke
+                      (e.g. ``describe_instances``)
+
+    :type id_filter: ``str``
+    :param id_filter: Name of the filter that matches resource ids
+                      (e.g. ``instance-id``)
+
+    :type result_path: ``str``
+    :param result_path: JMESPath expression selecting resource descriptions
+                        from a response (e.g. ``Reservations[].Instances[]``)
+
+    :type id_key: ``str``
+    :param id_key: Key of the resource id in a resource description
+                   (e.g. ``InstanceId``)
+
+    :rtype: ``set``
+    :return: The ids of the resources that were found.
+    """
+    by_id = {}
+    for obj in boto_objs:
+        by_id.setdefault(obj.id, []).append(obj)
+    ids = list(by_id)
+    found = set()
+    paginator = client.get_paginator(operation)
+    for i in range(0, len(ids), chunk_size):
+        pages = paginator.paginate(
+            Filters=[{'Name': id_filter, 'Values': ids[i:i + chunk_size]}])
+        for item in pages.search(result_path):
+            for obj in by_id.get(item.get(id_key), []):
+                obj.meta.data = item
+                found.add(obj.id)
+    log.debug("Reloaded %s of %s resources with %s", len(found), len(ids),
+              operation)
+    return found
+
+
 class BotoGenericService(object):
     """
     Generic implementation of a Boto3 AWS service. Uses Boto3
     resource, collection and paging support to implement
     basic cloudbridge methods.
     """
-    def __init__(self, provider, cb_resource, boto_conn, boto_collection_name):
+    def __init__(self, provider, cb_resource, boto_conn_name,
+                 boto_collection_name):
         """
         :type provider: :class:`AWSCloudProvider`
         :param provider: CloudBridge AWS provider to use
@@ -67,9 +177,12 @@ class BotoGenericService(object):
         :type cb_resource: :class:`CloudResource`
         :param cb_resource: CloudBridge Resource class to wrap results in
 
-        :type boto_conn: :class:`Boto3.Resource`
-        :param boto_conn: Boto top level service resource (e.g. EC2, S3)
-                          connection.
+        :type boto_conn_name: ``str``
+        :param boto_conn_name: Name of the provider property holding the Boto
+                               top level service resource (e.g. ec2_conn).
+                               The connection is looked up on each use, so
+                               that each thread uses its own connection in
+                               thread-safe mode.
 
         :type boto_collection_name: ``str``
         :param boto_collection_name: Boto collection name that corresponds
@@ -77,27 +190,46 @@ class BotoGenericService(object):
         """
         self.provider = provider
         self.cb_resource = cb_resource
-        self.boto_conn = boto_conn
-        self.boto_collection_model = self._infer_collection_model(
-            boto_conn, boto_collection_name)
+        self._boto_conn_name = boto_conn_name
+        self._boto_collection_name = boto_collection_name
+        boto_conn = self.boto_conn
+        # Model introspection is the same for every provider sharing a
+        # connection, so it is cached by the provider and its clones.
+        cache_key = (boto_conn.meta.service_name, boto_collection_name)
+        models = provider.boto_model_cache.get(cache_key)
+        if not models:
+            collection_model = self._infer_collection_model(
+                boto_conn, boto_collection_name)
+            models = (collection_model, self._infer_boto_resource_name(
+                boto_conn, collection_model))
+            provider.boto_model_cache[cache_key] = models
+        self.boto_collection_model, self._boto_resource_name = models
+
+    @property
+    def boto_conn(self):
+        return getattr(self.provider, self._boto_conn_name)
+
+    @property
+    def boto_collection(self):
         # Perform an empty filter to convert to a ResourceCollection
-        self.boto_collection = (getattr(self.boto_conn, boto_collection_name)
-                                .filter())
-        self.boto_resource = self._infer_boto_resource(
-            boto_conn, self.boto_collection_model)
+        return getattr(self.boto_conn, self._boto_collection_name).filter()
+
+    @property
+    def boto_resource(self):
+        return getattr(self.boto_conn, self._boto_resource_name)
 
     def _infer_collection_model(self, conn, collection_name):
         log.debug("Retrieving boto model for collection: %s", collection_name)
         return next(col for col in conn.meta.resource_model.collections
                     if col.name == collection_name)
 
-    def _infer_boto_resource(self, conn, collection_model):
+    def _infer_boto_resource_name(self, conn, collection_model):
         log.debug("Retrieving resource model for collection: %s",
                   collection_model.name)
         resource_model = next(
             sr for sr in conn.meta.resource_model.subresources
             if sr.resource.model.name == collection_model.resource.model.name)
-        return getattr(self.boto_conn, resource_model.name)
+        return resource_model.name
 
     def get_raw(self, resource_id):
         """
@@ -139,6 +271,34 @@ class BotoGenericService(object):
         else:
             return None
 
+    def get_many(self, resource_ids, id_filter, chunk_size=200):
+        """
+        Returns several resources, with one describe call per chunk of ids.
+
+        :type resource_ids: ``list`` of ``str``
+        :param resource_ids: IDs of the resources to fetch
+
+        :type id_filter: ``str``
+        :param id_filter: Name of the filter that matches resource ids
+                          (e.g. ``instance-id``)
+
+        :rtype: ``dict``
+        :return: A map of each id to its CloudBridge wrapped resource, or to
+                 ``None`` if the resource was not found.
+        """
+        resource_ids = list(dict.fromkeys(resource_ids))
+        found = {}
+        for i in range(0, len(resource_ids), chunk_size):
+            collection = self.boto_collection.filter(Filters=[
+                {'Name': id_filter,
+                 'Values': resource_ids[i:i + chunk_size]}])
+            for obj in collection:
+                res = self.cb_resource(self.provider, obj)
+                found[res.id] = res
+        log.debug("Found %s of %s %s", len(found), len(resource_ids),
+                  self.boto_collection_model.name)
+        return {res_id: found.get(res_id) for res_id in resource_ids}
+
     def _get_list_operation(self):
         """
         This function discovers the list operation for a particular resource
@@ -253,13 +413,37 @@ class BotoGenericService(object):
         :param filters: A list of filters, where the dict key is the filter
             name and the value is the value to filter by.
         """
+        return self.list(limit=limit, marker=marker,
+                         collection=self._filter(filters, **kwargs))
+
+    def find_matching(self, query, filters, **kwargs):
+        """
+        Return the resources that match a set of filters and the predicates
+        of a :class:`.FindQuery` that could not be pushed down into them.
+
+        :type query: :class:`.FindQuery`
+        :param query: The query whose pushed down predicates ``filters``
+            was built from.
+
+        :type filters: A ``dict`` of filters
+        :param filters: A list of filters, as for :meth:`find`.
+        """
+        if not query.client_side:
+            return self.find(filters, **kwargs)
+        # Every filtered resource must be matched on the client, so all
+        # pages are fetched rather than the first
+        results = [self.cb_resource(self.provider, obj)
+                   for obj in self._filter(filters, **kwargs)]
+        return ClientPagedResultList(self.provider, query.match(results))
+
+    def _filter(self, filters, **kwargs):
         boto_filters = [{'Name': key, 'Values': [value]}
                         for key, value in filters.items()]
         collection = self.boto_collection
         collection = collection.filter(Filters=boto_filters)
         if kwargs:
             collection = collection.filter(**kwargs)
-        return self.list(limit=limit, marker=marker, collection=collection)
+        return collection
 
     def create(self, boto_method, **kwargs):
         """
@@ -312,8 +496,7 @@ class BotoEC2Service(BotoGenericService):
                                     to the CloudBridge resource (e.g. key_pair)
         """
         super(BotoEC2Service, self).__init__(
-            provider, cb_resource, provider.ec2_conn,
-            boto_collection_name)
+            provider, cb_resource, 'ec2_conn', boto_collection_name)
 
 
 class BotoS3Service(BotoGenericService):
@@ -334,5 +517,4 @@ class BotoS3Service(BotoGenericService):
                                     to the CloudBridge resource (e.g. key_pair)
         """
         super(BotoS3Service, self).__init__(
-            provider, cb_resource, provider.s3_conn,
-            boto_collection_name)
+            provider, cb_resource, 's3_conn', boto_collection_name)
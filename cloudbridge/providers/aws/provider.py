@@ -1,13 +1,29 @@
 """Provider implementation based on boto library for AWS-compatible clouds."""
 import logging
+import threading
+import timeit
 
 import boto3
 
+from botocore import UNSIGNED
+from botocore.awsrequest import AWSResponse
 from botocore.client import Config
+from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
+from botocore.exceptions import HTTPClientError
 
 from cloudbridge.base import BaseCloudProvider
 from cloudbridge.base.helpers import get_env
+from cloudbridge.base.helpers import parse_retry_after
 
+from .helpers import THROTTLING_ERROR_CODES
+from .helpers import TRANSIENT_ERROR_CODES
+from .helpers import buffer_streaming_body
+from .helpers import bulk_reload
+from .helpers import rate_limit_family
+from .resources import AWSInstance
+from .resources import AWSSnapshot
+from .resources import AWSVolume
 from .services import AWSComputeService
 from .services import AWSDnsService
 from .services import AWSNetworkingService
@@ -22,6 +38,18 @@ class AWSCloudProvider(BaseCloudProvider):
     '''AWS cloud provider interface'''
     PROVIDER_ID = 'aws'
 
+    # Maps resources that can be refreshed in bulk to the boto attribute
+    # holding the wrapped resource, and the describe operation, id filter,
+    # result path and id key used to reload them.
+    BULK_REFRESH_MAP = {
+        AWSInstance: ('_ec2_instance', 'describe_instances', 'instance-id',
+                      'Reservations[].Instances[]', 'InstanceId'),
+        AWSVolume: ('_volume', 'describe_volumes', 'volume-id',
+                    'Volumes[]', 'VolumeId'),
+        AWSSnapshot: ('_snapshot', 'describe_snapshots', 'snapshot-id',
+                      'Snapshots[]', 'SnapshotId')
+    }
+
     def __init__(self, config):
         super(AWSCloudProvider, self).__init__(config)
 
@@ -52,13 +80,16 @@ class AWSCloudProvider(BaseCloudProvider):
                     's3_signature_version', 's3v4'))
         }
 
-        # service connections, lazily initialized
-        self._session = None
-        self._ec2_conn = None
-        self._vpc_conn = None
-        self._s3_conn = None
+        # Handlers registered with every boto session, e.g. for tracing
+        self._session_event_handlers = [
+            ('before-send', self._rate_limit_request),
+            ('needs-retry', self._record_request_throttling)]
+        # boto resource models, looked up once and shared with clones
+        self.boto_model_cache = {}
+
+        self._initialize_services()
 
-        # Initialize provider services
+    def _initialize_services(self):
         self._compute = AWSComputeService(self)
         self._networking = AWSNetworkingService(self)
         self._security = AWSSecurityService(self)
@@ -68,24 +99,19 @@ class AWSCloudProvider(BaseCloudProvider):
     @property
     def session(self):
         '''Get a low-level session object or create one if needed'''
-        if not self._session:
-            if self.config.debug_mode:
-                boto3.set_stream_logger(level=log.DEBUG)
-            self._session = boto3.session.Session(
-                region_name=self.region_name, **self.session_cfg)
-        return self._session
+        return self._sdk_clients.get('session', self._connect_session)
 
     @property
     def ec2_conn(self):
-        if not self._ec2_conn:
-            self._ec2_conn = self._connect_ec2()
-        return self._ec2_conn
+        return self._sdk_clients.get('ec2', self._connect_ec2)
 
     @property
     def s3_conn(self):
-        if not self._s3_conn:
-            self._s3_conn = self._connect_s3()
-        return self._s3_conn
+        return self._sdk_clients.get('s3', self._connect_s3)
+
+    @property
+    def route53_conn(self):
+        return self._sdk_clients.get('route53', self._connect_route53)
 
     @property
     def compute(self):
@@ -107,6 +133,137 @@ class AWSCloudProvider(BaseCloudProvider):
     def dns(self):
         return self._dns
 
+    def _refresh_all(self, resources):
+        bulk_cfg = self.BULK_REFRESH_MAP.get(type(resources[0]))
+        if not bulk_cfg:
+            return super(AWSCloudProvider, self)._refresh_all(resources)
+        boto_attr, operation, id_filter, result_path, id_key = bulk_cfg
+        found = bulk_reload(self.ec2_conn.meta.client, operation, id_filter,
+                            result_path, id_key,
+                            [getattr(res, boto_attr) for res in resources])
+        for res in resources:
+            # pylint:disable=protected-access
+            res._unknown_state = getattr(res, boto_attr).id not in found
+
+    def _classify_error(self, error):
+        if isinstance(error, ClientError):
+            code = error.response.get('Error', {}).get('Code')
+            status = error.response.get('ResponseMetadata', {}).get(
+                'HTTPStatusCode') or 0
+            if code in THROTTLING_ERROR_CODES or status == 429:
+                return 'throttled'
+            if code in TRANSIENT_ERROR_CODES or status >= 500:
+                return 'transient'
+            return None
+        if isinstance(error, (BotoConnectionError, HTTPClientError)):
+            return 'transient'
+        return super(AWSCloudProvider, self)._classify_error(error)
+
+    def _trace_sdk_calls(self, tracer):
+        def before_call(model, context, **kwargs):
+            context['cb_trace_span'] = tracer.start_span(
+                "{0}.{1}".format(model.service_model.service_name,
+                                 model.name),
+                category=tracer.SDK_CATEGORY)
+
+        def after_call(context, exception=None, **kwargs):
+            span = context.pop('cb_trace_span', None)
+            if span:
+                tracer.end_span(span, error=exception)
+
+        handlers = [('before-call', before_call),
+                    ('after-call', after_call),
+                    ('after-call-error', after_call)]
+        self._register_session_event_handlers(handlers)
+
+    def _use_cassette(self, cassette):
+        self._sdk_cassette = cassette
+        if cassette.recording:
+            # before-send and response-received are emitted on the thread
+            # sending the request, once for each attempt
+            pending = threading.local()
+
+            def before_send(request, **kwargs):
+                pending.request = (request.method, request.url,
+                                   request.body, timeit.default_timer())
+
+            def response_received(response_dict=None, parsed_response=None,
+                                  **kwargs):
+                sent, pending.request = getattr(pending, 'request', None), None
+                if not sent or response_dict is None:
+                    return
+                method, url, body, start = sent
+                content = response_dict['body']
+                if not isinstance(content, bytes):
+                    content = buffer_streaming_body(parsed_response)
+                cassette.record(method, url, body,
+                                response_dict['status_code'], None,
+                                response_dict['headers'], content,
+                                timeit.default_timer() - start)
+
+            handlers = [('before-send', before_send),
+                        ('response-received', response_received)]
+        else:
+            def choose_signer(**kwargs):
+                # Replayed requests need no credentials
+                return UNSIGNED
+
+            def replay_request(request, **kwargs):
+                raw = cassette.play(request.method, request.url,
+                                    request.body)
+                return AWSResponse(request.url, raw.status, raw.headers, raw)
+
+            handlers = [('choose-signer', choose_signer),
+                        ('before-send', replay_request)]
+        self._register_session_event_handlers(handlers)
+
+    def _register_session_event_handlers(self, handlers):
+        # Sessions created later, e.g. by other threads in thread-safe mode,
+        # register the handlers when they are created. Clients copy the
+        # session's handlers when they are created, so register with the
+        # current thread's existing clients as well.
+        self._session_event_handlers.extend(handlers)
+        emitters = [self.session.events]
+        emitters.extend(conn.meta.client.meta.events for conn in
+                        (self._sdk_clients.peek('ec2'),
+                         self._sdk_clients.peek('s3')) if conn)
+        route53_conn = self._sdk_clients.peek('route53')
+        if route53_conn:
+            emitters.append(route53_conn.meta.events)
+        for events in emitters:
+            for event_name, handler in handlers:
+                events.register(event_name, handler)
+
+    def _rate_limit_request(self, event_name, **kwargs):
+        # Emitted before each attempt, including boto's own retries
+        self.rate_limiter.acquire(rate_limit_family(event_name))
+
+    def _record_request_throttling(self, event_name, response=None,
+                                   **kwargs):
+        # Emitted after each attempt. Returning None leaves the decision
+        # whether to retry to boto's own retry handler.
+        if response is None:
+            return None
+        http_response, parsed = response
+        family = rate_limit_family(event_name)
+        if (parsed.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES or
+                http_response.status_code == 429):
+            self.rate_limiter.record_throttle(
+                family,
+                parse_retry_after(http_response.headers.get('Retry-After')))
+        else:
+            self.rate_limiter.record_success(family)
+        return None
+
+    def _connect_session(self):
+        if self.config.debug_mode:
+            boto3.set_stream_logger(level=log.DEBUG)
+        session = boto3.session.Session(
+            region_name=self.region_name, **self.session_cfg)
+        for event_name, handler in self._session_event_handlers:
+            session.events.register(event_name, handler)
+        return session
+
     def _connect_ec2(self):
         """
         Get a boto ec2 connection object.
@@ -122,3 +279,7 @@ class AWSCloudProvider(BaseCloudProvider):
         '''Get an S3 resource object'''
         return self.session.resource(
             's3', region_name=self.region_name, **self.s3_cfg)
+
+    def _connect_route53(self):
+        '''Get a Route53 client object'''
+        return self.session.client('route53', region_name=self.region_name)
@@ -2,13 +2,16 @@
 DataTypes used by this provider
 """
 import hashlib
-import inspect
 import logging
+import os
+
+from boto3.s3.transfer import TransferConfig
 
 from botocore.exceptions import ClientError
 
 import tenacity
 
+import cloudbridge.base.helpers as cb_helpers
 from cloudbridge.base.resources import BaseAttachmentInfo
 from cloudbridge.base.resources import BaseBucket
 from cloudbridge.base.resources import BaseBucketObject
@@ -30,6 +33,7 @@ from cloudbridge.base.resources import BaseVMFirewall
 from cloudbridge.base.resources import BaseVMFirewallRule
 from cloudbridge.base.resources import BaseVMType
 from cloudbridge.base.resources import BaseVolume
+from cloudbridge.base.resources import StreamingUploadSource
 from cloudbridge.interfaces.resources import GatewayState
 from cloudbridge.interfaces.resources import InstanceState
 from cloudbridge.interfaces.resources import MachineImageState
@@ -39,6 +43,7 @@ from cloudbridge.interfaces.resources import SnapshotState
 from cloudbridge.interfaces.resources import SubnetState
 from cloudbridge.interfaces.resources import VolumeState
 from .helpers import find_tag_value
+from .helpers import retry_until_visible
 from .helpers import trim_empty_params
 from .subservices import AWSBucketObjectSubService
 from .subservices import AWSDnsRecordSubService
@@ -88,10 +93,7 @@ class AWSMachineImage(BaseMachineImage):
         """
         return find_tag_value(self._ec2_image.tags, 'Name')
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _set_label(self, value):
         self._ec2_image.create_tags(Tags=[{'Key': 'Name',
                                            'Value': value or ""}])
@@ -268,10 +270,7 @@ class AWSInstance(BaseInstance):
         """
         return find_tag_value(self._ec2_instance.tags, 'Name')
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _set_label(self, value):
         self._ec2_instance.create_tags(Tags=[{'Key': 'Name',
                                               'Value': value or ""}])
@@ -350,10 +349,10 @@ class AWSInstance(BaseInstance):
     def key_pair_id(self):
         return self._ec2_instance.key_name
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    # The image may take a while to become visible, so keep waiting at
+    # least 5 seconds between attempts
+    @cb_helpers.retry(lambda e: isinstance(e, ClientError),
+                      min_delay=5, base_delay=5, deadline=60)
     def _wait_for_image(self, image):
         self._provider.ec2_conn.meta.client.get_waiter('image_exists').wait(
             ImageIds=[image.id])
@@ -469,10 +468,7 @@ class AWSVolume(BaseVolume):
         except ClientError as e:
             log.warn("Cannot get label for volume {0}: {1}".format(self.id, e))
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _set_label(self, value):
         self._volume.create_tags(Tags=[{'Key': 'Name', 'Value': value or ""}])
 
@@ -609,10 +605,7 @@ class AWSSnapshot(BaseSnapshot):
         except ClientError as e:
             log.warn("Cannot get label for snap {0}: {1}".format(self.id, e))
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _set_label(self, value):
         self._snapshot.create_tags(Tags=[{'Key': 'Name',
                                           'Value': value or ""}])
@@ -700,10 +693,7 @@ class AWSVMFirewall(BaseVMFirewall):
         except ClientError:
             return None
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _set_label(self, value):
         self._vm_firewall.create_tags(Tags=[{'Key': 'Name',
                                              'Value': value or ""}])
@@ -738,15 +728,6 @@ class AWSVMFirewall(BaseVMFirewall):
     def refresh(self):
         self._vm_firewall.reload()
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not inspect.isroutine(a))
-        js = {k: v for (k, v) in attr if not k.startswith('_')}
-        json_rules = [r.to_json() for r in self.rules]
-        js['rules'] = json_rules
-        if js.get('network_id'):
-            js.pop('network_id')  # Omit for consistency across cloud providers
-        return js
-
 
 class AWSVMFirewallRule(BaseVMFirewallRule):
 
@@ -836,6 +817,11 @@ class AWSBucketObject(BaseBucketObject):
         def close(self):
             return self.body.close()
 
+    # S3 multipart upload limits
+    MIN_PART_SIZE = 5 * 1024 * 1024
+    MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+    MAX_PARTS = 10000
+
     def __init__(self, provider, obj):
         super(AWSBucketObject, self).__init__(provider)
         self._obj = obj
@@ -862,11 +848,48 @@ class AWSBucketObject(BaseBucketObject):
     def iter_content(self):
         return self.BucketObjIterator(self._obj.get().get('Body'))
 
+    def _content_version(self):
+        return self._obj.e_tag
+
+    def _read_range(self, start, end, version=None):
+        kwargs = {'IfMatch': version} if version else {}
+        # Use the provider's client rather than the object's, which belongs
+        # to the thread that fetched the object
+        try:
+            response = self._provider.s3_conn.meta.client.get_object(
+                Bucket=self._obj.bucket_name, Key=self.id,
+                Range="bytes={0}-{1}".format(start, end - 1), **kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'PreconditionFailed':
+                raise self._version_changed(e)
+            raise
+        return response['Body'].read()
+
     def upload(self, data):
         self._obj.put(Body=data)
 
-    def upload_from_file(self, path):
-        self._obj.upload_file(path)
+    def _transfer_config(self, part_size, concurrency):
+        return TransferConfig(
+            multipart_threshold=part_size, multipart_chunksize=part_size,
+            max_concurrency=(concurrency or
+                             self._provider.config.parallel_workers))
+
+    def upload_from_file(self, path, part_size=None, concurrency=None):
+        # boto3's transfer manager uploads the parts of a multipart upload
+        # on its own thread pool
+        part_size = self._get_part_size(os.path.getsize(path), part_size)
+        self._obj.upload_file(
+            path, Config=self._transfer_config(part_size, concurrency))
+
+    def upload_stream(self, source, size_hint=None, part_size=None,
+                      concurrency=None):
+        # The transfer manager reads streams that cannot seek a part at a
+        # time, and bounds the parts it buffers by the concurrency
+        part_size = self._get_part_size(size_hint or 0, part_size)
+        if not hasattr(source, 'read'):
+            source = StreamingUploadSource(source)
+        self._obj.upload_fileobj(
+            source, Config=self._transfer_config(part_size, concurrency))
 
     def delete(self):
         self._obj.delete()
@@ -957,10 +980,7 @@ class AWSNetwork(BaseNetwork):
     def label(self):
         return find_tag_value(self._vpc.tags, 'Name')
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _set_label(self, value):
         self._vpc.create_tags(Tags=[{'Key': 'Name', 'Value': value or ""}])
 
@@ -1006,10 +1026,7 @@ class AWSNetwork(BaseNetwork):
             # set the status to unknown
             self._unknown_state = True
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _wait_for_vpc(self):
         self._provider.ec2_conn.meta.client.get_waiter('vpc_available').wait(
             VpcIds=[self.id])
@@ -1047,10 +1064,7 @@ class AWSSubnet(BaseSubnet):
     def label(self):
         return find_tag_value(self._subnet.tags, 'Name')
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _set_label(self, value):
         self._subnet.create_tags(Tags=[{'Key': 'Name', 'Value': value or ""}])
 
@@ -1137,10 +1151,7 @@ class AWSRouter(BaseRouter):
     def label(self):
         return find_tag_value(self._route_table.tags, 'Name')
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception_type(ClientError),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    @retry_until_visible
     def _set_label(self, value):
         self._route_table.create_tags(Tags=[{'Key': 'Name',
                                              'Value': value or ""}])
@@ -6,8 +6,6 @@ import uuid
 
 from botocore.exceptions import ClientError
 
-import tenacity
-
 import cloudbridge.base.helpers as cb_helpers
 from cloudbridge.base.middleware import dispatch
 from cloudbridge.base.resources import ClientPagedResultList
@@ -40,6 +38,7 @@ from cloudbridge.interfaces.exceptions import \
     InvalidConfigurationException
 from cloudbridge.interfaces.exceptions import InvalidParamException
 from cloudbridge.interfaces.exceptions import InvalidValueException
+from cloudbridge.interfaces.exceptions import ProviderInternalException
 from cloudbridge.interfaces.resources import KeyPair
 from cloudbridge.interfaces.resources import MachineImage
 from cloudbridge.interfaces.resources import Network
@@ -51,6 +50,7 @@ from cloudbridge.interfaces.resources import Volume
 
 from .helpers import BotoEC2Service
 from .helpers import BotoS3Service
+from .helpers import retry_until_visible
 from .helpers import trim_empty_params
 from .resources import AWSBucket
 from .resources import AWSBucketObject
@@ -112,6 +112,11 @@ class AWSKeyPairService(BaseKeyPairService):
         log.debug("Getting Key Pair Service %s", key_pair_id)
         return self.svc.get(key_pair_id)
 
+    @dispatch(event="provider.security.key_pairs.get_many",
+              priority=BaseKeyPairService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'key-name')
+
     @dispatch(event="provider.security.key_pairs.list",
               priority=BaseKeyPairService.STANDARD_EVENT_PRIORITY)
     def list(self, limit=None, marker=None):
@@ -120,16 +125,11 @@ class AWSKeyPairService(BaseKeyPairService):
     @dispatch(event="provider.security.key_pairs.find",
               priority=BaseKeyPairService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        name = kwargs.pop('name', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'name'))
-
+        query = cb_helpers.FindQuery(['name'], kwargs)
+        name = query.push_down('name', wildcards=True)
         log.debug("Searching for Key Pair %s", name)
-        return self.svc.find(filters={'key-name': name})
+        return self.svc.find_matching(
+            query, filters={'key-name': name} if name else {})
 
     @dispatch(event="provider.security.key_pairs.create",
               priority=BaseKeyPairService.STANDARD_EVENT_PRIORITY)
@@ -174,6 +174,11 @@ class AWSVMFirewallService(BaseVMFirewallService):
         log.debug("Getting Firewall Service with the id: %s", vm_firewall_id)
         return self.svc.get(vm_firewall_id)
 
+    @dispatch(event="provider.security.vm_firewalls.get_many",
+              priority=BaseVMFirewallService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'group-id')
+
     @dispatch(event="provider.security.vm_firewalls.list",
               priority=BaseVMFirewallService.STANDARD_EVENT_PRIORITY)
     def list(self, limit=None, marker=None):
@@ -197,14 +202,11 @@ class AWSVMFirewallService(BaseVMFirewallService):
               priority=BaseVMFirewallService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
         # Filter by name or label
-        label = kwargs.pop('label', None)
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label', wildcards=True)
         log.debug("Searching for Firewall Service %s", label)
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-        return self.svc.find(filters={'tag:Name': label})
+        return self.svc.find_matching(
+            query, filters={'tag:Name': label} if label else {})
 
     @dispatch(event="provider.security.vm_firewalls.delete",
               priority=BaseVMFirewallService.STANDARD_EVENT_PRIORITY)
@@ -333,21 +335,21 @@ class AWSVolumeService(BaseVolumeService):
     def get(self, volume_id):
         return self.svc.get(volume_id)
 
+    @dispatch(event="provider.storage.volumes.get_many",
+              priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'volume-id')
+
     @dispatch(event="provider.storage.volumes.find",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        filters = {'availability-zone': self.provider.zone_name}
+        label = query.push_down('label', wildcards=True)
+        if label:
+            filters['tag:Name'] = label
         log.debug("Searching for AWS Volume Service %s", label)
-        return self.svc.find(
-            filters={'tag:Name': label,
-                     'availability-zone': self.provider.zone_name})
+        return self.svc.find_matching(query, filters=filters)
 
     @dispatch(event="provider.storage.volumes.list",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
@@ -396,21 +398,21 @@ class AWSSnapshotService(BaseSnapshotService):
     def get(self, snapshot_id):
         return self.svc.get(snapshot_id)
 
+    @dispatch(event="provider.storage.snapshots.get_many",
+              priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'snapshot-id')
+
     @dispatch(event="provider.storage.snapshots.find",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
         # Filter by description or label
-        label = kwargs.get('label', None)
-
-        obj_list = []
-        if label:
-            log.debug("Searching for AWS Snapshot with label %s", label)
-            obj_list.extend(self.svc.find(filters={'tag:Name': label},
-                                          OwnerIds=['self']))
-        else:
-            obj_list = list(self)
-        filters = ['label']
-        return cb_helpers.generic_find(filters, kwargs, obj_list)
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label', wildcards=True)
+        log.debug("Searching for AWS Snapshot with label %s", label)
+        return self.svc.find_matching(
+            query, filters={'tag:Name': label} if label else {},
+            OwnerIds=['self'])
 
     @dispatch(event="provider.storage.snapshots.list",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
@@ -557,12 +559,16 @@ class AWSBucketObjectService(BaseBucketObjectService):
                                      limit=limit, marker=marker)
 
     def find(self, bucket, **kwargs):
-        # pylint:disable=protected-access
-        obj_list = [AWSBucketObject(self.provider, o)
-                    for o in bucket._bucket.objects.all()]
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self.provider, list(matches),
+        query = cb_helpers.FindQuery(['name'], kwargs)
+        prefix = query.push_down_prefix('name')
+        if prefix:
+            # pylint:disable=protected-access
+            boto_objs = bucket._bucket.objects.filter(Prefix=prefix)
+        else:
+            # pylint:disable=protected-access
+            boto_objs = bucket._bucket.objects.all()
+        obj_list = [AWSBucketObject(self.provider, o) for o in boto_objs]
+        return ClientPagedResultList(self.provider, query.match(obj_list),
                                      limit=None, marker=None)
 
     def create(self, bucket, name):
@@ -609,6 +615,11 @@ class AWSImageService(BaseImageService):
         log.debug("Getting AWS Image Service with the id: %s", image_id)
         return self.svc.get(image_id)
 
+    @dispatch(event="provider.compute.images.get_many",
+              priority=BaseImageService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'image-id')
+
     def find(self, **kwargs):
         # Filter by name or label
         label = kwargs.pop('label', None)
@@ -737,11 +748,14 @@ class AWSInstanceService(BaseInstanceService):
     def create_launch_config(self):
         return AWSLaunchConfig(self.provider)
 
-    @dispatch(event="provider.compute.instances.create",
-              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
-    def create(self, label, image, vm_type, subnet,
-               key_pair=None, vm_firewalls=None, user_data=None,
-               launch_config=None, **kwargs):
+    def _run_instances(self, count, label, image, vm_type, subnet,
+                       key_pair=None, vm_firewalls=None, user_data=None,
+                       launch_config=None, **kwargs):
+        """
+        Launches up to ``count`` instances with a single ``run_instances``
+        call. EC2 launches as many instances as capacity allows, so fewer
+        instances than requested may be returned.
+        """
         AWSInstance.assert_valid_resource_label(label)
         image_id = image.id if isinstance(image, MachineImage) else image
         vm_size = vm_type.id if \
@@ -761,11 +775,11 @@ class AWSInstanceService(BaseInstanceService):
             self._resolve_launch_options(subnet, zone_name, vm_firewalls)
 
         placement = {'AvailabilityZone': zone_id} if zone_id else None
-        inst = self.svc.create(
+        return self.svc.create(
             'create_instances',
             ImageId=image_id,
             MinCount=1,
-            MaxCount=1,
+            MaxCount=count,
             KeyName=key_pair_name,
             SecurityGroupIds=vm_firewall_ids or None,
             UserData=str(user_data) or None,
@@ -775,44 +789,96 @@ class AWSInstanceService(BaseInstanceService):
             SubnetId=subnet_id,
             IamInstanceProfile=kwargs.pop('iam_instance_profile', None)
         )
+
+    @staticmethod
+    def _label_new_instance(inst, label):
+        # Wait until the resource exists
+        # pylint:disable=protected-access
+        inst._wait_till_exists()
+        # Tag the instance w/ the name
+        try:
+            inst.label = label
+        except Exception:
+            # It's possible for the label setter to fail, because EC2
+            # endpoints have a delay in syncing, and the instance may not
+            # yet be visible if a different endpoint is hit. To compensate,
+            # we retry in both the label setter, and raise here again just
+            # in case the label setter fails for any other reason.
+            inst.delete()
+            raise
+        return inst
+
+    @dispatch(event="provider.compute.instances.create",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def create(self, label, image, vm_type, subnet,
+               key_pair=None, vm_firewalls=None, user_data=None,
+               launch_config=None, **kwargs):
+        inst = self._run_instances(
+            1, label, image, vm_type, subnet, key_pair=key_pair,
+            vm_firewalls=vm_firewalls, user_data=user_data,
+            launch_config=launch_config, **kwargs)
         if inst and len(inst) == 1:
-            # Wait until the resource exists
-            # pylint:disable=protected-access
-            inst[0]._wait_till_exists()
-            # Tag the instance w/ the name
-            try:
-                inst[0].label = label
-            except Exception:
-                # It's possible for the label setter to fail, because EC2
-                # endpoints have a delay in syncing, and the instance may not
-                # yet be visible if a different endpoint is hit. To compensate,
-                # we retry in both the label setter, and raise here again just
-                # in case the label setter fails for any other reason.
-                inst[0].delete()
-                raise
-            return inst[0]
+            return self._label_new_instance(inst[0], label)
         raise ValueError(
             'Expected a single object response, got a list: %s' % inst)
 
+    @dispatch(event="provider.compute.instances.create_many",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def create_many(self, count, label, image, vm_type, subnet,
+                    key_pair=None, vm_firewalls=None, user_data=None,
+                    launch_config=None, **kwargs):
+        instances = []
+        error = None
+        # EC2 may launch fewer instances than requested, so keep requesting
+        # the remainder for as long as each call makes progress. An invalid
+        # request fails on the first call and is raised as-is.
+        while len(instances) < count:
+            try:
+                launched = self._run_instances(
+                    count - len(instances), label, image, vm_type, subnet,
+                    key_pair=key_pair, vm_firewalls=vm_firewalls,
+                    user_data=user_data, launch_config=launch_config,
+                    **kwargs)
+            except ClientError as e:
+                if not instances:
+                    raise
+                error = e
+                break
+            if not launched:
+                break
+            instances.extend(launched)
+        results = []
+        failures = []
+        for index, inst in enumerate(instances):
+            try:
+                results.append(self._label_new_instance(inst, label))
+            except Exception as e:
+                failures.append((index, e))
+        for index in range(len(instances), count):
+            failures.append((index, error or ProviderInternalException(
+                "EC2 launched only %d of %d requested instances" % (
+                    len(instances), count))))
+        return self._batch_result("Instance creation", results, failures)
+
     @dispatch(event="provider.compute.instances.get",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def get(self, instance_id):
         return self.svc.get(instance_id)
 
+    @dispatch(event="provider.compute.instances.get_many",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'instance-id')
+
     @dispatch(event="provider.compute.instances.find",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        return self.svc.find(
-            filters={'tag:Name': label,
-                     'availability-zone': self.provider.zone_name})
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        filters = {'availability-zone': self.provider.zone_name}
+        label = query.push_down('label', wildcards=True)
+        if label:
+            filters['tag:Name'] = label
+        return self.svc.find_matching(query, filters=filters)
 
     @dispatch(event="provider.compute.instances.list",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
@@ -830,6 +896,24 @@ class AWSInstanceService(BaseInstanceService):
             # pylint:disable=protected-access
             aws_inst._ec2_instance.terminate()
 
+    @dispatch(event="provider.compute.instances.delete_many",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def delete_many(self, instances):
+        instances = list(instances)
+        instance_ids = [inst.id if isinstance(inst, AWSInstance) else inst
+                        for inst in instances]
+        if not instance_ids:
+            return
+        try:
+            self.provider.ec2_conn.meta.client.terminate_instances(
+                InstanceIds=instance_ids)
+        except ClientError as e:
+            # EC2 rejects the whole request if any of the IDs is invalid or
+            # no longer exists, so delete one at a time to find out which
+            log.debug("Batch termination failed, terminating instances "
+                      "individually: %s", e)
+            super(AWSInstanceService, self).delete_many(instances)
+
 
 class AWSVMTypeService(BaseVMTypeService):
 
@@ -850,6 +934,28 @@ class AWSVMTypeService(BaseVMTypeService):
             else:
                 raise e
 
+    @dispatch(event="provider.compute.vm_types.get_many",
+              priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        ids = list(dict.fromkeys(ids))
+        client = self.provider.ec2_conn.meta.client
+        found = {}
+        try:
+            # describe_instance_types can get at most 100 types at once
+            for i in range(0, len(ids), 100):
+                for t in client.describe_instance_types(
+                        InstanceTypes=ids[i:i + 100]).get('InstanceTypes'):
+                    found[t['InstanceType']] = AWSVMType(self.provider, t)
+        except ClientError as e:
+            if 'InvalidInstanceType' in e.response.get('Error',
+                                                       {}).get('Code'):
+                # The whole request is rejected if any of the types is
+                # unknown, so look them up one at a time instead
+                return super(AWSVMTypeService, self).get_many(ids)
+            else:
+                raise e
+        return {vm_type: found.get(vm_type) for vm_type in ids}
+
     @dispatch(event="provider.compute.vm_types.list",
               priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
     def list(self, limit=None, marker=None):
@@ -962,6 +1068,11 @@ class AWSNetworkService(BaseNetworkService):
     def get(self, network_id):
         return self.svc.get(network_id)
 
+    @dispatch(event="provider.networking.networks.get_many",
+              priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'vpc-id')
+
     @dispatch(event="provider.networking.networks.list",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
     def list(self, limit=None, marker=None):
@@ -970,16 +1081,11 @@ class AWSNetworkService(BaseNetworkService):
     @dispatch(event="provider.networking.networks.find",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label', wildcards=True)
         log.debug("Searching for AWS Network Service %s", label)
-        return self.svc.find(filters={'tag:Name': label})
+        return self.svc.find_matching(
+            query, filters={'tag:Name': label} if label else {})
 
     @dispatch(event="provider.networking.networks.create",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
@@ -1038,6 +1144,11 @@ class AWSSubnetService(BaseSubnetService):
     def get(self, subnet_id):
         return self.svc.get(subnet_id)
 
+    @dispatch(event="provider.networking.subnets.get_many",
+              priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'subnet-id')
+
     @dispatch(event="provider.networking.subnets.list",
               priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
     def list(self, network=None, limit=None, marker=None):
@@ -1055,18 +1166,13 @@ class AWSSubnetService(BaseSubnetService):
     @dispatch(event="provider.networking.subnets.find",
               priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
     def find(self, network=None, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        filters = {'availability-zone': self.provider.zone_name}
+        label = query.push_down('label', wildcards=True)
+        if label:
+            filters['tag:Name'] = label
         log.debug("Searching for AWS Subnet Service %s", label)
-        return self.svc.find(
-            filters={'tag:Name': label,
-                     'availability-zone': self.provider.zone_name})
+        return self.svc.find_matching(query, filters=filters)
 
     @dispatch(event="provider.networking.subnets.create",
               priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
@@ -1204,19 +1310,19 @@ class AWSRouterService(BaseRouterService):
     def get(self, router_id):
         return self.svc.get(router_id)
 
+    @dispatch(event="provider.networking.routers.get_many",
+              priority=BaseRouterService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self.svc.get_many(ids, 'route-table-id')
+
     @dispatch(event="provider.networking.routers.find",
               priority=BaseRouterService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label', wildcards=True)
         log.debug("Searching for AWS Router Service %s", label)
-        return self.svc.find(filters={'tag:Name': label})
+        return self.svc.find_matching(
+            query, filters={'tag:Name': label} if label else {})
 
     @dispatch(event="provider.networking.routers.list",
               priority=BaseRouterService.STANDARD_EVENT_PRIORITY)
@@ -1264,10 +1370,7 @@ class AWSGatewayService(BaseGatewayService):
         # Gateway does not exist so create one and attach to the supplied net
         cb_gateway = self.svc.create('create_internet_gateway')
 
-        @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                        retry=tenacity.retry_if_exception_type(ClientError),
-                        wait=tenacity.wait_fixed(5),
-                        reraise=True)
+        @retry_until_visible
         def _set_tag(gateway):
             gateway._gateway.create_tags(
                 Tags=[{'Key': 'Name',
@@ -1345,13 +1448,15 @@ class AWSDnsService(BaseDnsService):
 
     def __init__(self, provider):
         super(AWSDnsService, self).__init__(provider)
-        self.client = self._provider.session.client(
-            'route53', region_name=self._provider.region_name)
 
         # Initialize provider services
         self._zone_svc = AWSDnsZoneService(self.provider)
         self._record_svc = AWSDnsRecordService(self.provider)
 
+    @property
+    def client(self):
+        return self.provider.route53_conn
+
     @property
     def host_zones(self):
         return self._zone_svc
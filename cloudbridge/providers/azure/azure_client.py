@@ -1,6 +1,5 @@
 import datetime
 import logging
-from io import BytesIO
 
 from azure.common import AzureConflictHttpError
 from azure.common.credentials import ServicePrincipalCredentials
@@ -13,12 +12,19 @@ from azure.mgmt.resource.subscriptions import SubscriptionClient
 from azure.mgmt.storage import StorageManagementClient
 from azure.storage.blob import BlobPermissions
 from azure.storage.blob import BlockBlobService
+from azure.storage.blob.models import BlobBlock
 from azure.storage.common import TokenCredential
 
+from msrest.authentication import BasicTokenAuthentication
+
 from msrestazure.azure_exceptions import CloudError
 
 import tenacity
 
+import cloudbridge.base.helpers as cb_helpers
+from cloudbridge.base.helpers import ClientCache
+from cloudbridge.base.helpers import parse_retry_after
+from cloudbridge.base.recording import CassetteAdapter
 from cloudbridge.interfaces.exceptions import DuplicateResourceException
 from cloudbridge.interfaces.exceptions import InvalidLabelException
 from cloudbridge.interfaces.exceptions import ProviderConnectionException
@@ -158,28 +164,106 @@ class AzureClient(object):
     """
     Azure client is the wrapper on top of azure python sdk
     """
-    def __init__(self, config):
+    # Azure Resource Manager throttles the management requests of a
+    # subscription together
+    RATE_LIMIT_FAMILY = 'management'
+    MANAGEMENT_CLIENTS = ('storage_client', 'subscription_client',
+                          'resource_client', 'compute_client',
+                          'network_management_client')
+
+    def __init__(self, config, clients=None, rate_limiter=None,
+                 cassette=None):
+        """
+        :type config: ``dict``
+        :param config: The provider's Azure configuration values.
+
+        :type clients: :class:`.ClientCache`
+        :param clients: Holds the SDK clients created by this object, which
+                        are per thread if the provider is thread-safe.
+
+        :type rate_limiter: :class:`.AdaptiveRateLimiter`
+        :param rate_limiter: Paces the requests of the management clients.
+                             Requests are not paced if not given.
+
+        :type cassette: :class:`.Cassette`
+        :param cassette: Records or replays the requests of all clients.
+        """
         self._config = config
+        self._clients = clients if clients is not None else ClientCache()
         self.subscription_id = str(config.get('azure_subscription_id'))
-        self._credentials = ServicePrincipalCredentials(
-            client_id=config.get('azure_client_id'),
-            secret=config.get('azure_secret'),
-            tenant=config.get('azure_tenant')
-        )
+        if cassette and not cassette.recording:
+            # Replayed requests need no token
+            self._credentials = BasicTokenAuthentication(
+                {'access_token': 'replayed'})
+        else:
+            self._credentials = ServicePrincipalCredentials(
+                client_id=config.get('azure_client_id'),
+                secret=config.get('azure_secret'),
+                tenant=config.get('azure_tenant')
+            )
 
         self._access_token = config.get('azure_access_token')
-        self._resource_client = None
-        self._storage_client = None
-        self._network_management_client = None
-        self._subscription_client = None
-        self._compute_client = None
         self._access_key_result = None
-        self._block_blob_service = None
-        self._table_service = None
         self._storage_account = None
+        self._response_hooks = []
+        self._rate_limiter = rate_limiter
+        self._cassette = cassette
 
         log.debug("azure subscription : %s", self.subscription_id)
 
+    def _add_hooks(self, client):
+        client.config.hooks.extend(self._response_hooks)
+        if self._rate_limiter:
+            client.config.hooks.append(self._record_throttling)
+        client.config.session_configuration_callback = \
+            self._configure_session
+        return client
+
+    def _configure_session(self, session, global_config, local_config,
+                           **kwargs):
+        # Called by msrest before each request is sent
+        if self._rate_limiter:
+            self._rate_limiter.acquire(self.RATE_LIMIT_FAMILY)
+        if self._cassette:
+            CassetteAdapter.mount(self._cassette, session)
+        return kwargs
+
+    def _add_storage_hooks(self, service):
+        # The storage services send requests through their own session
+        if self._cassette:
+            CassetteAdapter.mount(self._cassette, service.request_session)
+        return service
+
+    def use_cassette(self, cassette):
+        """
+        Records or replays the requests of all clients, including those
+        created already, with the given :class:`.Cassette`.
+        """
+        self._cassette = cassette
+        for name in ('blob_service', 'table_service'):
+            service = self._clients.peek(name)
+            if service:
+                self._add_storage_hooks(service)
+
+    def _record_throttling(self, response, *args, **kwargs):
+        if response.status_code == 429:
+            self._rate_limiter.record_throttle(
+                self.RATE_LIMIT_FAMILY,
+                parse_retry_after(response.headers.get('Retry-After')))
+        else:
+            self._rate_limiter.record_success(self.RATE_LIMIT_FAMILY)
+
+    def add_response_hook(self, hook):
+        """
+        Registers a requests response hook with all management clients,
+        including those created later.
+        """
+        self._response_hooks.append(hook)
+        for name in self.MANAGEMENT_CLIENTS:
+            client = self._clients.peek(name)
+            if client:
+                client.config.hooks.append(hook)
+
     @property
     @tenacity.retry(stop=tenacity.stop_after_attempt(5), reraise=True)
     def access_key_result(self):
@@ -220,68 +304,59 @@ class AzureClient(object):
 
     @property
     def storage_client(self):
-        if not self._storage_client:
-            self._storage_client = \
-                StorageManagementClient(self._credentials,
-                                        self.subscription_id)
-        return self._storage_client
+        return self._clients.get('storage_client', lambda: self._add_hooks(
+            StorageManagementClient(self._credentials, self.subscription_id)))
 
     @property
     def subscription_client(self):
-        if not self._subscription_client:
-            self._subscription_client = SubscriptionClient(self._credentials)
-        return self._subscription_client
+        return self._clients.get(
+            'subscription_client', lambda: self._add_hooks(
+                SubscriptionClient(self._credentials)))
 
     @property
     def resource_client(self):
-        if not self._resource_client:
-            self._resource_client = \
-                ResourceManagementClient(self._credentials,
-                                         self.subscription_id)
-        return self._resource_client
+        return self._clients.get('resource_client', lambda: self._add_hooks(
+            ResourceManagementClient(self._credentials,
+                                     self.subscription_id)))
 
     @property
     def compute_client(self):
-        if not self._compute_client:
-            self._compute_client = \
-                ComputeManagementClient(self._credentials,
-                                        self.subscription_id)
-        return self._compute_client
+        return self._clients.get('compute_client', lambda: self._add_hooks(
+            ComputeManagementClient(self._credentials, self.subscription_id)))
 
     @property
     def network_management_client(self):
-        if not self._network_management_client:
-            self._network_management_client = NetworkManagementClient(
-                self._credentials, self.subscription_id)
-        return self._network_management_client
+        return self._clients.get(
+            'network_management_client', lambda: self._add_hooks(
+                NetworkManagementClient(self._credentials,
+                                        self.subscription_id)))
+
+    def _connect_blob_service(self):
+        if self._access_token:
+            token_credential = TokenCredential(self._access_token)
+            return self._add_storage_hooks(BlockBlobService(
+                account_name=self.storage_account,
+                token_credential=token_credential))
+        return self._add_storage_hooks(BlockBlobService(
+            account_name=self.storage_account,
+            account_key=self.access_key_result.keys[0].value))
 
     @property
     def blob_service(self):
         self._get_or_create_storage_account()
-        if not self._block_blob_service:
-            if self._access_token:
-                token_credential = TokenCredential(self._access_token)
-                self._block_blob_service = BlockBlobService(
-                    account_name=self.storage_account,
-                    token_credential=token_credential)
-            else:
-                self._block_blob_service = BlockBlobService(
-                    account_name=self.storage_account,
-                    account_key=self.access_key_result.keys[0].value)
-        return self._block_blob_service
+        return self._clients.get('blob_service', self._connect_blob_service)
 
     @property
     def table_service(self):
         self._get_or_create_storage_account()
-        if not self._table_service:
-            self._table_service = TableService(
-                self.storage_account,
-                self.access_key_result.keys[0].value)
-        if not self._table_service. \
+        table_service = self._clients.get(
+            'table_service', lambda: self._add_storage_hooks(TableService(
+                self.storage_account, self.access_key_result.keys[0].value)))
+        if not table_service. \
                 exists(table_name=self.public_key_storage_table_name):
-            self._table_service.create_table(
+            table_service.create_table(
                 self.public_key_storage_table_name)
-        return self._table_service
+        return table_service
 
     def get_resource_group(self, name):
         return self.resource_client.resource_groups.get(name)
@@ -290,6 +365,16 @@ class AzureClient(object):
         return self.resource_client.resource_groups. \
             create_or_update(name, parameters)
 
+    def list_resource_ids_by_tag(self, resource_type, tag_name, tag_value):
+        # Tag filters cannot be combined with other filters, so the
+        # resource type is matched here instead
+        filtr = "tagName eq '{0}' and tagValue eq '{1}'".format(
+            tag_name, tag_value.replace("'", "''"))
+        resources = self.resource_client.resources. \
+            list_by_resource_group(self.resource_group, filter=filtr)
+        return [res.id for res in resources
+                if res.type.lower() == resource_type.lower()]
+
     def get_storage_account(self, storage_account):
         return self.storage_client.storage_accounts. \
             get_properties(self.resource_group, storage_account)
@@ -450,6 +535,18 @@ class AzureClient(object):
         self.blob_service.create_blob_from_path(container_name,
                                                 blob_name, file_path)
 
+    def create_blob_from_bytes(self, container_name, blob_name, data):
+        self.blob_service.create_blob_from_bytes(container_name,
+                                                 blob_name, data)
+
+    def put_block(self, container_name, blob_name, block_id, data):
+        self.blob_service.put_block(container_name, blob_name, data, block_id)
+
+    def put_block_list(self, container_name, blob_name, block_ids):
+        self.blob_service.put_block_list(
+            container_name, blob_name,
+            [BlobBlock(id=block_id) for block_id in block_ids])
+
     def delete_blob(self, container_name, blob_name):
         self.blob_service.delete_blob(container_name, blob_name)
 
@@ -462,11 +559,11 @@ class AzureClient(object):
         return self.blob_service.make_blob_url(container_name, blob_name,
                                                sas_token=sas)
 
-    def get_blob_content(self, container_name, blob_name):
-        out_stream = BytesIO()
-        self.blob_service.get_blob_to_stream(container_name,
-                                             blob_name, out_stream)
-        return out_stream
+    def get_blob_range(self, container_name, blob_name, start, end,
+                       if_match=None):
+        return self.blob_service.get_blob_to_bytes(
+            container_name, blob_name, start_range=start,
+            end_range=end, if_match=if_match).content
 
     def create_empty_disk(self, disk_name, params):
         return self.compute_client.disks.create_or_update(
@@ -673,10 +770,10 @@ class AzureClient(object):
                 return True
         return False
 
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5),
-                    retry=tenacity.retry_if_exception(__if_subnet_in_use),
-                    wait=tenacity.wait_fixed(5),
-                    reraise=True)
+    # Resources using the subnet may take a while to release it, so keep
+    # waiting at least 5 seconds between attempts
+    @cb_helpers.retry(__if_subnet_in_use, min_delay=5, base_delay=5,
+                      deadline=60)
     def delete_subnet(self, subnet_id):
         url_params = azure_helpers.parse_url(SUBNET_RESOURCE_ID,
                                              subnet_id)
@@ -1,8 +1,11 @@
 import logging
 import uuid
+from urllib.parse import urlparse
 
 from deprecation import deprecated
 
+from msrest.exceptions import ClientRequestError
+
 from msrestazure.azure_exceptions import CloudError
 
 import tenacity
@@ -13,6 +16,8 @@ from cloudbridge.base.helpers import get_env
 from cloudbridge.interfaces.exceptions import ProviderConnectionException
 from cloudbridge.providers.azure.azure_client import AzureClient
 
+from .resources import AzureSnapshot
+from .resources import AzureVolume
 from .services import AzureComputeService
 from .services import AzureNetworkingService
 from .services import AzureSecurityService
@@ -71,6 +76,9 @@ class AzureCloudProvider(BaseCloudProvider):
 
         self._azure_client = None
 
+        self._initialize_services()
+
+    def _initialize_services(self):
         self._security = AzureSecurityService(self)
         self._storage = AzureStorageService(self)
         self._compute = AzureComputeService(self)
@@ -134,10 +142,71 @@ class AzureCloudProvider(BaseCloudProvider):
                 'azure_access_token': self.access_token
             }
 
-            self._azure_client = AzureClient(provider_config)
+            self._azure_client = AzureClient(provider_config,
+                                             self._sdk_clients,
+                                             self.rate_limiter,
+                                             self._sdk_cassette)
             self._initialize()
         return self._azure_client
 
+    def _refresh_all(self, resources):
+        # Virtual machines are not refreshed in bulk, because the resource
+        # group listing does not include the instance view which holds
+        # the VM's power state.
+        if isinstance(resources[0], AzureVolume):
+            found = {disk.id.lower(): disk
+                     for disk in self.azure_client.list_disks()}
+            for res in resources:
+                disk = found.get(res.id.lower())
+                if disk:
+                    # pylint:disable=protected-access
+                    res._volume = disk
+                    res._update_state()
+                else:
+                    res._state = 'unknown'
+        elif isinstance(resources[0], AzureSnapshot):
+            found = {snap.id.lower(): snap
+                     for snap in self.azure_client.list_snapshots()}
+            for res in resources:
+                snap = found.get(res.id.lower())
+                # pylint:disable=protected-access
+                if snap:
+                    res._snapshot = snap
+                    res._state = snap.provisioning_state
+                else:
+                    res._state = 'unknown'
+        else:
+            super(AzureCloudProvider, self)._refresh_all(resources)
+
+    def _classify_error(self, error):
+        if isinstance(error, CloudError):
+            status = error.status_code or 0
+            if status == 429:
+                return 'throttled'
+            return 'transient' if status >= 500 else None
+        if isinstance(error, ClientRequestError):
+            return 'transient'
+        return super(AzureCloudProvider, self)._classify_error(error)
+
+    def _trace_sdk_calls(self, tracer):
+        # msrest 0.5 has no pipeline policies, so requests response hooks
+        # are used instead. These only fire once a response is received,
+        # so spans are recorded from the response's elapsed time. Blob
+        # storage requests are not traced.
+        def response_hook(response, *args, **kwargs):
+            tracer.record_span(
+                "{0} {1}".format(response.request.method,
+                                 urlparse(response.url).path),
+                response.elapsed.total_seconds(),
+                status=response.status_code)
+
+        self.azure_client.add_response_hook(response_hook)
+
+    def _use_cassette(self, cassette):
+        self._sdk_cassette = cassette
+        if self._azure_client:
+            self._azure_client.use_cassette(cassette)
+
     @tenacity.retry(stop=tenacity.stop_after_attempt(2),
                     retry=tenacity.retry_if_exception_type(CloudError),
                     reraise=True)
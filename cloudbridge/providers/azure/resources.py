@@ -3,8 +3,10 @@ DataTypes used by this provider
 """
 import collections
 import logging
+import os
 
 from azure.common import AzureException
+from azure.common import AzureHttpError
 from azure.mgmt.devtestlabs.models import GalleryImageReference
 from azure.mgmt.network.models import NetworkSecurityGroup
 
@@ -31,6 +33,7 @@ from cloudbridge.base.resources import BaseVMFirewall
 from cloudbridge.base.resources import BaseVMFirewallRule
 from cloudbridge.base.resources import BaseVMType
 from cloudbridge.base.resources import BaseVolume
+from cloudbridge.base.resources import StreamingUploadSource
 from cloudbridge.interfaces import InstanceState
 from cloudbridge.interfaces import VolumeState
 from cloudbridge.interfaces.resources import Instance
@@ -113,14 +116,6 @@ class AzureVMFirewall(BaseVMFirewall):
             log.exception(cloud_error.message)
             # The security group no longer exists and cannot be refreshed.
 
-    def to_json(self):
-        js = super(AzureVMFirewall, self).to_json()
-        json_rules = [r.to_json() for r in self.rules]
-        js['rules'] = json_rules
-        if js.get('network_id'):
-            js.pop('network_id')  # Omit for consistency across cloud providers
-        return js
-
 
 # Tuple for port range
 PortRange = collections.namedtuple('PortRange', ['from_port', 'to_port'])
@@ -177,6 +172,10 @@ class AzureVMFirewallRule(BaseVMFirewallRule):
 
 
 class AzureBucketObject(BaseBucketObject):
+    # Block blob limits
+    MAX_PART_SIZE = 100 * 1024 * 1024
+    MAX_PARTS = 50000
+
     def __init__(self, provider, container, key):
         super(AzureBucketObject, self).__init__(provider)
         self._container = container
@@ -211,11 +210,20 @@ class AzureBucketObject(BaseBucketObject):
         Returns this object's content as an
         iterable.
         """
-        content_stream = self._provider.azure_client. \
-            get_blob_content(self._container.id, self._key.name)
-        if content_stream:
-            content_stream.seek(0)
-        return content_stream
+        return self._stream_content()
+
+    def _content_version(self):
+        return self._key.properties.etag
+
+    def _read_range(self, start, end, version=None):
+        try:
+            return self._provider.azure_client.get_blob_range(
+                self._container.id, self._key.name, start, end - 1,
+                if_match=version)
+        except AzureHttpError as e:
+            if e.status_code == 412:
+                raise self._version_changed(e)
+            raise
 
     def upload(self, data):
         """
@@ -230,13 +238,57 @@ class AzureBucketObject(BaseBucketObject):
             log.exception(azureEx)
             return False
 
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, part_size=None, concurrency=None):
         """
         Store the contents of the file pointed by the "path" variable.
+        Files larger than the part size are staged as blocks in parallel,
+        and committed as a block list.
         """
+        file_size = os.path.getsize(path)
+        part_size = self._get_part_size(file_size, part_size)
         try:
-            self._provider.azure_client.create_blob_from_file(
-                self._container.id, self.id, path)
+            if file_size <= part_size:
+                self._provider.azure_client.create_blob_from_file(
+                    self._container.id, self.id, path)
+                return True
+
+            block_ids = self._upload_parts(path, part_size, concurrency,
+                                           self._put_block)
+            self._provider.azure_client.put_block_list(
+                self._container.id, self.id, block_ids)
+            return True
+        except AzureException as azureEx:
+            log.exception(azureEx)
+            return False
+
+    def _put_block(self, index, data):
+        # Block IDs must all be of the same length
+        block_id = "{0:06d}".format(index)
+        self._provider.azure_client.put_block(
+            self._container.id, self.id, block_id,
+            StreamingUploadSource.to_bytes(data))
+        return block_id
+
+    def upload_stream(self, source, size_hint=None, part_size=None,
+                      concurrency=None):
+        """
+        Store the data read from a stream. Data larger than the part size
+        is staged as blocks in parallel, and committed as a block list.
+        """
+        part_size = self._get_part_size(size_hint or 0, part_size)
+
+        def upload_whole(data):
+            self._provider.azure_client.create_blob_from_bytes(
+                self._container.id, self.id,
+                StreamingUploadSource.to_bytes(data))
+
+        try:
+            block_ids = self._upload_stream_parts(
+                source, part_size, concurrency, self._put_block,
+                upload_whole)
+            if block_ids is not None:
+                self._provider.azure_client.put_block_list(
+                    self._container.id, self.id, block_ids)
             return True
         except AzureException as azureEx:
             log.exception(azureEx)
@@ -261,7 +313,7 @@ class AzureBucketObject(BaseBucketObject):
 
     def refresh(self):
         self._key = self._provider.azure_client.get_blob(
-            self._container.id, self._key.id)
+            self._container.id, self._key.name)
 
 
 class AzureBucket(BaseBucket):
@@ -907,6 +959,8 @@ class AzurePlacementZone(BasePlacementZone):
 
 
 class AzureSubnet(BaseSubnet):
+    RESOLVED_FIELDS = BaseSubnet.RESOLVED_FIELDS + ('network_id',)
+
     _SUBNET_STATE_MAP = {
         'InProgress': SubnetState.PENDING,
         'Succeeded': SubnetState.AVAILABLE,
@@ -996,6 +1050,10 @@ class AzureSubnet(BaseSubnet):
 
 class AzureInstance(BaseInstance):
 
+    # Addresses and subnets are looked up through the instance's NICs
+    RESOLVED_FIELDS = BaseInstance.RESOLVED_FIELDS + (
+        'public_ips', 'private_ips', 'subnet_id')
+
     INSTANCE_STATE_MAP = {
         'InProgress': InstanceState.PENDING,
         'Creating': InstanceState.PENDING,
@@ -1410,6 +1468,8 @@ class AzureKeyPair(BaseKeyPair):
 
 
 class AzureRouter(BaseRouter):
+    RESOLVED_FIELDS = BaseRouter.RESOLVED_FIELDS + ('state',)
+
     def __init__(self, provider, route_table):
         super(AzureRouter, self).__init__(provider)
         self._route_table = route_table
@@ -373,18 +373,20 @@ class AzureVolumeService(BaseVolumeService):
     @dispatch(event="provider.storage.volumes.find",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, ", ".join(filters)))
-
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label')
+        if label:
+            obj_list = [
+                AzureVolume(self.provider,
+                            self.provider.azure_client.get_disk(disk_id))
+                for disk_id in self.provider.azure_client
+                .list_resource_ids_by_tag('Microsoft.Compute/disks',
+                                          'Label', label)]
+        else:
+            obj_list = self
+        matches = query.match(obj_list)
         return ClientPagedResultList(self.provider,
-                                     matches if matches else [])
+                                     list(matches) if matches else [])
 
     @dispatch(event="provider.storage.volumes.list",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
@@ -465,18 +467,20 @@ class AzureSnapshotService(BaseSnapshotService):
     @dispatch(event="provider.storage.snapshots.find",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, ", ".join(filters)))
-
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label')
+        if label:
+            obj_list = [
+                AzureSnapshot(self.provider,
+                              self.provider.azure_client.get_snapshot(snap_id))
+                for snap_id in self.provider.azure_client
+                .list_resource_ids_by_tag('Microsoft.Compute/snapshots',
+                                          'Label', label)]
+        else:
+            obj_list = self
+        matches = query.match(obj_list)
         return ClientPagedResultList(self.provider,
-                                     matches if matches else [])
+                                     list(matches) if matches else [])
 
     @dispatch(event="provider.storage.snapshots.list",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
@@ -599,12 +603,13 @@ class AzureBucketObjectService(BaseBucketObjectService):
                                      limit=limit, marker=marker)
 
     def find(self, bucket, **kwargs):
+        query = cb_helpers.FindQuery(['name'], kwargs)
         obj_list = [AzureBucketObject(self.provider, bucket, obj)
                     for obj in
-                    self.provider.azure_client.list_blobs(bucket.name)]
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self.provider, list(matches))
+                    self.provider.azure_client.list_blobs(
+                        bucket.name,
+                        prefix=query.push_down_prefix('name'))]
+        return ClientPagedResultList(self.provider, query.match(obj_list))
 
     def create(self, bucket, name):
         self.provider.azure_client.create_blob_from_text(
@@ -1,11 +1,108 @@
+import io
 import re
+import timeit
 
 from googleapiclient.errors import HttpError
 
-import tenacity
+import httplib2
 
+from cloudbridge.base import helpers as cb_helpers
 from cloudbridge.interfaces.exceptions import ProviderInternalException
 
+# The batch HTTP endpoint accepts at most 1000 requests per batch
+BATCH_REQUEST_LIMIT = 1000
+
+
+def is_rate_limit_error(http_error):
+    """
+    Returns whether an HttpError reports that requests were throttled,
+    either with a 429 status or a 403 rateLimitExceeded error.
+    """
+    if http_error.resp.status == 429:
+        return True
+    # str wrapper required for Python 2.7
+    return (http_error.resp.status == 403 and
+            'ratelimitexceeded' in str(http_error.content).lower())
+
+
+class MemoryViewReader(io.RawIOBase):
+    """
+    A seekable, read-only file object over a bytes-like object, e.g. a part
+    of a streaming upload. Unlike ``io.BytesIO``, a memoryview is not copied
+    up front; only the ranges that are read are.
+    """
+
+    def __init__(self, data):
+        super(MemoryViewReader, self).__init__()
+        self._view = memoryview(data)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("Negative seek position %d" % offset)
+        self._position = offset
+        return offset
+
+    def read(self, size=-1):
+        end = (len(self._view) if size is None or size < 0
+               else self._position + size)
+        data = self._view[self._position:end].tobytes()
+        self._position += len(data)
+        return data
+
+    def readinto(self, b):
+        data = self._view[self._position:self._position + len(b)]
+        b[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class CassetteHttp(object):
+    """
+    An ``httplib2.Http`` lookalike that records the requests sent through
+    the wrapped ``Http`` object to a :class:`.Cassette`, or replays them
+    from it.
+    """
+
+    def __init__(self, cassette, http=None):
+        """
+        :type http: ``httplib2.Http``
+        :param http: The object that sends requests when recording. It is
+                     not needed when replaying.
+        """
+        self.cassette = cassette
+        self.http = http
+        # Looked up by googleapiclient to refresh credentials
+        self.credentials = getattr(http, 'credentials', None)
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if not self.cassette.recording:
+            raw = self.cassette.play(method, uri, body)
+            response = httplib2.Response(raw.headers)
+            response.status = raw.status
+            response.reason = raw.reason
+            return response, raw.read()
+        start = timeit.default_timer()
+        response, content = self.http.request(uri, method, body=body,
+                                              headers=headers, **kwargs)
+        self.cassette.record(method, uri, body, response.status,
+                             response.reason, response, content,
+                             timeit.default_timer() - start)
+        return response, content
+
 
 def gcp_projects(provider):
     return provider.gcp_compute.projects()
@@ -22,6 +119,44 @@ def iter_all(resource, **kwargs):
         token = response['nextPageToken']
 
 
+def execute_batch(connection, requests):
+    """
+    Executes API requests through the batch HTTP endpoint, sending up to
+    BATCH_REQUEST_LIMIT requests per round trip. All requests are attempted
+    even if some of them fail.
+
+    :type connection: :class:`googleapiclient.discovery.Resource`
+    :param connection: The API connection the requests were built with
+                       (e.g. ``provider.gcp_compute``)
+
+    :type requests: ``list`` of ``(item, request)`` tuples
+    :param requests: The requests to execute, each paired with the item it
+                     applies to.
+
+    :rtype: ``tuple``
+    :return: A list of ``(item, response)`` tuples for the successful
+             requests, and a list of ``(item, exception)`` tuples for the
+             failed requests.
+    """
+    results = []
+    failures = []
+    for start in range(0, len(requests), BATCH_REQUEST_LIMIT):
+        chunk = requests[start:start + BATCH_REQUEST_LIMIT]
+
+        def callback(request_id, response, exception, chunk=chunk):
+            item = chunk[int(request_id)][0]
+            if exception:
+                failures.append((item, exception))
+            else:
+                results.append((item, response))
+
+        batch = connection.new_batch_http_request()
+        for index, (_, request) in enumerate(chunk):
+            batch.add(request, callback=callback, request_id=str(index))
+        batch.execute()
+    return results, failures
+
+
 def get_common_metadata(provider):
     """
     Get a project's commonInstanceMetadata entry
@@ -42,10 +177,7 @@ def __if_fingerprint_differs(e):
     return False
 
 
-@tenacity.retry(stop=tenacity.stop_after_attempt(10),
-                retry=tenacity.retry_if_exception(__if_fingerprint_differs),
-                wait=tenacity.wait_exponential(max=10),
-                reraise=True)
+@cb_helpers.retry(__if_fingerprint_differs, max_attempts=10)
 def gcp_metadata_save_op(provider, callback):
     """
     Carries out a metadata save operation. In GCP, a fingerprint based
@@ -156,11 +288,7 @@ def __if_label_fingerprint_differs(e):
     return False
 
 
-@tenacity.retry(stop=tenacity.stop_after_attempt(10),
-                retry=tenacity.retry_if_exception(
-                    __if_label_fingerprint_differs),
-                wait=tenacity.wait_exponential(max=10),
-                reraise=True)
+@cb_helpers.retry(__if_label_fingerprint_differs, max_attempts=10)
 def change_label(resource, key, value, res_att, request):
     resource.assert_valid_resource_label(value)
     labels = getattr(resource, res_att).get("labels", {})
@@ -24,8 +24,17 @@ from google.auth.credentials import with_scopes_if_required
 from google.oauth2.service_account import Credentials
 
 from cloudbridge.base import BaseCloudProvider
+from cloudbridge.base.helpers import parse_retry_after
 from cloudbridge.interfaces.exceptions import ProviderConnectionException
-
+from cloudbridge.interfaces.resources import InstanceState
+from cloudbridge.interfaces.resources import VolumeState
+
+from .helpers import CassetteHttp
+from .helpers import execute_batch
+from .helpers import is_rate_limit_error
+from .helpers import iter_all
+from .resources import GCPInstance
+from .resources import GCPVolume
 from .services import GCPComputeService
 from .services import GCPDnsService
 from .services import GCPNetworkingService
@@ -67,8 +76,19 @@ class GCPResourceUrl(object):
                      'https://www.googleapis.com/compute/v1/projects/galaxy-on-gcp/regions/us-central1/subnetworks/testsubnet-2',
              'privateIpGoogleAccess': false}
         """
+        return self.get_request().execute()
+
+    @property
+    def connection(self):
+        return self._connection
+
+    def get_request(self):
+        """
+        Returns the unexecuted request for fetching the resource, e.g. for
+        adding it to a batch request.
+        """
         discovery_object = getattr(self._connection, self._resource)()
-        return discovery_object.get(**self.parameters).execute()
+        return discovery_object.get(**self.parameters)
 
 
 class GCPResources(object):
@@ -205,6 +225,8 @@ class GCPResources(object):
 
 class GCPCloudProvider(BaseCloudProvider):
     PROVIDER_ID = 'gcp'
+    # Compute resource URLs are resolved relative to the current zone
+    CLONE_RESET_ATTRIBUTES = ('_compute_resources_cache',)
 
     def __init__(self, config):
         super(GCPCloudProvider, self).__init__(config)
@@ -250,8 +272,12 @@ class GCPCloudProvider(BaseCloudProvider):
         self._compute_resources_cache = None
         self._storage_resources_cache = None
         self._dns_resources_cache = None
+        # Set by _trace_sdk_calls to record a span for each API request
+        self._sdk_tracer = None
+
+        self._initialize_services()
 
-        # Initialize provider services
+    def _initialize_services(self):
         self._compute = GCPComputeService(self)
         self._security = GCPSecurityService(self)
         self._networking = GCPNetworkingService(self)
@@ -346,37 +372,125 @@ class GCPCloudProvider(BaseCloudProvider):
         return self._credentials.service_account_email
 
     def _get_build_request(self):
-        credentials = Credentials.from_service_account_info(
-            self.credentials_dict)
-        credentials = with_scopes_if_required(credentials, list(CLOUD_SCOPES))
+        cassette = self._sdk_cassette
+        credentials = None
+        if not cassette or cassette.recording:
+            credentials = Credentials.from_service_account_info(
+                self.credentials_dict)
+            credentials = with_scopes_if_required(credentials,
+                                                  list(CLOUD_SCOPES))
+
+        def new_http():
+            http = None
+            if credentials:
+                http = google_auth_httplib2.AuthorizedHttp(
+                    credentials, http=httplib2.Http())
+            if cassette:
+                http = CassetteHttp(cassette, http)
+            return http
 
         # FROM: https://github.com/googleapis/google-api-python-client/blob/
         # master/docs/thread_safety.md
-        # Create a new Http() object for every request
+        # Http() objects are not thread-safe. In thread-safe mode, each
+        # thread reuses its own Http() object, along with its connections.
+        # Otherwise, the provider may still be shared between threads, so a
+        # new Http() object is created for every request. The API objects
+        # built from discovery documents hold no connections, and are shared.
         def build_request(http, *args, **kwargs):
-            new_http = google_auth_httplib2.AuthorizedHttp(
-                credentials, http=httplib2.Http())
-            return googleapiclient.http.HttpRequest(new_http, *args, **kwargs)
+            if self._sdk_clients.thread_safe:
+                http = self._sdk_clients.get('http', new_http)
+            else:
+                http = new_http()
+            request = googleapiclient.http.HttpRequest(
+                http, *args, **kwargs)
+            self._rate_limit_request(request)
+            if self._sdk_tracer:
+                self._trace_request(request, self._sdk_tracer)
+            return request
 
         return build_request
 
-    def _connect_gcp_storage(self):
-        return discovery.build('storage', 'v1', credentials=self._credentials,
+    def _rate_limit_request(self, request):
+        # Each API (e.g. compute or storage) has its own rate limits
+        family = (request.methodId or 'default').split('.')[0]
+        execute = request.execute
+
+        def rate_limited_execute(*args, **kwargs):
+            self.rate_limiter.acquire(family)
+            try:
+                result = execute(*args, **kwargs)
+            except googleapiclient.errors.HttpError as http_error:
+                if is_rate_limit_error(http_error):
+                    self.rate_limiter.record_throttle(
+                        family,
+                        parse_retry_after(http_error.resp.get('retry-after')))
+                raise
+            self.rate_limiter.record_success(family)
+            return result
+
+        request.execute = rate_limited_execute
+
+    def _classify_error(self, error):
+        if isinstance(error, googleapiclient.errors.HttpError):
+            if is_rate_limit_error(error):
+                return 'throttled'
+            return 'transient' if error.resp.status >= 500 else None
+        if isinstance(error, httplib2.HttpLib2Error):
+            return 'transient'
+        return super(GCPCloudProvider, self)._classify_error(error)
+
+    @staticmethod
+    def _trace_request(request, tracer):
+        execute = request.execute
+
+        def traced_execute(*args, **kwargs):
+            with tracer.span(request.methodId or request.uri,
+                             category=tracer.SDK_CATEGORY,
+                             method=request.method):
+                return execute(*args, **kwargs)
+
+        request.execute = traced_execute
+
+    def _trace_sdk_calls(self, tracer):
+        self._sdk_tracer = tracer
+
+    def _use_cassette(self, cassette):
+        self._sdk_cassette = cassette
+        # Rebuild the API objects, so that their requests go through the
+        # cassette
+        self._gcp_compute = None
+        self._gcp_storage = None
+        self._gcp_dns = None
+        self._compute_resources_cache = None
+        self._storage_resources_cache = None
+        self._dns_resources_cache = None
+        self._sdk_clients.discard('http')
+
+    def _build_api(self, service_name, version):
+        cassette = self._sdk_cassette
+        if cassette:
+            # Fetch the discovery document through the cassette as well,
+            # so that replaying needs no network access or credentials
+            http = None
+            if cassette.recording:
+                http = self._credentials.authorize(httplib2.Http())
+            return discovery.build(service_name, version,
+                                   http=CassetteHttp(cassette, http),
+                                   cache_discovery=False,
+                                   requestBuilder=self._get_build_request())
+        return discovery.build(service_name, version,
+                               credentials=self._credentials,
                                cache_discovery=False,
-                               requestBuilder=self._get_build_request()
-                               )
+                               requestBuilder=self._get_build_request())
+
+    def _connect_gcp_storage(self):
+        return self._build_api('storage', 'v1')
 
     def _connect_gcp_compute(self):
-        return discovery.build('compute', 'v1', credentials=self._credentials,
-                               cache_discovery=False,
-                               requestBuilder=self._get_build_request()
-                               )
+        return self._build_api('compute', 'v1')
 
     def _connect_gcp_dns(self):
-        return discovery.build('dns', 'v1', credentials=self._credentials,
-                               cache_discovery=False,
-                               requestBuilder=self._get_build_request()
-                               )
+        return self._build_api('dns', 'v1')
 
     def wait_for_operation(self, operation, region=None, zone=None):
         args = {'project': self.project_name, 'operation': operation['name']}
@@ -398,20 +512,58 @@ class GCPCloudProvider(BaseCloudProvider):
 
             time.sleep(0.5)
 
+    def _refresh_all(self, resources):
+        if isinstance(resources[0], GCPInstance):
+            collection = self.gcp_compute.instances()
+            data_attr = '_gcp_instance'
+            unknown_state = InstanceState.UNKNOWN
+        elif isinstance(resources[0], GCPVolume):
+            collection = self.gcp_compute.disks()
+            data_attr = '_volume'
+            unknown_state = VolumeState.UNKNOWN
+        else:
+            return super(GCPCloudProvider, self)._refresh_all(resources)
+
+        # List each zone once, filtered down to the requested names. The
+        # number of names per filter is bounded to keep the expression short.
+        by_zone = {}
+        for res in resources:
+            data = getattr(res, data_attr)
+            zone = data['zone'].rsplit('/', 1)[-1]
+            by_zone.setdefault(zone, set()).add(data['name'])
+        found = {}
+        for zone, names in by_zone.items():
+            names = sorted(names)
+            for i in range(0, len(names), 50):
+                name_filter = " OR ".join('(name = "{0}")'.format(name)
+                                          for name in names[i:i + 50])
+                for item in iter_all(collection, project=self.project_name,
+                                     zone=zone, filter=name_filter):
+                    found[item['selfLink']] = item
+        for res in resources:
+            data = found.get(getattr(res, data_attr)['selfLink'])
+            if data:
+                setattr(res, data_attr, data)
+            else:
+                # resource no longer exists
+                getattr(res, data_attr)['status'] = unknown_state
+
     def parse_url(self, url):
         out = self._compute_resources.parse_url(url)
         return out if out else self._storage_resources.parse_url(url)
 
-    def get_resource(self, resource, url_or_name, **kwargs):
-        if not url_or_name:
-            return None
-        resource_url = (
-                self._compute_resources.get_resource_url_with_default(
+    def _get_resource_url(self, resource, url_or_name, **kwargs):
+        return (self._compute_resources.get_resource_url_with_default(
                     resource, url_or_name, **kwargs) or
                 self._storage_resources.get_resource_url_with_default(
                     resource, url_or_name, **kwargs) or
                 self._dns_resources.get_resource_url_with_default(
                     resource, url_or_name, **kwargs))
+
+    def get_resource(self, resource, url_or_name, **kwargs):
+        if not url_or_name:
+            return None
+        resource_url = self._get_resource_url(resource, url_or_name, **kwargs)
         if resource_url is None:
             return None
         try:
@@ -423,6 +575,33 @@ class GCPCloudProvider(BaseCloudProvider):
             else:
                 raise
 
+    def get_resources(self, resource, urls_or_names, **kwargs):
+        """
+        Fetches several resources of the same type with batch requests,
+        instead of one request per resource.
+
+        :rtype: ``dict``
+        :return: A map of each url or name to the resource, or to ``None`` if
+                 the resource was not found.
+        """
+        found = dict.fromkeys(urls_or_names)
+        batches = {}
+        for url_or_name in found:
+            resource_url = (url_or_name and self._get_resource_url(
+                resource, url_or_name, **kwargs))
+            if resource_url:
+                batches.setdefault(resource_url.connection, []).append(
+                    (url_or_name, resource_url.get_request()))
+        for connection, requests in batches.items():
+            results, failures = execute_batch(connection, requests)
+            found.update(results)
+            for _, http_error in failures:
+                if not (isinstance(http_error,
+                                   googleapiclient.errors.HttpError) and
+                        http_error.resp.status in [404]):
+                    raise http_error
+        return found
+
     def authenticate(self):
         try:
             self.gcp_compute
@@ -4,10 +4,10 @@ DataTypes used by this provider
 import base64
 import calendar
 import hashlib
-import inspect
 import io
 import logging
 import math
+import os
 import re
 import time
 import uuid
@@ -533,13 +533,6 @@ class GCPVMFirewall(BaseVMFirewall):
     def rules(self):
         return self._rule_container
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not(inspect.isroutine(a)))
-        js = {k: v for(k, v) in attr if not k.startswith('_')}
-        json_rules = [r.to_json() for r in self.rules]
-        js['rules'] = json_rules
-        return js
-
     def refresh(self):
         fw = self._provider.security.vm_firewalls.get(self.id)
         # restore all internal state
@@ -772,6 +765,10 @@ class GCPMachineImage(BaseMachineImage):
 
 
 class GCPInstance(BaseInstance):
+    # Both are read from the boot disk or a refreshed copy of the instance
+    RESOLVED_FIELDS = BaseInstance.RESOLVED_FIELDS + (
+        'image_id', 'key_pair_id')
+
     # https://cloud.google.com/compute/docs/reference/latest/instances
     # The status of the instance. One of the following values:
     # PROVISIONING, STAGING, RUNNING, STOPPING, SUSPENDING, SUSPENDED,
@@ -1418,6 +1415,8 @@ class GCPFloatingIP(BaseFloatingIP):
 
 class GCPRouter(BaseRouter):
 
+    RESOLVED_FIELDS = BaseRouter.RESOLVED_FIELDS + ('network_id',)
+
     def __init__(self, provider, router):
         super(GCPRouter, self).__init__(provider)
         self._router = router
@@ -1908,6 +1907,9 @@ class GCPSnapshot(BaseSnapshot):
 
 
 class GCPBucketObject(BaseBucketObject):
+    # Large files are uploaded as temporary part objects, which are composed
+    # into the object with requests of up to 32 source objects each
+    MAX_COMPOSE_SOURCES = 32
 
     def __init__(self, provider, bucket, obj):
         super(GCPBucketObject, self).__init__(provider)
@@ -1931,12 +1933,25 @@ class GCPBucketObject(BaseBucketObject):
         return self._obj['updated']
 
     def iter_content(self):
-        return io.BytesIO(self._provider
-                              .gcp_storage
-                              .objects()
-                              .get_media(bucket=self._obj['bucket'],
-                                         object=self.name)
-                              .execute())
+        return self._stream_content()
+
+    def _content_version(self):
+        return self._obj.get('generation')
+
+    def _read_range(self, start, end, version=None):
+        kwargs = {'ifGenerationMatch': version} if version else {}
+        request = (self._provider
+                       .gcp_storage
+                       .objects()
+                       .get_media(bucket=self._obj['bucket'],
+                                  object=self.name, **kwargs))
+        request.headers['Range'] = "bytes={0}-{1}".format(start, end - 1)
+        try:
+            return request.execute()
+        except googleapiclient.errors.HttpError as e:
+            if e.resp.status == 412:
+                raise self._version_changed(e)
+            raise
 
     def upload(self, data):
         """
@@ -1955,21 +1970,120 @@ class GCPBucketObject(BaseBucketObject):
         if response:
             self._obj = response
 
-    def upload_from_file(self, path):
+    def _insert(self, name, stream):
+        media_body = googleapiclient.http.MediaIoBaseUpload(
+                stream, 'application/octet-stream')
+        # pylint:disable=protected-access
+        return (self._provider
+                .storage._bucket_objects
+                ._create_object_with_media_body(self._bucket, name,
+                                                media_body))
+
+    def _compose(self, sources, destination):
+        return (self._provider
+                .gcp_storage
+                .objects()
+                .compose(destinationBucket=self._obj['bucket'],
+                         destinationObject=destination,
+                         body={'sourceObjects': [{'name': name}
+                                                 for name in sources],
+                               'destination': {
+                                   'contentType': 'application/octet-stream'}})
+                .execute())
+
+    def _delete_part(self, name):
+        try:
+            (self._provider
+                 .gcp_storage
+                 .objects()
+                 .delete(bucket=self._obj['bucket'], object=name)
+                 .execute())
+        except googleapiclient.errors.HttpError as e:
+            # The part may not have been created
+            log.debug("Could not delete temporary object %s: %s", name, e)
+
+    def upload_from_file(self, path, part_size=None, concurrency=None):
+        """
+        Upload a binary file. Files larger than the part size are uploaded
+        as temporary part objects in parallel, which are then composed into
+        this object and deleted.
+        """
+        file_size = os.path.getsize(path)
+        part_size = self._get_part_size(file_size, part_size)
+        if file_size <= part_size:
+            with open(path, 'rb') as f:
+                response = self._insert(self.name, f)
+            if response:
+                self._obj = response
+            return
+
+        concurrency = concurrency or self._provider.config.parallel_workers
+        self._upload_composite(
+            lambda upload_part: self._upload_parts(
+                path, part_size, concurrency, upload_part),
+            concurrency)
+
+    def _upload_composite(self, upload_parts, concurrency):
         """
-        Upload a binary file.
+        Calls ``upload_parts(upload_part)``, which uploads the data in parts
+        with ``upload_part(index, data)`` and returns the results, then
+        composes the uploaded parts into this object and deletes them.
+        ``upload_parts`` may upload the data itself and return ``None``.
         """
-        with open(path, 'rb') as f:
-            media_body = googleapiclient.http.MediaIoBaseUpload(
-                    f, 'application/octet-stream')
-            # pylint:disable=protected-access
-            response = (self._provider
-                        .storage._bucket_objects
-                        ._create_object_with_media_body(self._bucket,
-                                                        self.name,
-                                                        media_body))
+        prefix = "{0}.cb-part-{1}".format(self.name, uuid.uuid4().hex[:8])
+        temporary = []
+
+        def upload_part(index, data):
+            name = "{0}-{1:05d}".format(prefix, index)
+            temporary.append(name)
+            self._insert(name, helpers.MemoryViewReader(data))
+            return name
+
+        try:
+            sources = upload_parts(upload_part)
+            if sources is None:
+                return
+            level = 0
+            # Compose the parts in a tree when there are too many for a
+            # single request
+            while len(sources) > self.MAX_COMPOSE_SOURCES:
+                groups = [sources[i:i + self.MAX_COMPOSE_SOURCES] for i in
+                          range(0, len(sources), self.MAX_COMPOSE_SOURCES)]
+                sources = ["{0}-{1}-{2:05d}".format(prefix, level, i)
+                           for i in range(len(groups))]
+                temporary.extend(sources)
+                self._provider.parallel.map_limited(
+                    lambda args: self._compose(*args), zip(groups, sources),
+                    concurrency)
+                level += 1
+            response = self._compose(sources, self.name)
             if response:
                 self._obj = response
+        finally:
+            if temporary:
+                self._provider.parallel.map_limited(
+                    self._delete_part, temporary, concurrency)
+
+    def upload_stream(self, source, size_hint=None, part_size=None,
+                      concurrency=None):
+        """
+        Upload the data read from a stream. Data larger than the part size
+        is uploaded as temporary part objects in parallel, which are then
+        composed into this object and deleted.
+        """
+        part_size = self._get_part_size(size_hint or 0, part_size)
+        concurrency = concurrency or self._provider.config.parallel_workers
+
+        def upload_whole(data):
+            response = self._insert(self.name,
+                                    helpers.MemoryViewReader(data))
+            if response:
+                self._obj = response
+
+        self._upload_composite(
+            lambda upload_part: self._upload_stream_parts(
+                source, part_size, concurrency, upload_part, upload_whole),
+            concurrency)
 
     def delete(self):
         (self._provider
@@ -1997,7 +2111,7 @@ class GCPBucketObject(BaseBucketObject):
 
     def refresh(self):
         # pylint:disable=protected-access
-        self._obj = self.bucket.objects.get(self.id)._obj
+        self._obj = self._bucket.objects.get(self.name)._obj
 
 
 class GCPBucket(BaseBucket):
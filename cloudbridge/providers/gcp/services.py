@@ -36,6 +36,7 @@ from cloudbridge.base.services import BaseVMTypeService
 from cloudbridge.base.services import BaseVolumeService
 from cloudbridge.interfaces.exceptions import DuplicateResourceException
 from cloudbridge.interfaces.exceptions import InvalidParamException
+from cloudbridge.interfaces.exceptions import ProviderInternalException
 from cloudbridge.interfaces.resources import TrafficDirection
 from cloudbridge.interfaces.resources import VMFirewall
 from cloudbridge.providers.gcp import helpers
@@ -104,6 +105,11 @@ class GCPKeyPairService(BaseKeyPairService):
         else:
             return None
 
+    @dispatch(event="provider.security.key_pairs.get_many",
+              priority=BaseKeyPairService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        return self._get_many_by_listing(ids)
+
     @dispatch(event="provider.security.key_pairs.list",
               priority=BaseKeyPairService.STANDARD_EVENT_PRIORITY)
     def list(self, limit=None, marker=None):
@@ -334,6 +340,14 @@ class GCPVMTypeService(BaseVMTypeService):
         vm_type = self.provider.get_resource('machineTypes', vm_type_id)
         return GCPVMType(self.provider, vm_type) if vm_type else None
 
+    @dispatch(event="provider.compute.vm_types.get_many",
+              priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        vm_types = self.provider.get_resources('machineTypes', ids)
+        return {vm_type_id: GCPVMType(self.provider, vm_type)
+                if vm_type else None
+                for vm_type_id, vm_type in vm_types.items()}
+
     @dispatch(event="provider.compute.vm_types.find",
               priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
@@ -430,6 +444,21 @@ class GCPImageService(BaseImageService):
                 return public_image
         return None
 
+    @dispatch(event="provider.compute.images.get_many",
+              priority=BaseImageService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        images = {image_id: GCPMachineImage(self.provider, image)
+                  if image else None for image_id, image in
+                  self.provider.get_resources('images', ids).items()}
+        if not all(images.values()):
+            self._retrieve_public_images()
+            for image_id in images:
+                images[image_id] = images[image_id] or next(
+                    (public_image for public_image in self._public_images
+                     if image_id in (public_image.id, public_image.name)),
+                    None)
+        return images
+
     def find(self, limit=None, marker=None, **kwargs):
         """
         Searches for an image by a given list of attributes
@@ -469,16 +498,14 @@ class GCPInstanceService(BaseInstanceService):
     def __init__(self, provider):
         super(GCPInstanceService, self).__init__(provider)
 
-    @dispatch(event="provider.compute.instances.create",
-              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
-    def create(self, label, image, vm_type, subnet,
-               key_pair=None, vm_firewalls=None, user_data=None,
-               launch_config=None, **kwargs):
+    def _build_instance_config(self, label, image, vm_type, subnet,
+                               key_pair=None, vm_firewalls=None,
+                               user_data=None, launch_config=None, **kwargs):
         """
-        Creates a new virtual machine instance.
+        Builds the request body for inserting an instance, or returns
+        ``None`` if no boot disk is given.
         """
         GCPInstance.assert_valid_resource_name(label)
-        zone_name = self.provider.zone_name
         if not isinstance(vm_type, GCPVMType):
             vm_type = self.provider.compute.vm_types.get(vm_type)
 
@@ -606,7 +633,23 @@ class GCPInstanceService(BaseInstanceService):
                     config['metadata'] = {'items': [kp_entry]}
 
         config['labels'] = {'cblabel': label}
+        return config
 
+    @dispatch(event="provider.compute.instances.create",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def create(self, label, image, vm_type, subnet,
+               key_pair=None, vm_firewalls=None, user_data=None,
+               launch_config=None, **kwargs):
+        """
+        Creates a new virtual machine instance.
+        """
+        config = self._build_instance_config(
+            label, image, vm_type, subnet, key_pair=key_pair,
+            vm_firewalls=vm_firewalls, user_data=user_data,
+            launch_config=launch_config, **kwargs)
+        if not config:
+            return None
+        zone_name = self.provider.zone_name
         operation = (self.provider
                          .gcp_compute.instances()
                          .insert(project=self.provider.project_name,
@@ -618,6 +661,67 @@ class GCPInstanceService(BaseInstanceService):
         cb_inst = self.get(instance_id)
         return cb_inst
 
+    @dispatch(event="provider.compute.instances.create_many",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def create_many(self, count, label, image, vm_type, subnet,
+                    key_pair=None, vm_firewalls=None, user_data=None,
+                    launch_config=None, **kwargs):
+        """
+        Creates several instances with a single ``instances.bulkInsert``
+        request.
+        """
+        if launch_config:
+            # Volumes created for a launch config can only be attached to a
+            # single instance, so each instance needs its own request
+            return super(GCPInstanceService, self).create_many(
+                count, label, image, vm_type, subnet, key_pair=key_pair,
+                vm_firewalls=vm_firewalls, user_data=user_data,
+                launch_config=launch_config, **kwargs)
+        config = self._build_instance_config(
+            label, image, vm_type, subnet, key_pair=key_pair,
+            vm_firewalls=vm_firewalls, user_data=user_data, **kwargs)
+        if not config:
+            return []
+        config.pop('name')
+        # Bulk inserts take the machine type name rather than its URL, and
+        # name each boot disk after its instance
+        config['machineType'] = config['machineType'].rsplit('/', 1)[-1]
+        for disk in config['disks']:
+            disk.get('initializeParams', {}).pop('diskName', None)
+        names = [GCPInstance._generate_name_from_label(label, 'cb-inst')
+                 for _ in range(count)]
+        zone_name = self.provider.zone_name
+        operation = (self.provider
+                         .gcp_compute.instances()
+                         .bulkInsert(project=self.provider.project_name,
+                                     zone=zone_name,
+                                     body={
+                                         'count': count,
+                                         'minCount': 1,
+                                         'instanceProperties': config,
+                                         'perInstanceProperties': {
+                                             name: {} for name in names}})
+                         .execute())
+        error = None
+        try:
+            self.provider.wait_for_operation(operation, zone=zone_name)
+        except Exception as e:
+            # Some instances may still have been created
+            error = e
+        created = {inst['name']: inst for inst in helpers.iter_all(
+            self.provider.gcp_compute.instances(),
+            project=self.provider.project_name, zone=zone_name,
+            filter='labels.cblabel eq ' + label)}
+        results = []
+        failures = []
+        for index, name in enumerate(names):
+            if name in created:
+                results.append(GCPInstance(self.provider, created[name]))
+            else:
+                failures.append((index, error or ProviderInternalException(
+                    "Instance %s was not created" % name)))
+        return self._batch_result("Instance creation", results, failures)
+
     @dispatch(event="provider.compute.instances.get",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def get(self, instance_id):
@@ -631,6 +735,13 @@ class GCPInstanceService(BaseInstanceService):
         instance = self.provider.get_resource('instances', instance_id)
         return GCPInstance(self.provider, instance) if instance else None
 
+    @dispatch(event="provider.compute.instances.get_many",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        insts = self.provider.get_resources('instances', ids)
+        return {inst_id: GCPInstance(self.provider, inst) if inst else None
+                for inst_id, inst in insts.items()}
+
     @dispatch(event="provider.compute.instances.find",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def find(self, limit=None, marker=None, **kwargs):
@@ -638,17 +749,16 @@ class GCPInstanceService(BaseInstanceService):
         Searches for instances by instance label.
         :return: a list of Instance objects
         """
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        instances = [instance for instance in self.list()
-                     if instance.label == label]
-        return ClientPagedResultList(self.provider, instances,
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label')
+        instances = [GCPInstance(self.provider, inst)
+                     for inst in helpers.iter_all(
+                         self.provider.gcp_compute.instances(),
+                         project=self.provider.project_name,
+                         zone=self.provider.zone_name,
+                         filter=('labels.cblabel eq ' + label
+                                 if label else None))]
+        return ClientPagedResultList(self.provider, query.match(instances),
                                      limit=limit, marker=marker)
 
     @dispatch(event="provider.compute.instances.list",
@@ -691,6 +801,21 @@ class GCPInstanceService(BaseInstanceService):
                      instance=instance.name)
              .execute())
 
+    @dispatch(event="provider.compute.instances.delete_many",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def delete_many(self, instances):
+        instances = [inst if isinstance(inst, GCPInstance) else self.get(inst)
+                     for inst in instances]
+        compute = self.provider.gcp_compute
+        results, failures = helpers.execute_batch(
+            compute,
+            [(inst, compute.instances().delete(
+                project=self.provider.project_name, zone=inst.zone_name,
+                instance=inst.name))
+             for inst in instances if inst])
+        self._batch_result("Instance deletion", [item for item, _ in results],
+                           failures)
+
     def create_launch_config(self):
         return GCPLaunchConfig(self.provider)
 
@@ -763,6 +888,13 @@ class GCPNetworkService(BaseNetworkService):
         network = self.provider.get_resource('networks', network_id)
         return GCPNetwork(self.provider, network) if network else None
 
+    @dispatch(event="provider.networking.networks.get_many",
+              priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        nets = self.provider.get_resources('networks', ids)
+        return {net_id: GCPNetwork(self.provider, net) if net else None
+                for net_id, net in nets.items()}
+
     @dispatch(event="provider.networking.networks.find",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
     def find(self, limit=None, marker=None, **kwargs):
@@ -770,10 +902,10 @@ class GCPNetworkService(BaseNetworkService):
         GCP networks are global. There is at most one network with a given
         name.
         """
-        obj_list = self
-        filters = ['name', 'label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches),
+        query = cb_helpers.FindQuery(['name', 'label'], kwargs)
+        name = query.push_down('name')
+        networks = self.list(filter='name eq ' + name if name else None).data
+        return ClientPagedResultList(self._provider, query.match(networks),
                                      limit=limit, marker=marker)
 
     @dispatch(event="provider.networking.networks.list",
@@ -865,6 +997,14 @@ class GCPRouterService(BaseRouterService):
             'routers', router_id, region=self.provider.region_name)
         return GCPRouter(self.provider, router) if router else None
 
+    @dispatch(event="provider.networking.routers.get_many",
+              priority=BaseRouterService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        routers = self.provider.get_resources(
+            'routers', ids, region=self.provider.region_name)
+        return {router_id: GCPRouter(self.provider, router) if router else None
+                for router_id, router in routers.items()}
+
     @dispatch(event="provider.networking.routers.find",
               priority=BaseRouterService.STANDARD_EVENT_PRIORITY)
     def find(self, limit=None, marker=None, **kwargs):
@@ -962,6 +1102,13 @@ class GCPSubnetService(BaseSubnetService):
         subnet = self.provider.get_resource('subnetworks', subnet_id)
         return GCPSubnet(self.provider, subnet) if subnet else None
 
+    @dispatch(event="provider.networking.subnets.get_many",
+              priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        subnets = self.provider.get_resources('subnetworks', ids)
+        return {subnet_id: GCPSubnet(self.provider, subnet) if subnet else None
+                for subnet_id, subnet in subnets.items()}
+
     @dispatch(event="provider.networking.subnets.list",
               priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
     def list(self, network=None, limit=None, marker=None):
@@ -1125,21 +1272,22 @@ class GCPVolumeService(BaseVolumeService):
         vol = self.provider.get_resource('disks', volume_id)
         return GCPVolume(self.provider, vol) if vol else None
 
+    @dispatch(event="provider.storage.volumes.get_many",
+              priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        vols = self.provider.get_resources('disks', ids)
+        return {vol_id: GCPVolume(self.provider, vol) if vol else None
+                for vol_id, vol in vols.items()}
+
     @dispatch(event="provider.storage.volumes.find",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
     def find(self, limit=None, marker=None, **kwargs):
         """
         Searches for a volume by a given list of attributes.
         """
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        filtr = 'labels.cblabel eq ' + label
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label')
+        filtr = 'labels.cblabel eq ' + label if label else None
         max_result = limit if limit is not None and limit < 500 else 500
         response = (self.provider
                         .gcp_compute
@@ -1157,7 +1305,7 @@ class GCPVolumeService(BaseVolumeService):
                         max_result, len(gcp_vols))
         return ServerPagedResultList('nextPageToken' in response,
                                      response.get('nextPageToken'),
-                                     False, data=gcp_vols)
+                                     False, data=query.match(gcp_vols))
 
     @dispatch(event="provider.storage.volumes.list",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
@@ -1230,6 +1378,21 @@ class GCPVolumeService(BaseVolumeService):
                                    disk=volume.name)
                            .execute())
 
+    @dispatch(event="provider.storage.volumes.delete_many",
+              priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
+    def delete_many(self, volumes):
+        volumes = [vol if isinstance(vol, GCPVolume) else self.get(vol)
+                   for vol in volumes]
+        compute = self.provider.gcp_compute
+        results, failures = helpers.execute_batch(
+            compute,
+            [(vol, compute.disks().delete(
+                project=self.provider.project_name, zone=vol.zone_name,
+                disk=vol.name))
+             for vol in volumes if vol])
+        self._batch_result("Volume deletion", [item for item, _ in results],
+                           failures)
+
 
 class GCPSnapshotService(BaseSnapshotService):
 
@@ -1242,18 +1405,19 @@ class GCPSnapshotService(BaseSnapshotService):
         snapshot = self.provider.get_resource('snapshots', snapshot_id)
         return GCPSnapshot(self.provider, snapshot) if snapshot else None
 
+    @dispatch(event="provider.storage.snapshots.get_many",
+              priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        snaps = self.provider.get_resources('snapshots', ids)
+        return {snap_id: GCPSnapshot(self.provider, snap) if snap else None
+                for snap_id, snap in snaps.items()}
+
     @dispatch(event="provider.storage.snapshots.find",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
     def find(self, limit=None, marker=None, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        filtr = 'labels.cblabel eq ' + label
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.push_down('label')
+        filtr = 'labels.cblabel eq ' + label if label else None
         max_result = limit if limit is not None and limit < 500 else 500
         response = (self.provider
                         .gcp_compute
@@ -1270,7 +1434,7 @@ class GCPSnapshotService(BaseSnapshotService):
                         max_result, len(snapshots))
         return ServerPagedResultList('nextPageToken' in response,
                                      response.get('nextPageToken'),
-                                     False, data=snapshots)
+                                     False, data=query.match(snapshots))
 
     @dispatch(event="provider.storage.snapshots.list",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
@@ -1333,6 +1497,20 @@ class GCPSnapshotService(BaseSnapshotService):
                          snapshot=snapshot.name)
                  .execute())
 
+    @dispatch(event="provider.storage.snapshots.delete_many",
+              priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
+    def delete_many(self, snapshots):
+        snapshots = [snap if isinstance(snap, GCPSnapshot) else self.get(snap)
+                     for snap in snapshots]
+        compute = self.provider.gcp_compute
+        results, failures = helpers.execute_batch(
+            compute,
+            [(snap, compute.snapshots().delete(
+                project=self.provider.project_name, snapshot=snap.name))
+             for snap in snapshots if snap])
+        self._batch_result("Snapshot deletion", [item for item, _ in results],
+                           failures)
+
 
 class GCPBucketService(BaseBucketService):
 
@@ -1350,6 +1528,13 @@ class GCPBucketService(BaseBucketService):
         bucket = self.provider.get_resource('buckets', bucket_id)
         return GCPBucket(self.provider, bucket) if bucket else None
 
+    @dispatch(event="provider.storage.buckets.get_many",
+              priority=BaseBucketService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        buckets = self.provider.get_resources('buckets', ids)
+        return {bucket_id: GCPBucket(self.provider, bucket) if bucket else None
+                for bucket_id, bucket in buckets.items()}
+
     @dispatch(event="provider.storage.buckets.find",
               priority=BaseBucketService.STANDARD_EVENT_PRIORITY)
     def find(self, limit=None, marker=None, **kwargs):
@@ -1472,9 +1657,14 @@ class GCPBucketObjectService(BaseBucketObjectService):
                                      False, data=objects)
 
     def find(self, bucket, limit=None, marker=None, **kwargs):
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, bucket.objects)
-        return ClientPagedResultList(self._provider, list(matches),
+        query = cb_helpers.FindQuery(['name'], kwargs)
+        prefix = query.push_down_prefix('name')
+        objects = [GCPBucketObject(self.provider, bucket, obj)
+                   for obj in helpers.iter_all(
+                       self.provider.gcp_storage.objects(),
+                       bucket=bucket.name,
+                       prefix=prefix if prefix else '')]
+        return ClientPagedResultList(self._provider, query.match(objects),
                                      limit=limit, marker=marker)
 
     def _create_object_with_media_body(self, bucket, name, media_body):
@@ -1638,6 +1828,14 @@ class GCPDnsZoneService(BaseDnsZoneService):
             'managedZones', dns_zone_id, project=self._provider.project_name)
         return GCPDnsZone(self.provider, dns_zone) if dns_zone else None
 
+    @dispatch(event="provider.dns.host_zones.get_many",
+              priority=BaseDnsZoneService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        zones = self.provider.get_resources(
+            'managedZones', ids, project=self._provider.project_name)
+        return {zone_id: GCPDnsZone(self.provider, zone) if zone else None
+                for zone_id, zone in zones.items()}
+
     @dispatch(event="provider.dns.host_zones.list",
               priority=BaseDnsZoneService.STANDARD_EVENT_PRIORITY)
     def list(self, limit=None, marker=None):
@@ -6,6 +6,10 @@ import logging as log
 
 from cloudbridge.base.resources import ServerPagedResultList
 
+# Number of ids passed per Neutron list request, to keep the query string
+# well within URL length limits
+ID_FILTER_CHUNK_SIZE = 100
+
 
 def os_result_limit(provider, requested_limit=None):
     """
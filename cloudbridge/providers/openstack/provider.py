@@ -2,6 +2,7 @@
 
 import inspect
 
+from keystoneauth1 import exceptions as ks_exceptions
 from keystoneauth1 import session
 
 from keystoneclient import client as keystone_client
@@ -17,7 +18,11 @@ from swiftclient import client as swift_client
 
 from cloudbridge.base import BaseCloudProvider
 from cloudbridge.base.helpers import get_env
+from cloudbridge.base.recording import CassetteAdapter
 
+from .resources import OpenStackInstance
+from .resources import OpenStackSnapshot
+from .resources import OpenStackVolume
 from .services import OpenStackComputeService
 from .services import OpenStackDnsService
 from .services import OpenStackNetworkingService
@@ -57,17 +62,9 @@ class OpenStackCloudProvider(BaseCloudProvider):
             'os_user_domain_name',
             get_env('OS_USER_DOMAIN_NAME'))
 
-        # Service connections, lazily initialized
-        self._nova = None
-        self._keystone = None
-        self._swift = None
-        self._neutron = None
-        self._os_conn = None
+        self._initialize_services()
 
-        # Additional cached variables
-        self._cached_keystone_session = None
-
-        # Initialize provider services
+    def _initialize_services(self):
         self._compute = OpenStackComputeService(self)
         self._networking = OpenStackNetworkingService(self)
         self._security = OpenStackSecurityService(self)
@@ -76,15 +73,11 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
     @property
     def nova(self):
-        if not self._nova:
-            self._nova = self._connect_nova()
-        return self._nova
+        return self._sdk_clients.get('nova', self._connect_nova)
 
     @property
     def keystone(self):
-        if not self._keystone:
-            self._keystone = self._connect_keystone()
-        return self._keystone
+        return self._sdk_clients.get('keystone', self._connect_keystone)
 
     @property
     def _keystone_version(self):
@@ -107,9 +100,13 @@ class OpenStackCloudProvider(BaseCloudProvider):
         :rtype: :class:`keystoneauth1.session.Session`
         :return: A Keystone session object.
         """
-        if self._cached_keystone_session:
-            return self._cached_keystone_session
+        return self._sdk_clients.get('keystone_session',
+                                     self._connect_keystone_session)
 
+    def _connect_keystone_session(self):
+        # A replayed token has usually expired, but must still be used
+        reauthenticate = (not self._sdk_cassette or
+                          self._sdk_cassette.recording)
         if self._keystone_version == 3:
             from keystoneauth1.identity import v3
             auth = v3.Password(auth_url=self.auth_url,
@@ -118,18 +115,19 @@ class OpenStackCloudProvider(BaseCloudProvider):
                                user_domain_name=self.user_domain_name,
                                project_domain_id=self.project_domain_id,
                                project_domain_name=self.project_domain_name,
-                               project_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
+                               project_name=self.project_name,
+                               reauthenticate=reauthenticate)
+            return self._add_cassette(session.Session(auth=auth))
         else:
             from keystoneauth1.identity import v2
             auth = v2.Password(self.auth_url, username=self.username,
                                password=self.password,
-                               tenant_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
-        return self._cached_keystone_session
+                               tenant_name=self.project_name,
+                               reauthenticate=reauthenticate)
+            return self._add_cassette(session.Session(auth=auth))
 
     def _connect_openstack(self):
-        return connection.Connection(
+        conn = connection.Connection(
             region_name=self.region_name,
             user_agent='cloudbridge',
             auth_url=self.auth_url,
@@ -140,24 +138,39 @@ class OpenStackCloudProvider(BaseCloudProvider):
             project_domain_id=self.project_domain_id,
             project_domain_name=self.project_domain_name
         )
+        if self._sdk_cassette:
+            self._add_cassette(conn.session)
+            conn.session.auth.reauthenticate = self._sdk_cassette.recording
+        return conn
+
+    def _add_cassette(self, keystone_session):
+        if self._sdk_cassette:
+            CassetteAdapter.mount(self._sdk_cassette, keystone_session.session)
+        return keystone_session
+
+    def _use_cassette(self, cassette):
+        # All clients send requests through a keystone session, except for
+        # Swift, whose object requests use swiftclient's own connections
+        # and are not recorded
+        self._sdk_cassette = cassette
+        keystone_session = self._sdk_clients.peek('keystone_session')
+        if keystone_session:
+            self._add_cassette(keystone_session)
+        os_conn = self._sdk_clients.peek('os_conn')
+        if os_conn:
+            self._add_cassette(os_conn.session)
 
     @property
     def swift(self):
-        if not self._swift:
-            self._swift = self._connect_swift()
-        return self._swift
+        return self._sdk_clients.get('swift', self._connect_swift)
 
     @property
     def neutron(self):
-        if not self._neutron:
-            self._neutron = self._connect_neutron()
-        return self._neutron
+        return self._sdk_clients.get('neutron', self._connect_neutron)
 
     @property
     def os_conn(self):
-        if not self._os_conn:
-            self._os_conn = self._connect_openstack()
-        return self._os_conn
+        return self._sdk_clients.get('os_conn', self._connect_openstack)
 
     @property
     def compute(self):
@@ -179,13 +192,52 @@ class OpenStackCloudProvider(BaseCloudProvider):
     def dns(self):
         return self._dns
 
+    def _refresh_all(self, resources):
+        # Nova and Cinder cannot filter by a list of ids, so fetch the full
+        # listing once per round instead of one GET per resource
+        if isinstance(resources[0], OpenStackInstance):
+            data_attr = '_os_instance'
+            current = self.nova.servers.list()
+        elif isinstance(resources[0], OpenStackVolume):
+            data_attr = '_volume'
+            current = self.os_conn.block_storage.volumes()
+        elif isinstance(resources[0], OpenStackSnapshot):
+            data_attr = '_snapshot'
+            current = self.os_conn.block_storage.snapshots()
+        else:
+            return super(OpenStackCloudProvider, self)._refresh_all(resources)
+
+        found = {item.id: item for item in current}
+        for res in resources:
+            data = found.get(res.id)
+            if data:
+                setattr(res, data_attr, data)
+            else:
+                # The resource no longer exists, set the status to unknown
+                getattr(res, data_attr).status = 'unknown'
+
+    def _classify_error(self, error):
+        if isinstance(error, ks_exceptions.RetriableConnectionFailure):
+            return 'transient'
+        # Each OpenStack client has its own exception types, which hold the
+        # HTTP status under different names
+        status = next((getattr(error, attr) for attr in
+                       ('http_status', 'status_code', 'code')
+                       if isinstance(getattr(error, attr, None), int)), 0)
+        if status in (413, 429):
+            # Nova reports rate limiting with 413 in older API versions
+            return 'throttled'
+        if status >= 500:
+            return 'transient'
+        return super(OpenStackCloudProvider, self)._classify_error(error)
+
     def _connect_nova(self):
         return self._connect_nova_region(self.region_name)
 
     def _connect_nova_region(self, region_name):
         """Get an OpenStack Nova (compute) client object."""
         # Force reauthentication with Keystone
-        self._cached_keystone_session = None
+        self._sdk_clients.discard('keystone_session')
 
         api_version = self._get_config_value(
             'os_compute_api_version',
@@ -1,11 +1,13 @@
 """
 DataTypes used by this provider
 """
-import inspect
 import ipaddress
+import json
 import logging
 import os
 import re
+import threading
+import uuid
 
 try:
     from urllib.parse import urlparse
@@ -43,6 +45,7 @@ from cloudbridge.base.resources import BaseVMFirewall
 from cloudbridge.base.resources import BaseVMFirewallRule
 from cloudbridge.base.resources import BaseVMType
 from cloudbridge.base.resources import BaseVolume
+from cloudbridge.base.resources import StreamingUploadSource
 from cloudbridge.interfaces.resources import GatewayState
 from cloudbridge.interfaces.resources import InstanceState
 from cloudbridge.interfaces.resources import MachineImageState
@@ -261,6 +264,9 @@ class OpenStackVMType(BaseVMType):
 
 class OpenStackInstance(BaseInstance):
 
+    # The subnet is found by looking up the instance's ports
+    RESOLVED_FIELDS = BaseInstance.RESOLVED_FIELDS + ('subnet_id',)
+
     # ref: http://docs.openstack.org/developer/nova/v2/2.0_server_concepts.html
     # and http://developer.openstack.org/api-ref-compute-v2.html
     INSTANCE_STATE_MAP = {
@@ -773,6 +779,8 @@ class OpenStackSnapshot(BaseSnapshot):
 
 class OpenStackNetwork(BaseNetwork):
 
+    RESOLVED_FIELDS = BaseNetwork.RESOLVED_FIELDS + ('state',)
+
     # Ref: https://github.com/openstack/neutron/blob/master/neutron/plugins/
     #      common/constants.py
     _NETWORK_STATE_MAP = {
@@ -948,6 +956,8 @@ class OpenStackFloatingIP(BaseFloatingIP):
 
 class OpenStackRouter(BaseRouter):
 
+    RESOLVED_FIELDS = BaseRouter.RESOLVED_FIELDS + ('network_id',)
+
     def __init__(self, provider, router):
         super(OpenStackRouter, self).__init__(provider)
         self._router = router
@@ -1159,13 +1169,6 @@ class OpenStackVMFirewall(BaseVMFirewall):
         self._vm_firewall = self._provider.os_conn.network.get_security_group(
             self.id)
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not(inspect.isroutine(a)))
-        js = {k: v for(k, v) in attr if not k.startswith('_')}
-        json_rules = [r.to_json() for r in self.rules]
-        js['rules'] = json_rules
-        return js
-
 
 class OpenStackVMFirewallRule(BaseVMFirewallRule):
 
@@ -1218,6 +1221,9 @@ class OpenStackVMFirewallRule(BaseVMFirewallRule):
 
 
 class OpenStackBucketObject(BaseBucketObject):
+    # Static large object limits
+    MAX_PART_SIZE = FIVE_GIG
+    MAX_PARTS = 1000
 
     def __init__(self, provider, cbcontainer, obj):
         super(OpenStackBucketObject, self).__init__(provider)
@@ -1247,6 +1253,22 @@ class OpenStackBucketObject(BaseBucketObject):
             self.cbcontainer.name, self.name, resp_chunk_size=65536)
         return content
 
+    def _content_version(self):
+        return self._obj.get("hash")
+
+    def _read_range(self, start, end, version=None):
+        headers = {'Range': "bytes={0}-{1}".format(start, end - 1)}
+        if version:
+            headers['If-Match'] = '"{0}"'.format(version)
+        try:
+            _, content = self._provider.swift.get_object(
+                self.cbcontainer.name, self.name, headers=headers)
+        except swiftclient.ClientException as e:
+            if e.http_status == 412:
+                raise self._version_changed(e)
+            raise
+        return content
+
     def upload(self, data):
         """
         Set the contents of this object to the data read from the source
@@ -1257,10 +1279,11 @@ class OpenStackBucketObject(BaseBucketObject):
         self._provider.swift.put_object(self.cbcontainer.name, self.name,
                                         data)
 
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, part_size=None, concurrency=None):
         """
         Stores the contents of the file pointed by the ``path`` variable.
-        If the file is bigger than 5 Gig, it will be broken into segments.
+        If the file is bigger than the part size, it is uploaded as the
+        segments of a static large object, several segments at a time.
 
         :type path: ``str``
         :param path: Absolute path to the file to be uploaded to Swift.
@@ -1268,25 +1291,28 @@ class OpenStackBucketObject(BaseBucketObject):
         :return: ``True`` if successful, ``False`` if not.
 
         .. note::
-            * The size of the segments chosen (or any of the other upload
-              options) is not under user control.
             * If called this method will remap the
               ``swiftclient.service.get_conn`` factory method to
               ``self._provider._connect_swift``
 
         .. seealso:: https://github.com/CloudVE/cloudbridge/issues/35#issuecomment-297629661 # noqa
         """
+        file_size = os.path.getsize(path)
+        part_size = self._get_part_size(file_size, part_size)
         upload_options = {}
-        if 'segment_size' not in upload_options:
-            if os.path.getsize(path) >= FIVE_GIG:
-                upload_options['segment_size'] = FIVE_GIG
+        if file_size > part_size:
+            upload_options['segment_size'] = part_size
+            upload_options['use_slo'] = True
 
         # remap the swift service's connection factory method
         # pylint:disable=protected-access
         swiftclient.service.get_conn = self._provider._connect_swift
 
         result = True
-        with SwiftService() as swift:
+        with SwiftService(options={
+                'segment_threads': (concurrency or
+                                    self._provider.config.parallel_workers)
+                }) as swift:
             upload_object = SwiftUploadObject(path, object_name=self.name)
             for up_res in swift.upload(self.cbcontainer.name,
                                        [upload_object, ],
@@ -1294,6 +1320,45 @@ class OpenStackBucketObject(BaseBucketObject):
                 result = result and up_res['success']
         return result
 
+    def upload_stream(self, source, size_hint=None, part_size=None,
+                      concurrency=None):
+        """
+        Stores the data read from a stream. Data larger than the part size
+        is uploaded as the segments of a static large object, several
+        segments at a time, into the ``<container>_segments`` container that
+        :meth:`upload_from_file` also uses.
+        """
+        part_size = self._get_part_size(size_hint or 0, part_size)
+        segment_container = "{0}_segments".format(self.cbcontainer.name)
+        prefix = "{0}/slo/{1}".format(self.name, uuid.uuid4().hex)
+        lock = threading.Lock()
+        created = []
+
+        def upload_whole(data):
+            self._provider.swift.put_object(
+                self.cbcontainer.name, self.name,
+                StreamingUploadSource.to_bytes(data))
+
+        def upload_segment(index, data):
+            with lock:
+                if not created:
+                    self._provider.swift.put_container(segment_container)
+                    created.append(segment_container)
+            name = "{0}/{1:08d}".format(prefix, index)
+            etag = self._provider.swift.put_object(
+                segment_container, name,
+                StreamingUploadSource.to_bytes(data))
+            return {'path': "/{0}/{1}".format(segment_container, name),
+                    'etag': etag, 'size_bytes': len(data)}
+
+        segments = self._upload_stream_parts(
+            source, part_size, concurrency, upload_segment, upload_whole)
+        if segments is not None:
+            self._provider.swift.put_object(
+                self.cbcontainer.name, self.name, json.dumps(segments),
+                query_string='multipart-manifest=put')
+        return True
+
     def delete(self):
         """
         Delete this object.
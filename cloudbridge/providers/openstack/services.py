@@ -398,23 +398,21 @@ class OpenStackVolumeService(BaseVolumeService):
     @dispatch(event="provider.storage.volumes.find",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        search_opts = {'limit': oshelpers.os_result_limit(self.provider),
+                       'marker': None}
+        label = query.push_down('label')
+        if label:
+            search_opts['name'] = label
 
         log.debug("Searching for an OpenStack Volume with the label %s", label)
         cb_vols = [
             OpenStackVolume(self.provider, vol)
             for vol in self.provider.os_conn.block_storage.volumes(
-                name=label,
-                limit=oshelpers.os_result_limit(self.provider),
-                marker=None)
+                **search_opts)
             if vol.availability_zone == self.provider.service_zone_name(self)]
-        return oshelpers.to_server_paged_list(self.provider, cb_vols)
+        return oshelpers.to_server_paged_list(self.provider,
+                                              query.match(cb_vols))
 
     @dispatch(event="provider.storage.volumes.list",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
@@ -469,26 +467,23 @@ class OpenStackSnapshotService(BaseSnapshotService):
     @dispatch(event="provider.storage.snapshots.find",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        search_opts = {'name': label,  # TODO: Cinder is ignoring name
-                       'limit': oshelpers.os_result_limit(self.provider),
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        search_opts = {'limit': oshelpers.os_result_limit(self.provider),
                        'marker': None}
+        label = query.predicates.get('label')
+        if label and not cb_helpers.has_wildcards(label):
+            # TODO: Cinder is ignoring name, so it only narrows the listing
+            # and the label is still matched on the client
+            search_opts['name'] = label
         log.debug("Searching for an OpenStack snapshot with the following "
                   "params: %s", search_opts)
         cb_snaps = [
             OpenStackSnapshot(self.provider, snap) for
             snap in self.provider.os_conn.block_storage.snapshots(
-                **search_opts)
-            if snap.name == label]
+                **search_opts)]
 
-        return oshelpers.to_server_paged_list(self.provider, cb_snaps)
+        return oshelpers.to_server_paged_list(self.provider,
+                                              query.match(cb_snaps))
 
     @dispatch(event="provider.storage.snapshots.list",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
@@ -632,12 +627,13 @@ class OpenStackBucketObjectService(BaseBucketObjectService):
             limit)
 
     def find(self, bucket, **kwargs):
-        _, obj_list = self.provider.swift.get_container(bucket.name)
+        query = cb_helpers.FindQuery(['name'], kwargs)
+        _, obj_list = self.provider.swift.get_container(
+            bucket.name, prefix=query.push_down_prefix('name'),
+            full_listing=True)
         cb_objs = [OpenStackBucketObject(self.provider, bucket, obj)
                    for obj in obj_list]
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, cb_objs)
-        return ClientPagedResultList(self.provider, list(matches))
+        return ClientPagedResultList(self.provider, query.match(cb_objs))
 
     def create(self, bucket, object_name):
         self.provider.swift.put_object(bucket.name, object_name, None)
@@ -865,24 +861,21 @@ class OpenStackInstanceService(BaseInstanceService):
     @dispatch(event="provider.compute.instances.find",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        search_opts = {'name': label,
-                       'availability_zone': self.provider
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        search_opts = {'availability_zone': self.provider
                                                 .service_zone_name(self)}
+        # Nova matches server names against a regular expression
+        label = query.push_down('label', wildcards=True)
+        if label:
+            search_opts['name'] = cb_helpers.glob_to_regex(label)
         cb_insts = [
             OpenStackInstance(self.provider, inst)
             for inst in self.provider.nova.servers.list(
                 search_opts=search_opts,
                 limit=oshelpers.os_result_limit(self.provider),
                 marker=None)]
-        return oshelpers.to_server_paged_list(self.provider, cb_insts)
+        return oshelpers.to_server_paged_list(self.provider,
+                                              query.match(cb_insts))
 
     @dispatch(event="provider.compute.instances.list",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
@@ -922,6 +915,21 @@ class OpenStackInstanceService(BaseInstanceService):
             return None
         return OpenStackInstance(self.provider, os_instance)
 
+    @dispatch(event="provider.compute.instances.get_many",
+              priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        # Nova can only filter by a single id, so look the instances up in
+        # one listing of the current zone instead of one request per id
+        ids = list(dict.fromkeys(ids))
+        wanted = set(ids)
+        search_opts = {'availability_zone': self.provider
+                                                .service_zone_name(self)}
+        found = {inst.id: OpenStackInstance(self.provider, inst)
+                 for inst in self.provider.nova.servers.list(
+                     search_opts=search_opts, limit=-1)
+                 if inst.id in wanted}
+        return {inst_id: found.get(inst_id) for inst_id in ids}
+
     @dispatch(event="provider.compute.instances.delete",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def delete(self, instance):
@@ -1047,18 +1055,31 @@ class OpenStackNetworkService(BaseNetworkService):
         network = (n for n in self if n.id == network_id)
         return next(network, None)
 
+    @dispatch(event="provider.networking.networks.get_many",
+              priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for i in range(0, len(ids), oshelpers.ID_FILTER_CHUNK_SIZE):
+            for network in self._list_in_zone(
+                    id=ids[i:i + oshelpers.ID_FILTER_CHUNK_SIZE]):
+                found[network.id] = network
+        return {net_id: found.get(net_id) for net_id in ids}
+
+    def _list_in_zone(self, **filters):
+        return [OpenStackNetwork(self.provider, network)
+                for network in self.provider.neutron.list_networks(
+                    **filters).get('networks') if network
+                # If there are no availability zones, keep the network
+                # in the results list
+                and (not network.get('availability_zones')
+                     or self.provider.service_zone_name(self)
+                     in network.get('availability_zones'))]
+
     @dispatch(event="provider.networking.networks.list",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
     def list(self, limit=None, marker=None):
-        networks = [OpenStackNetwork(self.provider, network)
-                    for network in self.provider.neutron.list_networks()
-                    .get('networks') if network
-                    # If there are no availability zones, keep the network
-                    # in the results list
-                    and (not network.get('availability_zones')
-                         or self.provider.service_zone_name(self)
-                         in network.get('availability_zones'))]
-        return ClientPagedResultList(self.provider, networks,
+        return ClientPagedResultList(self.provider, self._list_in_zone(),
                                      limit=limit, marker=marker)
 
     @dispatch(event="provider.networking.networks.find",
@@ -1111,6 +1132,18 @@ class OpenStackSubnetService(BaseSubnetService):
         subnet = (s for s in self if s.id == subnet_id)
         return next(subnet, None)
 
+    @dispatch(event="provider.networking.subnets.get_many",
+              priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
+    def get_many(self, ids):
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for i in range(0, len(ids), oshelpers.ID_FILTER_CHUNK_SIZE):
+            for subnet in self.provider.neutron.list_subnets(
+                    id=ids[i:i + oshelpers.ID_FILTER_CHUNK_SIZE]).get(
+                        'subnets', []):
+                found[subnet['id']] = OpenStackSubnet(self.provider, subnet)
+        return {sn_id: found.get(sn_id) for sn_id in ids}
+
     @dispatch(event="provider.networking.subnets.list",
               priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
     def list(self, network=None, limit=None, marker=None):
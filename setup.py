@@ -85,7 +85,7 @@ setup(
         'full': REQS_FULL,
         'dev': REQS_DEV
     },
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     license='MIT',
     classifiers=[
         'Development Status :: 4 - Beta',
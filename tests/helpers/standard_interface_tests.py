@@ -5,6 +5,7 @@ This includes:
    2. Checking for object equality and repr
    3. Checking standard behaviour for list, iter, find, get, delete
 """
+import json
 import uuid
 
 import tenacity
@@ -35,6 +36,15 @@ def check_json(test, obj):
     test.assertEqual(val.get('name'), obj.name)
     if isinstance(obj, LabeledCloudResource):
         test.assertEqual(val.get('label'), obj.label)
+    # to_json() keeps all fields for compatibility
+    test.assertEqual(set(val), set(obj.SERIALIZED_FIELDS))
+    # Fields which require calls to the provider must only be included
+    # when resolved
+    local = obj.to_dict()
+    for field in obj.RESOLVED_FIELDS:
+        test.assertNotIn(field, local)
+    test.assertEqual(json.loads(next(cb_helpers.iter_json_lines([obj]))),
+                     json.loads(json.dumps(local, default=str)))
 
 
 def check_obj_properties(test, obj):
@@ -127,6 +137,18 @@ def check_get_non_existent(test, service):
         % (type(service).__name__, get_objs))
 
 
+def check_get_many(test, service, obj):
+    missing_id = 'tmp-' + str(uuid.uuid4())[:28]
+    objs = service.get_many([obj.id, missing_id, obj.id])
+    test.assertListEqual(sorted(objs), sorted([obj.id, missing_id]))
+    test.assertEqual(objs[obj.id].id, obj.id)
+    test.assertIsInstance(objs[obj.id], type(obj))
+    test.assertIsNone(
+        objs[missing_id],
+        "Get many with a non-existent id for %s returned unexpected "
+        "object: %s" % (type(service).__name__, objs[missing_id]))
+
+
 @tenacity.retry(stop=tenacity.stop_after_attempt(10),
                 retry=tenacity.retry_if_exception_type(AssertionError),
                 wait=tenacity.wait_fixed(10),
@@ -217,6 +239,8 @@ def check_standard_behaviour(test, service, obj):
     check_find_non_existent(test, service, obj)
     obj_get = check_get(test, service, obj)
     check_get_non_existent(test, service)
+    if hasattr(service, 'get_many'):
+        check_get_many(test, service, obj)
 
     test.assertTrue(
         obj.id == objs_list[0].id == objs_iter[0].id ==
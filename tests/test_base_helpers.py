@@ -1,7 +1,21 @@
+import io
+import json
+import threading
+import time
 import unittest
+from io import BytesIO
+from unittest import mock
+
+from botocore.exceptions import ClientError
 
 from cloudbridge.base import helpers as cb_helpers
+from cloudbridge.base.resources import BaseCloudResource
+from cloudbridge.base.resources import BucketObjectReader
+from cloudbridge.base.resources import RangedContentStream
+from cloudbridge.base.resources import StreamingUploadSource
 from cloudbridge.interfaces.exceptions import InvalidParamException
+from cloudbridge.providers.aws.resources import AWSInstance
+from cloudbridge.providers.aws.resources import AWSNetwork
 
 
 class BaseHelpersTestCase(unittest.TestCase):
@@ -100,3 +114,442 @@ class BaseHelpersTestCase(unittest.TestCase):
 
         with self.assertRaises(InvalidParamException):
             custom_func(new_param="world", old_param="hello")
+
+    def test_prefetch_yields_all_items_in_order(self):
+        self.assertListEqual(list(cb_helpers.prefetch(iter(range(50)), 3)),
+                             list(range(50)))
+
+    def test_prefetch_reraises_exception(self):
+        class CustomException(Exception):
+            pass
+
+        def failing_iter():
+            yield 1
+            raise CustomException()
+
+        results = cb_helpers.prefetch(failing_iter(), 2)
+        self.assertEqual(next(results), 1)
+        with self.assertRaises(CustomException):
+            next(results)
+
+    def test_prefetch_reraises_base_exception(self):
+        def exiting_iter():
+            yield 1
+            raise SystemExit()
+
+        results = cb_helpers.prefetch(exiting_iter(), 2)
+        self.assertEqual(next(results), 1)
+        # The consumer must not block waiting for the end of the items
+        with self.assertRaises(SystemExit):
+            next(results)
+
+    def test_prefetch_is_bounded(self):
+        produced = []
+
+        def counting_iter():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        results = cb_helpers.prefetch(counting_iter(), 2)
+        self.assertEqual(next(results), 0)
+        time.sleep(0.3)
+        # at most: one consumed, two queued and one waiting to be queued
+        self.assertLessEqual(len(produced), 4)
+        results.close()
+
+    def test_client_cache_is_shared_by_default(self):
+        clients = cb_helpers.ClientCache()
+        main_client = clients.get('conn', object)
+        thread_clients = []
+        thread = threading.Thread(target=lambda: thread_clients.append(
+            clients.get('conn', object)))
+        thread.start()
+        thread.join()
+        self.assertIs(thread_clients[0], main_client)
+
+    def test_client_cache_is_per_thread_when_thread_safe(self):
+        clients = cb_helpers.ClientCache()
+        main_client = clients.get('conn', object)
+        clients.enable_thread_safety()
+        self.assertTrue(clients.thread_safe)
+        # the current thread keeps its clients
+        self.assertIs(clients.get('conn', object), main_client)
+        thread_clients = []
+
+        def worker():
+            thread_clients.append(clients.peek('conn'))
+            thread_clients.append(clients.get('conn', object))
+            thread_clients.append(clients.get('conn', object))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertIsNone(thread_clients[0])
+        self.assertIsNot(thread_clients[1], main_client)
+        self.assertIs(thread_clients[1], thread_clients[2])
+        clients.discard('conn')
+        self.assertIsNone(clients.peek('conn'))
+
+    def test_parallel_executor(self):
+        executor = cb_helpers.ParallelExecutor(max_workers=4)
+        try:
+            self.assertListEqual(
+                list(executor.map(lambda x: x * 2, range(20))),
+                [x * 2 for x in range(20)])
+            futures = [executor.submit(pow, 2, i) for i in range(5)]
+            self.assertSetEqual(
+                {f.result() for f in executor.as_completed(futures)},
+                {1, 2, 4, 8, 16})
+            with self.assertRaises(ZeroDivisionError):
+                list(executor.map(lambda x: 1 / x, [1, 0]))
+            self.assertListEqual(
+                list(executor.map(pow, [2, 3], [2, 2], timeout=5,
+                                  chunksize=2)), [4, 9])
+            # Unknown keyword arguments are not silently ignored
+            with self.assertRaises(TypeError):
+                executor.map(pow, [2], [2], chunk_size=2)
+        finally:
+            executor.shutdown()
+
+    def test_parallel_executor_map_limited(self):
+        executor = cb_helpers.ParallelExecutor(max_workers=4)
+        lock = threading.Lock()
+        in_flight = [0, 0]
+        calls = []
+
+        def run(x):
+            with lock:
+                calls.append(x)
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            if x == 5:
+                raise ValueError(x)
+            return x * 2
+
+        try:
+            self.assertListEqual(executor.map_limited(run, range(5), 2),
+                                 [0, 2, 4, 6, 8])
+            self.assertEqual(in_flight[1], 2)
+            # No more items are taken once a call has failed
+            with self.assertRaises(ValueError):
+                executor.map_limited(run, range(5, 100), 2)
+            self.assertLess(len(calls), 10)
+
+            # Items are only pulled from the iterable once a slot is free
+            held = [0, 0]
+
+            def items():
+                for x in range(10):
+                    with lock:
+                        held[0] += 1
+                        held[1] = max(held)
+                    yield x
+
+            def release(x):
+                time.sleep(0.01)
+                with lock:
+                    held[0] -= 1
+
+            executor.map_limited(release, items(), 2)
+            self.assertEqual(held[1], 2)
+        finally:
+            executor.shutdown()
+
+    def test_ranged_content_stream(self):
+        content = bytes(bytearray(range(256))) * 4
+        ranges = []
+
+        def read_range(start, end):
+            ranges.append((start, end))
+            return content[start:end]
+
+        self.assertEqual(b''.join(RangedContentStream(read_range, 1024, 300)),
+                         content)
+        self.assertListEqual(ranges, [(0, 300), (300, 600), (600, 900),
+                                      (900, 1024)])
+        stream = RangedContentStream(read_range, 1024, 300)
+        del ranges[:]
+        self.assertEqual(stream.read(10), content[:10])
+        self.assertEqual(stream.read(500), content[10:510])
+        self.assertListEqual(ranges, [(0, 300), (300, 600)])
+        # Iteration continues from the current position
+        self.assertEqual(next(iter(stream)), content[510:600])
+        self.assertEqual(stream.read(), content[600:])
+        self.assertEqual(stream.read(10), b'')
+        self.assertEqual(RangedContentStream(read_range, 0, 300).read(), b'')
+
+    def test_bucket_object_reader(self):
+        content = bytes(bytearray(range(256))) * 4
+        ranges = []
+
+        def read_range(start, end):
+            ranges.append((start, end))
+            return content[start:end]
+
+        reader = BucketObjectReader(read_range, 1024, block_size=100,
+                                    readahead=300, cache_size=400)
+        # Random reads only fetch the blocks they touch
+        self.assertEqual(reader.seek(-24, io.SEEK_END), 1000)
+        self.assertEqual(reader.read(), content[1000:])
+        self.assertEqual(reader.read_range(150, 250), content[150:250])
+        self.assertListEqual(ranges, [(1000, 1024), (100, 300)])
+        # Cached blocks are not fetched again
+        self.assertEqual(reader.read_range(120, 180), content[120:180])
+        self.assertEqual(len(ranges), 2)
+        # Reads that continue from the previous read fetch the readahead
+        # window, skipping cached blocks
+        del ranges[:]
+        reader.seek(0)
+        self.assertEqual(reader.read(10), content[:10])
+        self.assertEqual(reader.read(50), content[10:60])
+        self.assertListEqual(ranges, [(0, 100)])
+        buf = bytearray(500)
+        self.assertEqual(reader.readinto(buf), 500)
+        self.assertEqual(bytes(buf), content[60:560])
+        self.assertListEqual(ranges, [(0, 100), (300, 600)])
+        self.assertEqual(reader.tell(), 560)
+        # The least recently used blocks were evicted
+        del ranges[:]
+        self.assertEqual(reader.read_range(0, 10), content[:10])
+        self.assertListEqual(ranges, [(0, 100)])
+        # Works with a buffered reader
+        reader.seek(0)
+        self.assertEqual(io.BufferedReader(reader).read(), content)
+        reader.close()
+        self.assertRaises(ValueError, reader.read, 1)
+        # A new reader reads ahead from the start
+        del ranges[:]
+        reader = BucketObjectReader(read_range, 1024, block_size=100,
+                                    readahead=300, cache_size=400)
+        self.assertEqual(reader.read(10), content[:10])
+        self.assertListEqual(ranges, [(0, 300)])
+
+    def test_bucket_object_reader_short_reads(self):
+        content = bytes(bytearray(range(256))) * 4
+        ranges = []
+
+        def read_range(start, end):
+            # Returns at most 150 bytes, like a truncated response
+            ranges.append((start, end))
+            return content[start:min(end, start + 150)]
+
+        reader = BucketObjectReader(read_range, 1024, block_size=100,
+                                    readahead=300, cache_size=1000)
+        buf = bytearray(250)
+        # The position only advances by the bytes actually read
+        self.assertEqual(reader.readinto(buf), 150)
+        self.assertEqual(bytes(buf[:150]), content[:150])
+        self.assertEqual(reader.tell(), 150)
+        # The incomplete block is fetched again rather than cached
+        self.assertEqual(reader.read(100), content[150:250])
+        self.assertListEqual(ranges, [(0, 300), (100, 400)])
+        reader.seek(0)
+        self.assertEqual(reader.read(), content)
+        self.assertEqual(reader.tell(), 1024)
+
+    def test_streaming_upload_source(self):
+        content = bytes(bytearray(range(256))) * 4
+
+        class Pipe(object):
+            # Returns short reads, like a pipe
+            def __init__(self):
+                self.data = BytesIO(content)
+
+            def read(self, size=-1):
+                return self.data.read(min(size, 100) if size > 0 else size)
+
+        chunks = [content[i:i + 70] for i in range(0, len(content), 70)]
+        for source in (content, memoryview(content), Pipe(), iter(chunks)):
+            parts = list(StreamingUploadSource(source).iter_parts(300))
+            self.assertListEqual([len(part) for part in parts],
+                                 [300, 300, 300, 124])
+            self.assertEqual(b''.join(parts), content)
+        # Parts of bytes are views of the data rather than copies
+        part = next(StreamingUploadSource(content).iter_parts(300))
+        self.assertIsInstance(part, memoryview)
+        self.assertIs(part.obj, content)
+        # Chunks of the part size are passed through
+        chunk = content[:300]
+        source = StreamingUploadSource(iter([chunk, content[300:]]))
+        self.assertIs(source.read_part(300), chunk)
+        self.assertEqual(StreamingUploadSource(iter(chunks)).read(),
+                         content)
+        self.assertListEqual(list(StreamingUploadSource(b'').iter_parts(10)),
+                             [])
+
+    def test_rate_limiter_adapts_to_throttling(self):
+        limiter = cb_helpers.AdaptiveRateLimiter(min_rate=1)
+        # Requests are not held back until throttled
+        for _ in range(20):
+            limiter.acquire('compute')
+        self.assertIsNone(limiter.rate('compute'))
+
+        limiter.record_throttle('compute')
+        self.assertEqual(limiter.rate('compute'), 10)
+        # Throttling reported by concurrent requests cuts the rate once
+        limiter.record_throttle('compute')
+        self.assertEqual(limiter.rate('compute'), 10)
+        for _ in range(10):
+            limiter.record_success('compute')
+        self.assertAlmostEqual(limiter.rate('compute'), 11, delta=0.1)
+        # Other families are not affected
+        self.assertIsNone(limiter.rate('storage'))
+
+        start = time.time()
+        for _ in range(3):
+            limiter.acquire('compute')
+        self.assertGreater(time.time() - start, 0.1)
+
+    def test_rate_limiter_honours_retry_after(self):
+        limiter = cb_helpers.AdaptiveRateLimiter(max_rate=1000)
+        limiter.record_throttle('compute', retry_after=0.3)
+        start = time.time()
+        limiter.acquire('compute')
+        self.assertGreaterEqual(time.time() - start, 0.25)
+        self.assertEqual(cb_helpers.parse_retry_after('2'), 2.0)
+        self.assertIsNone(cb_helpers.parse_retry_after(None))
+        self.assertAlmostEqual(
+            cb_helpers.parse_retry_after(time.strftime(
+                "%a, %d %b %Y %H:%M:%S GMT",
+                time.gmtime(time.time() + 60))), 60, delta=2)
+
+    def test_retry_call(self):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ValueError("flaky")
+            return "done"
+
+        self.assertEqual(cb_helpers.retry_call(
+            flaky, lambda e: isinstance(e, ValueError), base_delay=0.01),
+            "done")
+        self.assertEqual(len(calls), 3)
+
+        # Exceptions that are not retryable are raised straight away
+        del calls[:]
+        with self.assertRaises(ValueError):
+            cb_helpers.retry_call(flaky, lambda e: False)
+        self.assertEqual(len(calls), 1)
+
+        # The last exception is raised once attempts run out
+        del calls[:]
+        with self.assertRaises(ValueError):
+            cb_helpers.retry_call(flaky, lambda e: True, max_attempts=2,
+                                  base_delay=0.01)
+        self.assertEqual(len(calls), 2)
+
+    def test_retry_call_min_delay(self):
+        def failing():
+            raise ValueError("still in use")
+
+        # With the lowest possible jitter, the waits still add up to the
+        # minimum delay between each attempt
+        with mock.patch('random.uniform', lambda low, high: low), \
+                mock.patch('time.sleep') as sleep:
+            with self.assertRaises(ValueError):
+                cb_helpers.retry_call(failing, lambda e: True,
+                                      max_attempts=5, base_delay=1,
+                                      min_delay=5)
+        self.assertListEqual([c[0][0] for c in sleep.call_args_list],
+                             [5, 5, 5, 5])
+
+    def test_aws_image_wait_keeps_minimum_delay(self):
+        instance = mock.Mock()
+        waiter = instance._provider.ec2_conn.meta.client.get_waiter
+        waiter.return_value.wait.side_effect = ClientError(
+            {'Error': {'Code': 'InvalidAMIID.NotFound'}}, 'DescribeImages')
+        with mock.patch('random.uniform', lambda low, high: low), \
+                mock.patch('time.sleep') as sleep:
+            with self.assertRaises(ClientError):
+                AWSInstance._wait_for_image(instance, mock.Mock())
+        # As long as the fixed 5 x 5 second wait it replaced
+        self.assertEqual(waiter.return_value.wait.call_count, 5)
+        self.assertGreaterEqual(
+            sum(c[0][0] for c in sleep.call_args_list), 20)
+
+    def test_aws_set_label_keeps_minimum_delay(self):
+        network = mock.Mock()
+        create_tags = network._vpc.create_tags
+        create_tags.side_effect = [ClientError(
+            {'Error': {'Code': 'InvalidVpcID.NotFound'}}, 'CreateTags')] * 2 \
+            + [None]
+        with mock.patch('random.uniform', lambda low, high: low), \
+                mock.patch('time.sleep') as sleep:
+            AWSNetwork._set_label(network, 'cb-label')
+        self.assertEqual(create_tags.call_count, 3)
+        self.assertListEqual([c[0][0] for c in sleep.call_args_list],
+                             [5, 5])
+
+    def test_find_query_push_down(self):
+        query = cb_helpers.FindQuery(['name', 'label'],
+                                     {'name': 'web-*', 'label': 'prod'})
+        # Glob values are only pushed down where wildcards are supported
+        self.assertIsNone(query.push_down('name'))
+        self.assertEqual(query.push_down('label'), 'prod')
+        self.assertEqual(query.pushed_down, {'label': 'prod'})
+        self.assertEqual(query.client_side, {'name': 'web-*'})
+        self.assertEqual(query.push_down('name', wildcards=True), 'web-*')
+        self.assertEqual(query.client_side, {})
+
+    def test_find_query_match(self):
+        class Obj(object):
+            def __init__(self, name):
+                self.name = name
+
+        objs = [Obj('web-1'), Obj('web-2'), Obj('myweb-1'), Obj(None)]
+        query = cb_helpers.FindQuery(['name'], {'name': 'web-*'})
+        self.assertEqual(query.push_down_prefix('name'), 'web-')
+        self.assertEqual([o.name for o in query.match(objs)],
+                         ['web-1', 'web-2'])
+
+        query = cb_helpers.FindQuery(['name'], {'name': 'web-1'})
+        query.push_down('name')
+        # Everything was pushed down, so nothing is filtered on the client
+        self.assertIs(query.match(objs), objs)
+
+    def test_find_query_invalid_param(self):
+        with self.assertRaises(InvalidParamException):
+            cb_helpers.FindQuery(['name'], {'notaparameter': 'x'})
+
+    def test_glob_to_regex(self):
+        self.assertEqual(cb_helpers.glob_to_regex('web-?.*'),
+                         r'^web\-.\..*$')
+        self.assertEqual(cb_helpers.glob_prefix('logs/2020-*.gz'),
+                         'logs/2020-')
+
+    def test_to_dict_resolves_only_on_request(self):
+        class DummyResource(BaseCloudResource):
+            SERIALIZED_FIELDS = BaseCloudResource.SERIALIZED_FIELDS + (
+                'size', 'parent')
+            RESOLVED_FIELDS = ('parent',)
+            id = 'dummy-1'
+            name = 'dummy'
+            size = 5
+
+            @property
+            def parent(self):
+                self.resolved += 1
+                return DummyResource(None)
+
+        res = DummyResource(None)
+        res.resolved = 0
+        self.assertEqual(res.to_dict(),
+                         {'id': 'dummy-1', 'name': 'dummy', 'size': 5})
+        self.assertEqual(res.resolved, 0)
+        # Related resources are serialized by id
+        self.assertEqual(res.to_dict(fields=['id', 'parent'], resolve=True),
+                         {'id': 'dummy-1', 'parent': 'dummy-1'})
+        self.assertEqual(res.resolved, 1)
+        with self.assertRaises(InvalidParamException):
+            res.to_dict(fields=['id', 'unknown'])
+
+        lines = list(cb_helpers.iter_json_lines([res, res], fields=['size']))
+        self.assertEqual([json.loads(line) for line in lines],
+                         [{'size': 5}, {'size': 5}])
+        self.assertTrue(all(line.endswith("\n") for line in lines))
@@ -6,6 +6,7 @@ from cloudbridge.base import helpers as cb_helpers
 from cloudbridge.factory import ProviderList
 from cloudbridge.interfaces import SnapshotState
 from cloudbridge.interfaces import VolumeState
+from cloudbridge.interfaces.exceptions import BatchOperationException
 from cloudbridge.interfaces.provider import TestMockHelperMixin
 from cloudbridge.interfaces.resources import AttachmentInfo
 from cloudbridge.interfaces.resources import Snapshot
@@ -118,6 +119,9 @@ class CloudBlockStoreServiceTestCase(ProviderTestBase):
                     % test_vol.description)
                 self.assertIsNone(test_vol.source)
                 self.assertIsNone(test_vol.source)
+                # to_json() keeps the fields that need provider calls
+                self.assertIn('source', test_vol.to_json())
+                self.assertNotIn('source', test_vol.to_dict())
                 self.assertIsNotNone(test_vol.create_time)
                 self.assertIsNotNone(test_vol.zone_id)
                 self.assertIsNone(test_vol.attachments)
@@ -236,3 +240,60 @@ class CloudBlockStoreServiceTestCase(ProviderTestBase):
                 snap_vol2 = test_snap.create_volume()
                 with cb_helpers.cleanup_action(lambda: snap_vol2.delete()):
                     snap_vol2.wait_till_ready()
+
+    @helpers.skipIfNoService(['storage.volumes', 'storage.snapshots'])
+    def test_create_many_delete_many(self):
+        label = "cb-volmany-{0}".format(helpers.get_uuid())
+        test_vols = []
+        test_snaps = []
+
+        def cleanup():
+            for snap in test_snaps:
+                snap.delete()
+            for vol in test_vols:
+                vol.delete()
+
+        with cb_helpers.cleanup_action(cleanup):
+            test_vols.extend(
+                self.provider.storage.volumes.create_many(3, label, 1))
+            self.assertEqual(len({vol.id for vol in test_vols}), 3)
+            self.provider.wait_for_all(test_vols, [VolumeState.AVAILABLE],
+                                       terminal_states=[VolumeState.ERROR])
+
+            test_snaps.extend(self.provider.storage.snapshots.create_many(
+                label, test_vols[:2]))
+            self.assertListEqual([snap.volume_id for snap in test_snaps],
+                                 [vol.id for vol in test_vols[:2]])
+            self.provider.wait_for_all(test_snaps, [SnapshotState.AVAILABLE],
+                                       terminal_states=[SnapshotState.ERROR])
+
+            snaps = list(test_snaps)
+            del test_snaps[:]
+            self.provider.storage.snapshots.delete_many(snaps)
+            self.provider.wait_for_all(snaps, [SnapshotState.UNKNOWN],
+                                       terminal_states=[SnapshotState.ERROR])
+
+            vols = list(test_vols)
+            del test_vols[:]
+            self.provider.storage.volumes.delete_many(
+                [vols[0], vols[1].id, vols[2]])
+            self.provider.wait_for_all(
+                vols, [VolumeState.DELETED, VolumeState.UNKNOWN],
+                terminal_states=[VolumeState.ERROR])
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_bulk_operation_reports_partial_failures(self):
+        def fail_on_odd(item):
+            if item % 2:
+                raise ValueError(item)
+            return item
+
+        with self.assertRaises(BatchOperationException) as cm:
+            # pylint:disable=protected-access
+            self.provider.storage.volumes._run_many(
+                "Test operation", fail_on_odd, range(6))
+        self.assertListEqual(cm.exception.results, [0, 2, 4])
+        self.assertListEqual([item for item, _ in cm.exception.failures],
+                             [1, 3, 5])
+        self.assertTrue(all(isinstance(e, ValueError)
+                            for _, e in cm.exception.failures))
@@ -1,7 +1,11 @@
+import subprocess
+import sys
+import time
 import unittest
 
 from cloudbridge import factory, interfaces
 from cloudbridge.factory import CloudProviderFactory
+from cloudbridge.factory import ProviderPool
 from cloudbridge.interfaces import TestMockHelperMixin
 from cloudbridge.interfaces.provider import CloudProvider
 from cloudbridge.providers.aws import AWSCloudProvider
@@ -84,3 +88,48 @@ class CloudFactoryTestCase(unittest.TestCase):
         factory.register_provider_class(DummyClass)
         self.assertTrue(DummyClass not in
                         factory.get_all_provider_classes())
+
+    def test_get_provider_class_imports_only_requested_provider(self):
+        # Run in a fresh interpreter, as other tests import all providers
+        code = ("import sys\n"
+                "from cloudbridge.factory import CloudProviderFactory\n"
+                "CloudProviderFactory().get_provider_class('aws')\n"
+                "print(','.join(sorted(m for m in sys.modules\n"
+                "      if m.startswith('cloudbridge.providers.')\n"
+                "      and m.count('.') == 2)))\n")
+        output = subprocess.check_output([sys.executable, "-c", code])
+        self.assertEqual(output.decode().strip(), "cloudbridge.providers.aws")
+
+    def test_create_provider_pooled(self):
+        aws = factory.ProviderList.AWS
+        pooled = CloudProviderFactory(pool_size=2)
+        config = {'aws_region_name': 'us-east-1'}
+        provider = pooled.create_provider(aws, config)
+        # The same name and an equal config should return the same instance
+        self.assertIs(pooled.create_provider(aws, dict(config)), provider)
+        other = pooled.create_provider(aws, {'aws_region_name': 'us-west-2'})
+        self.assertIsNot(other, provider)
+        self.assertEqual(pooled.invalidate_provider(aws, config), 1)
+        self.assertIsNot(pooled.create_provider(aws, config), provider)
+        self.assertEqual(pooled.invalidate_provider(aws), 2)
+        # Without pooling, a new provider is created each time
+        unpooled = CloudProviderFactory()
+        self.assertIsNot(unpooled.create_provider(aws, config),
+                         unpooled.create_provider(aws, config))
+
+    def test_provider_pool_eviction(self):
+        pool = ProviderPool(max_size=2)
+        first = pool.get('aws', {'a': 1}, object)
+        second = pool.get('aws', {'a': 2}, object)
+        # Use the first provider, so that the second is least recently used
+        self.assertIs(pool.get('aws', {'a': 1}, object), first)
+        pool.get('aws', {'a': 3}, object)
+        self.assertEqual(len(pool), 2)
+        self.assertIs(pool.get('aws', {'a': 1}, object), first)
+        self.assertIsNot(pool.get('aws', {'a': 2}, object), second)
+
+        idle_pool = ProviderPool(max_size=2, idle_timeout=0.01)
+        first = idle_pool.get('aws', {'a': 1}, object)
+        time.sleep(0.02)
+        self.assertIsNot(idle_pool.get('aws', {'a': 1}, object), first)
+        self.assertEqual(len(idle_pool), 1)
@@ -3,6 +3,7 @@ import itertools
 import six
 
 from cloudbridge.base.helpers import get_env
+from cloudbridge.base.resources import BasePageableObjectMixin
 from cloudbridge.base.resources import ClientPagedResultList
 from cloudbridge.base.resources import ServerPagedResultList
 
@@ -19,6 +20,21 @@ class DummyResult(object):
         return "%s (%s)" % (self.id, self.name)
 
 
+class DummyServerPagedService(BasePageableObjectMixin):
+
+    def __init__(self, objects, limit):
+        self.objects = objects
+        self.limit = limit
+
+    def list(self, limit=None, marker=None):
+        start = marker or 0
+        end = start + self.limit
+        return ServerPagedResultList(
+            is_truncated=end < len(self.objects),
+            marker=end if end < len(self.objects) else None,
+            supports_total=False, data=self.objects[start:end])
+
+
 class CloudHelpersTestCase(ProviderTestBase):
 
     _multiprocess_can_split_ = True
@@ -100,3 +116,16 @@ class CloudHelpersTestCase(ProviderTestBase):
         int_value = self.provider._get_config_value(
             'default_result_limit', None)
         self.assertIsInstance(int_value, int)
+
+    def test_pageable_object_pages(self):
+        service = DummyServerPagedService(self.objects, 3)
+        pages = list(service.pages())
+        self.assertEqual([list(page) for page in pages],
+                         [self.objects[:3], self.objects[3:]])
+        self.assertListEqual(list(service), self.objects)
+
+    def test_pageable_object_prefetch(self):
+        service = DummyServerPagedService(self.objects, 1)
+        self.assertEqual([list(page) for page in service.pages(prefetch=2)],
+                         [[obj] for obj in self.objects])
+        self.assertListEqual(list(service.iter(prefetch=2)), self.objects)
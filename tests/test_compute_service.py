@@ -451,3 +451,36 @@ class CloudComputeServiceTestCase(ProviderTestBase):
 
             self.assertTrue(resp, "Response from method was suppose to be"
                             + " True but got False")
+
+    @helpers.skipIfNoService(['compute.instances'])
+    def test_create_many_delete_many_instances(self):
+        label = "cb-instmany-{0}".format(helpers.get_uuid())
+        test_instances = []
+
+        def cleanup_instances():
+            for inst in test_instances:
+                helpers.delete_instance(inst)
+
+        with cb_helpers.cleanup_action(cleanup_instances):
+            subnet = helpers.get_or_create_default_subnet(self.provider)
+            test_instances.extend(self.provider.compute.instances.create_many(
+                2, label, helpers.get_provider_test_data(self.provider,
+                                                         'image'),
+                helpers.get_provider_test_data(self.provider, 'vm_type'),
+                subnet=subnet))
+            self.assertEqual(len(test_instances), 2)
+            self.assertEqual(len({inst.id for inst in test_instances}), 2)
+            for inst in test_instances:
+                self.assertEqual(inst.label, label)
+            self.provider.wait_for_all(
+                test_instances, [InstanceState.RUNNING],
+                terminal_states=[InstanceState.ERROR])
+
+            deleted = list(test_instances)
+            del test_instances[:]
+            # IDs and objects may be mixed
+            self.provider.compute.instances.delete_many(
+                [deleted[0], deleted[1].id])
+            self.provider.wait_for_all(
+                deleted, [InstanceState.DELETED, InstanceState.UNKNOWN],
+                terminal_states=[InstanceState.ERROR])
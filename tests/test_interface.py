@@ -106,3 +106,17 @@ class CloudInterfaceTestCase(ProviderTestBase):
                 label = "cb-attachvol-{0}".format(helpers.get_uuid())
                 test_vol = cloned_provider.storage.volumes.create(label, 1)
                 self.assertEqual(test_vol.zone_id, zone.id)
+
+    def test_clone_shares_provider_state(self):
+        zone = list(self.provider.compute.regions.current.zones)[-1]
+        cloned_provider = self.provider.clone(zone=zone)
+        # pylint:disable=protected-access
+        self.assertIs(cloned_provider._config_parser,
+                      self.provider._config_parser)
+        self.assertEqual(cloned_provider.zone_name, zone.name)
+        self.assertIsNot(cloned_provider.config, self.provider.config)
+        self.assertIsNot(cloned_provider.middleware, self.provider.middleware)
+        # Services must be bound to the clone, not the parent
+        self.assertIs(cloned_provider.storage.volumes.provider,
+                      cloned_provider)
+        self.assertIs(self.provider.storage.volumes.provider, self.provider)
@@ -1,11 +1,27 @@
+import os
+import pstats
+import shutil
+import tempfile
+import time
 import unittest
+from unittest import mock
 
 from pyeventsystem.events import SimpleEventDispatcher
 from pyeventsystem.middleware import SimpleMiddlewareManager
 from pyeventsystem.middleware import implement
+from pyeventsystem.middleware import intercept
+from pyeventsystem.middleware import observe
 
+from cloudbridge.base.middleware import CachingMiddleware
+from cloudbridge.base.middleware import CompiledEventDispatcher
 from cloudbridge.base.middleware import EventDebugLoggingMiddleware
 from cloudbridge.base.middleware import ExceptionWrappingMiddleware
+from cloudbridge.base.middleware import MetricsMiddleware
+from cloudbridge.base.middleware import ProfilingMiddleware
+from cloudbridge.base.middleware import RetryMiddleware
+from cloudbridge.base.middleware import TracingMiddleware
+from cloudbridge.base.middleware import dispatch
+from cloudbridge.interfaces.exceptions import CircuitOpenException
 from cloudbridge.interfaces.exceptions import CloudBridgeBaseException
 from cloudbridge.interfaces.exceptions import \
     InvalidConfigurationException
@@ -60,6 +76,101 @@ class ExceptionWrappingMiddlewareTestCase(unittest.TestCase):
             dispatcher.dispatch(self, EVENT_NAME)
 
 
+class CompiledEventDispatcherTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class DummyService(object):
+
+        def __init__(self, manager):
+            self.manager = manager
+            manager.add(self)
+
+        @property
+        def events(self):
+            return self.manager.events
+
+        @dispatch(event="provider.foo.get", priority=2500)
+        def get(self, value):
+            if value is None:
+                raise ValueError("No value")
+            return value
+
+    def _create_manager(self, dispatcher_class=CompiledEventDispatcher):
+        manager = SimpleMiddlewareManager(dispatcher_class())
+        manager.add(ExceptionWrappingMiddleware())
+        return manager, self.DummyService(manager)
+
+    def test_chain_matches_simple_dispatcher(self):
+        calls = {}
+
+        class Recorder(object):
+
+            def __init__(self, name):
+                self.name = name
+
+            @observe(event_pattern="provider.*", priority=2000)
+            def before(self, event_args, *args, **kwargs):
+                calls[self.name].append(('before', args))
+
+            @intercept(event_pattern="*.get", priority=2100)
+            def around(self, event_args, *args, **kwargs):
+                next_handler = event_args.pop('next_handler')
+                return next_handler.invoke(event_args, *args, **kwargs) * 2
+
+            @observe(event_pattern="*", priority=3000)
+            def after(self, event_args, *args, **kwargs):
+                calls[self.name].append(('after', event_args['result']))
+
+        for dispatcher_class in (SimpleEventDispatcher,
+                                 CompiledEventDispatcher):
+            name = dispatcher_class.__name__
+            calls[name] = []
+            manager, service = self._create_manager(dispatcher_class)
+            self.assertEqual(service.get(1), 1)
+            recorder = manager.add(Recorder(name))
+            self.assertEqual(service.get(2), 4)
+            # The cached chain must be invalidated when middleware is removed
+            manager.remove(recorder)
+            self.assertEqual(service.get(3), 3)
+            with self.assertRaises(CloudBridgeBaseException):
+                service.get(None)
+        self.assertEqual(calls['SimpleEventDispatcher'],
+                         [('before', (2,)), ('after', 2)])
+        self.assertEqual(calls['CompiledEventDispatcher'],
+                         calls['SimpleEventDispatcher'])
+
+    def test_sole_implementation_bypasses_chain(self):
+        manager, service = self._create_manager()
+        with mock.patch('cloudbridge.base.middleware.HandlerChain.invoke'
+                        ) as invoke:
+            self.assertEqual(service.get("x"), "x")
+            # Exceptions are still wrapped when bypassing the chain
+            with self.assertRaises(CloudBridgeBaseException):
+                service.get(None)
+        invoke.assert_not_called()
+
+        manager.events.observe("provider.foo.get", 3000,
+                               lambda event_args, *args, **kwargs: None)
+        with mock.patch('cloudbridge.base.middleware.HandlerChain.invoke',
+                        return_value="dispatched") as invoke:
+            self.assertEqual(service.get("x"), "dispatched")
+
+    def test_unregistered_method_is_called_directly(self):
+        manager, service = self._create_manager()
+        other_service = self.DummyService(SimpleMiddlewareManager(
+            CompiledEventDispatcher()))
+        # A service whose events are another service's dispatcher is not
+        # registered with it
+        other_service.manager = manager
+        with mock.patch('cloudbridge.base.middleware.HandlerChain.invoke'
+                        ) as invoke:
+            manager.events.observe("provider.foo.get", 3000,
+                                   lambda event_args, *args, **kwargs: None)
+            self.assertEqual(other_service.get("y"), "y")
+        invoke.assert_not_called()
+
+
 class EventDebugLoggingMiddlewareTestCase(unittest.TestCase):
 
     _multiprocess_can_split_ = True
@@ -93,3 +204,428 @@ class EventDebugLoggingMiddlewareTestCase(unittest.TestCase):
         self.assertTrue(
             "hello world" in cm.output[1],
             "Log output {0} does not contain result".format(cm.output[1]))
+
+
+class CachingMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class CountingService(object):
+
+        def __init__(self):
+            self.calls = []
+
+        @implement(event_pattern="provider.foo.list", priority=2500)
+        def list(self, *args, **kwargs):
+            self.calls.append("list")
+            return ["a", "b"]
+
+        @implement(event_pattern="provider.foo.get", priority=2500)
+        def get(self, obj_id):
+            self.calls.append("get")
+            return obj_id if obj_id != "missing" else None
+
+        @implement(event_pattern="provider.foo.create", priority=2500)
+        def create(self, obj_id):
+            self.calls.append("create")
+            return obj_id
+
+    def _create_manager(self, middleware):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        manager.add(middleware)
+        service = self.CountingService()
+        manager.add(service)
+        return dispatcher, service
+
+    def test_read_results_are_cached(self):
+        dispatcher, service = self._create_manager(CachingMiddleware())
+        self.assertEqual(dispatcher.dispatch(self, "provider.foo.list"),
+                         ["a", "b"])
+        dispatcher.dispatch(self, "provider.foo.list")
+        dispatcher.dispatch(self, "provider.foo.get", "x")
+        dispatcher.dispatch(self, "provider.foo.get", "x")
+        dispatcher.dispatch(self, "provider.foo.get", "y")
+        self.assertEqual(service.calls, ["list", "get", "get"])
+
+    def test_none_results_are_not_cached(self):
+        dispatcher, service = self._create_manager(CachingMiddleware())
+        dispatcher.dispatch(self, "provider.foo.get", "missing")
+        dispatcher.dispatch(self, "provider.foo.get", "missing")
+        self.assertEqual(service.calls, ["get", "get"])
+
+    def test_write_evicts_service_entries(self):
+        dispatcher, service = self._create_manager(CachingMiddleware())
+        dispatcher.dispatch(self, "provider.foo.list")
+        dispatcher.dispatch(self, "provider.foo.create", "c")
+        dispatcher.dispatch(self, "provider.foo.list")
+        self.assertEqual(service.calls, ["list", "create", "list"])
+
+    def test_entries_expire(self):
+        middleware = CachingMiddleware(ttls={"provider.foo.get": 0},
+                                       default_ttl=10)
+        dispatcher, service = self._create_manager(middleware)
+        with mock.patch("cloudbridge.base.middleware.time.time",
+                        return_value=1000):
+            dispatcher.dispatch(self, "provider.foo.list")
+            dispatcher.dispatch(self, "provider.foo.list")
+        with mock.patch("cloudbridge.base.middleware.time.time",
+                        return_value=1011):
+            dispatcher.dispatch(self, "provider.foo.list")
+        dispatcher.dispatch(self, "provider.foo.get", "x")
+        dispatcher.dispatch(self, "provider.foo.get", "x")
+        self.assertEqual(service.calls, ["list", "list", "get", "get"])
+
+    def test_lru_is_bounded(self):
+        dispatcher, service = self._create_manager(
+            CachingMiddleware(max_entries=2))
+        for obj_id in ["x", "y", "z", "x"]:
+            dispatcher.dispatch(self, "provider.foo.get", obj_id)
+        self.assertEqual(service.calls, ["get"] * 4)
+
+
+class RetryMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class ThrottledError(Exception):
+        pass
+
+    class TransientError(Exception):
+        pass
+
+    class DummyProvider(object):
+
+        def _classify_error(self, error):
+            if isinstance(error, RetryMiddlewareTestCase.ThrottledError):
+                return RetryMiddleware.THROTTLED
+            if isinstance(error, RetryMiddlewareTestCase.TransientError):
+                return RetryMiddleware.TRANSIENT
+            return None
+
+    class FailingService(object):
+
+        def __init__(self, errors):
+            self.provider = RetryMiddlewareTestCase.DummyProvider()
+            self.errors = list(errors)
+            self.calls = []
+
+        def _fail_or_return(self, name):
+            self.calls.append(name)
+            if self.errors:
+                raise self.errors.pop(0)
+            return name
+
+        @implement(event_pattern="provider.foo.list", priority=2500)
+        def list(self, *args, **kwargs):
+            return self._fail_or_return("list")
+
+        @implement(event_pattern="provider.foo.create", priority=2500)
+        def create(self, *args, **kwargs):
+            return self._fail_or_return("create")
+
+    def _create_manager(self, errors, **kwargs):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        middleware = RetryMiddleware(base_delay=0.01, **kwargs)
+        manager.add(middleware)
+        service = self.FailingService(errors)
+        manager.add(service)
+        return dispatcher, service, middleware
+
+    def test_throttled_calls_are_retried(self):
+        dispatcher, service, _ = self._create_manager(
+            [self.ThrottledError(), self.ThrottledError()])
+        self.assertEqual(dispatcher.dispatch(service, "provider.foo.create"),
+                         "create")
+        self.assertEqual(service.calls, ["create"] * 3)
+
+    def test_transient_errors_retried_only_if_idempotent(self):
+        dispatcher, service, _ = self._create_manager(
+            [self.TransientError(), self.TransientError()])
+        self.assertEqual(dispatcher.dispatch(service, "provider.foo.list"),
+                         "list")
+        self.assertEqual(service.calls, ["list"] * 3)
+
+        del service.calls[:]
+        service.errors.append(self.TransientError())
+        with self.assertRaises(self.TransientError):
+            dispatcher.dispatch(service, "provider.foo.create")
+        self.assertEqual(service.calls, ["create"])
+
+    def test_fatal_errors_and_exhausted_attempts_are_raised(self):
+        dispatcher, service, _ = self._create_manager(
+            [ValueError()])
+        with self.assertRaises(ValueError):
+            dispatcher.dispatch(service, "provider.foo.list")
+        self.assertEqual(service.calls, ["list"])
+
+        dispatcher, service, _ = self._create_manager(
+            [self.ThrottledError()] * 5, max_attempts=3)
+        with self.assertRaises(self.ThrottledError):
+            dispatcher.dispatch(service, "provider.foo.list")
+        self.assertEqual(service.calls, ["list"] * 3)
+
+    def test_circuit_opens_after_repeated_failures(self):
+        dispatcher, service, middleware = self._create_manager(
+            [self.TransientError()] * 3, max_attempts=1,
+            failure_threshold=3, reset_timeout=10)
+        for _ in range(3):
+            with self.assertRaises(self.TransientError):
+                dispatcher.dispatch(service, "provider.foo.list")
+        with self.assertRaises(CircuitOpenException):
+            dispatcher.dispatch(service, "provider.foo.create")
+        self.assertEqual(service.calls, ["list"] * 3)
+
+        # A trial call is let through once the reset timeout has passed
+        with mock.patch("cloudbridge.base.middleware.time.time",
+                        return_value=time.time() + 11):
+            self.assertEqual(
+                dispatcher.dispatch(service, "provider.foo.list"), "list")
+        self.assertEqual(middleware.get_breaker("provider.foo").state,
+                         "closed")
+
+
+class MetricsMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class DummyService(object):
+
+        @implement(event_pattern="provider.foo.list", priority=2500)
+        def list(self, *args, **kwargs):
+            return ["a", "b"]
+
+        @implement(event_pattern="provider.foo.create", priority=2500)
+        def create(self, *args, **kwargs):
+            raise Exception("Some unhandled exception")
+
+    def _create_manager(self, *middleware):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        for m in middleware:
+            manager.add(m)
+        manager.add(self.DummyService())
+        return dispatcher
+
+    def test_calls_and_errors_are_counted(self):
+        metrics = MetricsMiddleware(buckets=(1.0, 10.0))
+        dispatcher = self._create_manager(metrics)
+        with mock.patch("cloudbridge.base.middleware.timeit.default_timer",
+                        side_effect=[0, 0.5, 0, 2, 0, 20]):
+            self.assertEqual(dispatcher.dispatch(self, "provider.foo.list"),
+                             ["a", "b"])
+            dispatcher.dispatch(self, "provider.foo.list")
+            with self.assertRaises(Exception):
+                dispatcher.dispatch(self, "provider.foo.create")
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["provider.foo.list"]["count"], 2)
+        self.assertEqual(snapshot["provider.foo.list"]["errors"], 0)
+        self.assertEqual(snapshot["provider.foo.list"]["sum"], 2.5)
+        self.assertEqual(snapshot["provider.foo.list"]["buckets"],
+                         [(1.0, 1), (10.0, 2), (float('inf'), 2)])
+        self.assertEqual(snapshot["provider.foo.create"]["errors"], 1)
+        self.assertEqual(snapshot["provider.foo.create"]["buckets"],
+                         [(1.0, 0), (10.0, 0), (float('inf'), 1)])
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_cached_calls_are_measured(self):
+        metrics = MetricsMiddleware()
+        dispatcher = self._create_manager(metrics, CachingMiddleware())
+        dispatcher.dispatch(self, "provider.foo.list")
+        dispatcher.dispatch(self, "provider.foo.list")
+        self.assertEqual(metrics.snapshot()["provider.foo.list"]["count"], 2)
+
+    def test_prometheus_format(self):
+        metrics = MetricsMiddleware(buckets=(1.0,))
+        dispatcher = self._create_manager(metrics)
+        with mock.patch("cloudbridge.base.middleware.timeit.default_timer",
+                        side_effect=[0, 0.5]):
+            dispatcher.dispatch(self, "provider.foo.list")
+        text = metrics.to_prometheus()
+        self.assertIn('cloudbridge_events_total{event="provider.foo.list"} 1',
+                      text)
+        self.assertIn('cloudbridge_event_errors_total'
+                      '{event="provider.foo.list"} 0', text)
+        self.assertIn('cloudbridge_event_duration_seconds_bucket'
+                      '{event="provider.foo.list",le="1.0"} 1', text)
+        self.assertIn('cloudbridge_event_duration_seconds_bucket'
+                      '{event="provider.foo.list",le="+Inf"} 1', text)
+        self.assertIn('cloudbridge_event_duration_seconds_sum'
+                      '{event="provider.foo.list"} 0.5', text)
+        self.assertIn("# TYPE cloudbridge_event_duration_seconds histogram",
+                      text)
+
+
+class TracingMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class NestingService(object):
+
+        def __init__(self, dispatcher, tracer):
+            self.dispatcher = dispatcher
+            self.tracer = tracer
+
+        @implement(event_pattern="provider.foo.create", priority=2500)
+        def create(self, *args, **kwargs):
+            self.dispatcher.dispatch(self, "provider.foo.get")
+            self.tracer.record_span("POST /foo", 0)
+            return "created"
+
+        @implement(event_pattern="provider.foo.get", priority=2500)
+        def get(self, *args, **kwargs):
+            with self.tracer.span("GET /foo", category="sdk"):
+                return "got"
+
+        @implement(event_pattern="provider.foo.delete", priority=2500)
+        def delete(self, *args, **kwargs):
+            raise Exception("Some unhandled exception")
+
+    def _create_manager(self, tracer):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        manager.add(tracer)
+        manager.add(self.NestingService(dispatcher, tracer))
+        return dispatcher
+
+    def test_nested_events_are_child_spans(self):
+        tracer = TracingMiddleware()
+        dispatcher = self._create_manager(tracer)
+        self.assertEqual(dispatcher.dispatch(self, "provider.foo.create"),
+                         "created")
+        self.assertEqual(len(tracer.traces), 1)
+        root = tracer.traces[0]
+        self.assertEqual(root.name, "provider.foo.create")
+        self.assertEqual([s.name for s in root.children],
+                         ["provider.foo.get", "POST /foo"])
+        get_span = root.children[0]
+        self.assertEqual([(s.name, s.category) for s in get_span.children],
+                         [("GET /foo", "sdk")])
+        self.assertLessEqual(root.start, get_span.start)
+        self.assertGreaterEqual(root.end, get_span.end)
+
+    def test_failed_events_are_recorded(self):
+        tracer = TracingMiddleware()
+        dispatcher = self._create_manager(tracer)
+        with self.assertRaises(Exception):
+            dispatcher.dispatch(self, "provider.foo.delete")
+        self.assertIn("Some unhandled exception",
+                      tracer.traces[0].args['error'])
+        # The span stack is unwound, so later events are new traces
+        dispatcher.dispatch(self, "provider.foo.get")
+        self.assertEqual(len(tracer.traces), 2)
+
+    def test_child_span_closed_after_parent(self):
+        tracer = TracingMiddleware()
+        parent = tracer.start_span("parent")
+        child = tracer.start_span("child")
+        tracer.end_span(parent)
+        tracer.end_span(child)
+        self.assertEqual(list(tracer.traces), [parent])
+        self.assertEqual(parent.children, [child])
+        self.assertIsNotNone(child.duration)
+        self.assertEqual([e['name'] for e in
+                          tracer.to_chrome_trace()['traceEvents']],
+                         ["parent", "child"])
+        # Later spans are new traces
+        with tracer.span("next"):
+            pass
+        self.assertEqual([t.name for t in tracer.traces], ["parent", "next"])
+
+    def test_chrome_trace_export(self):
+        tracer = TracingMiddleware(max_traces=1)
+        dispatcher = self._create_manager(tracer)
+        dispatcher.dispatch(self, "provider.foo.get")
+        dispatcher.dispatch(self, "provider.foo.create")
+        trace = tracer.to_chrome_trace()
+        self.assertEqual([e['name'] for e in trace['traceEvents']],
+                         ["provider.foo.create", "provider.foo.get",
+                          "GET /foo", "POST /foo"])
+        for event in trace['traceEvents']:
+            self.assertEqual(event['ph'], 'X')
+            self.assertGreaterEqual(event['dur'], 0)
+
+
+class ProfilingMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class DummyService(object):
+
+        def __init__(self, dispatcher):
+            self.dispatcher = dispatcher
+
+        def _build_results(self):
+            return [str(i) for i in range(10)]
+
+        @implement(event_pattern="provider.foo.list", priority=2500)
+        def list(self, *args, **kwargs):
+            return [self.dispatcher.dispatch(self, "provider.foo.get", r)
+                    for r in self._build_results()]
+
+        @implement(event_pattern="provider.foo.get", priority=2500)
+        def get(self, obj_id):
+            return obj_id
+
+    def _create_manager(self, profiler):
+        dispatcher = CompiledEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        manager.add(profiler)
+        manager.add(self.DummyService(dispatcher))
+        return dispatcher
+
+    @staticmethod
+    def _function_names(stats):
+        return set(func[2] for func in stats.stats)
+
+    def test_events_are_profiled(self):
+        profiles = []
+        profiler = ProfilingMiddleware(
+            callback=lambda event, profile: profiles.append(event))
+        dispatcher = self._create_manager(profiler)
+        dispatcher.dispatch(self, "provider.foo.list")
+        dispatcher.dispatch(self, "provider.foo.list")
+        dispatcher.dispatch(self, "provider.foo.get", "x")
+        # Nested events are part of the outer event's profile
+        self.assertEqual(profiler.get_profiled_calls(),
+                         {"provider.foo.list": 2, "provider.foo.get": 1})
+        self.assertEqual(profiles, ["provider.foo.list", "provider.foo.list",
+                                    "provider.foo.get"])
+        stats = profiler.get_stats("provider.foo.list")
+        self.assertIn("_build_results", self._function_names(stats))
+        self.assertIn("get", self._function_names(stats))
+        self.assertNotIn("_build_results", self._function_names(
+            profiler.get_stats("provider.foo.get")))
+        self.assertIsNone(profiler.get_stats("provider.foo.create"))
+
+        profiler.reset()
+        self.assertEqual(profiler.get_profiled_calls(), {})
+
+    def test_calls_are_sampled(self):
+        profiler = ProfilingMiddleware(event_pattern="*.get", sample_rate=0.5)
+        dispatcher = self._create_manager(profiler)
+        with mock.patch("cloudbridge.base.middleware.random.random",
+                        side_effect=[0.7, 0.2, 0.9]):
+            dispatcher.dispatch(self, "provider.foo.get", "x")
+            dispatcher.dispatch(self, "provider.foo.get", "y")
+            dispatcher.dispatch(self, "provider.foo.get", "z")
+        self.assertEqual(profiler.get_profiled_calls(),
+                         {"provider.foo.get": 1})
+
+    def test_stats_are_dumped(self):
+        profiler = ProfilingMiddleware()
+        dispatcher = self._create_manager(profiler)
+        dispatcher.dispatch(self, "provider.foo.list")
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            paths = profiler.dump_stats(tmp_dir)
+            self.assertEqual(paths, [os.path.join(
+                tmp_dir, "provider.foo.list.pstats")])
+            self.assertIn("_build_results",
+                          self._function_names(pstats.Stats(paths[0])))
+        finally:
+            shutil.rmtree(tmp_dir)
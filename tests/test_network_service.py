@@ -3,6 +3,7 @@ from cloudbridge.base.resources import BaseNetwork
 from cloudbridge.interfaces.resources import FloatingIP
 from cloudbridge.interfaces.resources import Network
 from cloudbridge.interfaces.resources import NetworkState
+from cloudbridge.interfaces.resources import ResultList
 from cloudbridge.interfaces.resources import RouterState
 from cloudbridge.interfaces.resources import Subnet
 from cloudbridge.interfaces.resources import SubnetState
@@ -69,6 +70,23 @@ class CloudNetworkServiceTestCase(ProviderTestBase):
         sit.check_crud(self, self.provider.networking.networks, Network,
                        "cb-crudnetwork", create_net, cleanup_net)
 
+    @helpers.skipIfNoService(['networking.networks'])
+    def test_find_network_matched_on_client(self):
+        label = 'cb-findnetwork-{0}'.format(helpers.get_uuid())
+        net = self.provider.networking.networks.create(
+            label=label, cidr_block=BaseNetwork.CB_DEFAULT_IPV4RANGE)
+        with cb_helpers.cleanup_action(lambda: helpers.cleanup_network(net)):
+            # A glob with a character class cannot be pushed down, so it
+            # is matched on the client, but find() still returns a
+            # ResultList
+            for pattern in (label, '[c]' + label[1:]):
+                find_objs = self.provider.networking.networks.find(
+                    label=pattern)
+                self.assertIsInstance(find_objs, ResultList)
+                self.assertListEqual([obj.id for obj in find_objs],
+                                     [net.id])
+                self.assertFalse(find_objs.is_truncated)
+
     @helpers.skipIfNoService(['networking.networks'])
     def test_network_properties(self):
         label = 'cb-propnetwork-{0}'.format(helpers.get_uuid())
@@ -178,6 +196,20 @@ class CloudNetworkServiceTestCase(ProviderTestBase):
                            "cb-crudfip", create_fip, cleanup_fip,
                            skip_name_check=True)
 
+    def test_create_many_delete_many_floating_ips(self):
+        gw = helpers.get_test_gateway(self.provider)
+        with cb_helpers.cleanup_action(lambda: helpers.cleanup_gateway(gw)):
+            fips = gw.floating_ips.create_many(2)
+            self.assertEqual(len({fip.id for fip in fips}), 2)
+            with cb_helpers.cleanup_action(
+                    lambda: gw.floating_ips.delete_many(fips)):
+                fip_ids = [fip.id for fip in gw.floating_ips]
+                for fip in fips:
+                    self.assertIn(fip.id, fip_ids)
+            fip_ids = [fip.id for fip in gw.floating_ips]
+            for fip in fips:
+                self.assertNotIn(fip.id, fip_ids)
+
     def test_floating_ip_properties(self):
         # Check floating IP address
         gw = helpers.get_test_gateway(
@@ -1,5 +1,7 @@
 from cloudbridge.base import helpers as cb_helpers
+from cloudbridge.base.watch import InventoryWatcher
 from cloudbridge.interfaces import VolumeState
+from cloudbridge.interfaces.exceptions import MultipleWaitStateException
 from cloudbridge.interfaces.exceptions import WaitStateException
 
 from tests import helpers
@@ -38,3 +40,113 @@ class CloudObjectLifeCycleTestCase(ProviderTestBase):
             # Hitting the timeout should raise an exception
             with self.assertRaises(WaitStateException):
                 test_vol.wait_for([VolumeState.ERROR], timeout=0, interval=0)
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_wait_for_all(self):
+        # Test waiting on multiple objects by using volumes.
+        label = "cb-waitforall-{0}".format(helpers.get_uuid())
+        test_vols = []
+
+        def cleanup_vols():
+            for vol in test_vols:
+                vol.delete()
+
+        with cb_helpers.cleanup_action(cleanup_vols):
+            for _ in range(3):
+                test_vols.append(
+                    self.provider.storage.volumes.create(label, 1))
+
+            self.assertTrue(self.provider.wait_for_all(
+                test_vols, [VolumeState.AVAILABLE],
+                terminal_states=[VolumeState.ERROR]))
+            for vol in test_vols:
+                self.assertEqual(vol.state, VolumeState.AVAILABLE)
+
+            # Hitting a terminal state should report each failed object
+            with self.assertRaises(MultipleWaitStateException) as cm:
+                self.provider.wait_for_all(
+                    test_vols, [VolumeState.ERROR],
+                    terminal_states=[VolumeState.AVAILABLE])
+            self.assertEqual([res for res, _ in cm.exception.failures],
+                             test_vols)
+
+            # Hitting the timeout should raise an exception
+            with self.assertRaises(WaitStateException):
+                self.provider.wait_for_all(test_vols, [VolumeState.ERROR],
+                                           timeout=0, interval=0)
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_parallel_create_and_delete(self):
+        label = "cb-parallel-{0}".format(helpers.get_uuid())
+        test_vols = []
+
+        def cleanup_vols():
+            for vol in test_vols:
+                vol.delete()
+
+        with cb_helpers.cleanup_action(cleanup_vols):
+            test_vols.extend(self.provider.parallel.map(
+                lambda _: self.provider.storage.volumes.create(label, 1),
+                range(3)))
+            self.assertEqual(len(test_vols), 3)
+            self.provider.wait_for_all(test_vols, [VolumeState.AVAILABLE],
+                                       terminal_states=[VolumeState.ERROR])
+
+            futures = [self.provider.parallel.submit(vol.delete)
+                       for vol in test_vols]
+            for future in self.provider.parallel.as_completed(futures):
+                future.result()
+            deleted = list(test_vols)
+            del test_vols[:]
+            self.provider.wait_for_all(
+                deleted, [VolumeState.DELETED, VolumeState.UNKNOWN],
+                terminal_states=[VolumeState.ERROR])
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_watch(self):
+        label = "cb-watch-{0}".format(helpers.get_uuid())
+        test_vol = None
+        events = []
+
+        def record_event(event_args, volume, **kwargs):
+            if test_vol and volume.id == test_vol.id:
+                events.append((event_args['event'], kwargs.get('changes')))
+
+        handler = self.provider.middleware.events.observe(
+            "provider.watch.volumes.*", 3000, record_event)
+        watcher = InventoryWatcher(self.provider, ['volumes'])
+
+        def cleanup():
+            handler.unsubscribe()
+            if test_vol:
+                test_vol.delete()
+
+        with cb_helpers.cleanup_action(cleanup):
+            # The first poll only records the existing volumes
+            watcher.poll()
+            test_vol = self.provider.storage.volumes.create(label, 1)
+            test_vol.wait_till_ready()
+            watcher.poll()
+            self.assertEqual(events, [("provider.watch.volumes.created",
+                                       None)])
+            test_vol.label = label + "-new"
+            watcher.poll()
+            self.assertEqual(events[1:], [(
+                "provider.watch.volumes.changed",
+                {'label': (label, label + "-new")})])
+            watcher.poll()
+            self.assertEqual(len(events), 2)
+
+            test_vol.delete()
+            test_vol.wait_for([VolumeState.DELETED, VolumeState.UNKNOWN],
+                              terminal_states=[VolumeState.ERROR])
+            watcher.poll()
+            self.assertEqual(events[2:], [("provider.watch.volumes.deleted",
+                                           None)])
+            self.assertNotIn(test_vol.id, [vol.id for vol in
+                                           watcher.snapshot('volumes')])
+            test_vol = None
+
+        with self.provider.watch(['volumes'], interval=1) as watcher:
+            pass
+        self.assertFalse(watcher._thread.is_alive())
@@ -1,14 +1,19 @@
 import filecmp
+import io
 import os
+import shutil
 import tempfile
 from datetime import datetime
 from io import BytesIO
+from unittest import mock
 from unittest import skip
 
 import requests
 
 from cloudbridge.base import helpers as cb_helpers
 from cloudbridge.interfaces.exceptions import DuplicateResourceException
+from cloudbridge.interfaces.exceptions import InvalidParamException
+from cloudbridge.interfaces.exceptions import ObjectModifiedException
 from cloudbridge.interfaces.provider import TestMockHelperMixin
 from cloudbridge.interfaces.resources import Bucket
 from cloudbridge.interfaces.resources import BucketObject
@@ -211,6 +216,191 @@ class CloudObjectStoreServiceTestCase(ProviderTestBase):
                 with open(test_file, 'rb') as f:
                     self.assertEqual(target_stream.getvalue(), f.read())
 
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_upload_from_file_in_parts(self):
+        name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with cb_helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj = test_bucket.objects.create("hello_multipart.bin")
+
+            with cb_helpers.cleanup_action(lambda: obj.delete()):
+                # Three parts of the smallest size allowed by all clouds
+                content = os.urandom(11 * 1024 * 1024)
+                with tempfile.NamedTemporaryFile() as f:
+                    f.write(content)
+                    f.flush()
+                    obj.upload_from_file(f.name, part_size=5 * 1024 * 1024,
+                                         concurrency=2)
+                target_stream = BytesIO()
+                obj.save_content(target_stream)
+                self.assertEqual(target_stream.getvalue(), content)
+                # Temporary parts or segments are not left in the bucket
+                self.assertListEqual([o.name for o in test_bucket.objects],
+                                     ["hello_multipart.bin"])
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_upload_stream(self):
+        name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with cb_helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj = test_bucket.objects.create("hello_stream.bin")
+
+            with cb_helpers.cleanup_action(lambda: obj.delete()):
+                part_size = 5 * 1024 * 1024
+                content = os.urandom(11 * 1024 * 1024)
+
+                def chunks():
+                    # Chunks that do not line up with the parts
+                    for i in range(0, len(content), 1000000):
+                        yield content[i:i + 1000000]
+
+                sources = [("bytes", content), ("memoryview",
+                                                memoryview(content)),
+                           ("file", BytesIO(content)), ("iterable", chunks())]
+                for kind, source in sources:
+                    with self.subTest(source=kind):
+                        obj.upload_stream(source, part_size=part_size,
+                                          concurrency=2)
+                        target_stream = BytesIO()
+                        obj.save_content(target_stream)
+                        self.assertEqual(target_stream.getvalue(), content)
+
+                # Data that fits in a single part
+                obj.upload_stream(iter([b"hello ", b"stream"]))
+                target_stream = BytesIO()
+                obj.save_content(target_stream)
+                self.assertEqual(target_stream.getvalue(), b"hello stream")
+                self.assertListEqual([o.name for o in test_bucket.objects],
+                                     ["hello_stream.bin"])
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_open(self):
+        name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with cb_helpers.cleanup_action(lambda: test_bucket.delete()):
+            content = os.urandom(5000)
+            obj = test_bucket.objects.create("hello_open.bin")
+
+            with cb_helpers.cleanup_action(lambda: obj.delete()):
+                obj.upload(content)
+                with obj.open('rb', block_size=1000,
+                              readahead=2000) as f:
+                    self.assertTrue(f.seekable())
+                    f.seek(-10, io.SEEK_END)
+                    self.assertEqual(f.read(), content[-10:])
+                    self.assertEqual(f.read_range(1500, 2500),
+                                     content[1500:2500])
+                    f.seek(100)
+                    self.assertEqual(f.read(3000), content[100:3100])
+                    self.assertEqual(f.tell(), 3100)
+                with obj.open() as f:
+                    self.assertEqual(io.BufferedReader(f).read(), content)
+                with self.assertRaises(InvalidParamException):
+                    obj.open('wb')
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_download_to_file(self):
+        name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with cb_helpers.cleanup_action(lambda: test_bucket.delete()):
+            content = os.urandom(1000)
+            test_bucket.objects.create("hello_ranges.bin").upload(content)
+            obj = test_bucket.objects.get("hello_ranges.bin")
+            tmp_dir = tempfile.mkdtemp()
+            path = os.path.join(tmp_dir, "hello_ranges.bin")
+
+            with cb_helpers.cleanup_action(
+                    lambda: (obj.delete(), shutil.rmtree(tmp_dir))):
+                read_range = obj._read_range
+                ranges = []
+
+                def interrupt_at(offset):
+                    def read(start, end, version=None):
+                        ranges.append(start)
+                        if start == offset:
+                            raise ValueError("Interrupted")
+                        return read_range(start, end, version=version)
+                    return read
+
+                with mock.patch.object(obj, '_read_range',
+                                       side_effect=interrupt_at(300)):
+                    with self.assertRaises(ValueError):
+                        obj.download_to_file(path, part_size=100,
+                                             concurrency=1)
+                self.assertEqual(ranges, [0, 100, 200, 300])
+                self.assertTrue(os.path.exists(path + ".cbdownload"))
+
+                # Resuming only fetches the remaining parts
+                del ranges[:]
+                with mock.patch.object(obj, '_read_range',
+                                       side_effect=interrupt_at(None)):
+                    obj.download_to_file(path, part_size=100, concurrency=3)
+                self.assertEqual(sorted(ranges), list(range(300, 1000, 100)))
+                self.assertFalse(os.path.exists(path + ".cbdownload"))
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), content)
+
+                # A download is not resumed once the object has changed
+                with mock.patch.object(obj, '_read_range',
+                                       side_effect=interrupt_at(300)):
+                    with self.assertRaises(ValueError):
+                        obj.download_to_file(path, part_size=100,
+                                             concurrency=1)
+                content = os.urandom(1000)
+                obj.upload(content)
+                del ranges[:]
+                with mock.patch.object(obj, '_read_range',
+                                       side_effect=interrupt_at(None)):
+                    obj.download_to_file(path, part_size=100, concurrency=3)
+                self.assertEqual(sorted(ranges), list(range(0, 1000, 100)))
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), content)
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_ranged_reads_fail_if_object_changes(self):
+        name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with cb_helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj = test_bucket.objects.create("hello_version.bin")
+
+            with cb_helpers.cleanup_action(lambda: obj.delete()):
+                content = os.urandom(3000)
+                obj.upload(content)
+                # Ranged reads are conditional on the version the object had
+                # when it was opened
+                read_range = obj._read_range
+                versions = []
+
+                def record(start, end, version=None):
+                    versions.append(version)
+                    return read_range(start, end, version=version)
+
+                with mock.patch.object(obj, '_read_range',
+                                       side_effect=record):
+                    with obj.open('rb', block_size=1000, readahead=0) as f:
+                        self.assertEqual(b''.join(iter(lambda: f.read(1000),
+                                                       b'')), content)
+                self.assertEqual(len(versions), 3)
+                self.assertIsNotNone(versions[0])
+                self.assertEqual(len(set(versions)), 1)
+
+                if isinstance(self.provider, TestMockHelperMixin):
+                    raise self.skipTest(
+                        "Skipping rest of test - mock providers do not"
+                        " evaluate conditional requests")
+                # Each read of the file object is a separate ranged request
+                with obj.open('rb', block_size=1000, readahead=0) as f:
+                    self.assertEqual(f.read(1000), content[:1000])
+                    test_bucket.objects.get("hello_version.bin").upload(
+                        os.urandom(3000))
+                    with self.assertRaises(ObjectModifiedException):
+                        f.read(1000)
+
     @skip("Skip unless you want to test objects bigger than 5GB")
     @helpers.skipIfNoService(['storage.buckets'])
     def test_upload_download_bucket_content_with_large_file(self):
@@ -0,0 +1,85 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from urllib3.response import HTTPResponse
+
+from cloudbridge.base.recording import Cassette
+from cloudbridge.base.recording import CassetteAdapter
+from cloudbridge.interfaces.exceptions import ProviderConnectionException
+
+
+class CassetteTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class EchoAdapter(requests.adapters.HTTPAdapter):
+
+        def send(self, request, **kwargs):
+            return self.build_response(request, HTTPResponse(
+                body=io.BytesIO(b'\xff' + request.body),
+                headers={'X-Path': request.path_url}, status=201,
+                preload_content=False))
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "cassette.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _record_interactions(self, *interactions):
+        with Cassette(self.path, mode=Cassette.RECORD) as cassette:
+            for url, body, content in interactions:
+                cassette.record('POST', url, body, 200, 'OK',
+                                {'Content-Type': 'text/plain'}, content, 0.2)
+
+    def test_replay_matches_requests(self):
+        self._record_interactions(
+            ("https://example.com/a?x=1", "one", b"first"),
+            ("https://example.com/a?x=2", "two", b"\x00\x01"),
+            ("https://example.com/b", None, b"third"))
+        cassette = Cassette(self.path, latency_scale=0)
+        # Exact matches are replayed regardless of order
+        response = cassette.play('POST', "https://example.com/a?x=2", "two")
+        self.assertEqual(response.read(), b"\x00\x01")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers['content-length'], "2")
+        # Other requests get the next interaction with the same path
+        self.assertEqual(cassette.play(
+            'post', "https://example.com/a?x=3", "three").read(), b"first")
+        with self.assertRaises(ProviderConnectionException):
+            cassette.play('POST', "https://example.com/a?x=1", "one")
+        self.assertEqual(
+            b''.join(cassette.play('POST', "https://example.com/b",
+                                   None).stream(2)), b"third")
+
+    def test_latency_is_scaled(self):
+        self._record_interactions(("https://example.com/a", "", b""))
+        cassette = Cassette(self.path, latency_scale=0.5)
+        with mock.patch("cloudbridge.base.recording.time.sleep") as sleep:
+            cassette.play('POST', "https://example.com/a", b"")
+        sleep.assert_called_once_with(0.1)
+
+    def test_requests_adapter(self):
+        url = "http://example.com/echo"
+        with Cassette(self.path, mode=Cassette.RECORD) as cassette:
+            session = requests.Session()
+            session.mount("http://", self.EchoAdapter())
+            CassetteAdapter.mount(cassette, session)
+            response = session.post(url, data=b"hello")
+            self.assertEqual(response.content, b"\xffhello")
+
+        session = requests.Session()
+        CassetteAdapter.mount(Cassette(self.path, latency_scale=0), session)
+        response = session.post(url, data=b"hello")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.headers['X-Path'], "/echo")
+        self.assertEqual(response.content, b"\xffhello")
+        with self.assertRaises(ProviderConnectionException):
+            session.post(url, data=b"hello")
@@ -49,6 +49,13 @@ class CloudRegionServiceTestCase(ProviderTestBase):
         current_region = self.provider.compute.regions.current
         self.assertIsInstance(current_region, Region)
         self.assertTrue(current_region in self.provider.compute.regions)
+        # to_json() keeps the keys it has always had
+        js = current_region.to_json()
+        self.assertTrue(
+            {'id', 'name', 'zones', 'default_zone'}.issubset(js))
+        self.assertEqual(js['default_zone'], current_region.default_zone.id)
+        self.assertEqual(js['zones'],
+                         [zone.id for zone in current_region.zones])
 
     @helpers.skipIfNoService(['compute.regions'])
     def test_zones(self):
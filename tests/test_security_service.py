@@ -1,4 +1,6 @@
 """Test cloudbridge.security modules."""
+from unittest import mock
+
 import cloudbridge.base.helpers as cb_helpers
 from cloudbridge.interfaces.exceptions import DuplicateResourceException
 from cloudbridge.interfaces.resources import KeyPair
@@ -164,6 +166,16 @@ class CloudSecurityServiceTestCase(ProviderTestBase):
             self.assertEqual(rule.from_port, 1111)
             self.assertEqual(rule.to_port, 1111)
             self.assertEqual(rule.cidr, '0.0.0.0/0')
+            # to_json() keeps including the rules as dicts, and only lists
+            # them once
+            with mock.patch.object(type(fw), 'rules',
+                                   new_callable=mock.PropertyMock,
+                                   return_value=fw.rules) as fw_rules:
+                rules = fw.to_json()['rules']
+            fw_rules.assert_called_once_with()
+            self.assertIn(rule.id, [r['id'] for r in rules])
+            self.assertTrue(all(isinstance(r, dict) for r in rules))
+            self.assertIn('from_port', rules[0])
 
     @helpers.skipIfNoService(['security.vm_firewalls'])
     def test_vm_firewall_rule_add_twice(self):